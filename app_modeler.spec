@@ -1,43 +1,95 @@
+import os
+
+# onedir (default) starts fast, onefile unpacks the whole bundle to a temporary directory on every launch
+BUILD_PROFILE = os.environ.get('APP_MODELER_BUILD', 'onedir')
+if BUILD_PROFILE not in ('onedir', 'onefile'):
+    raise ValueError(f"Unknown APP_MODELER_BUILD profile: {BUILD_PROFILE}")
+
 datas = [
-    ('resources/appium.png', 'resources')
+    ('resources/appium.png', 'resources'),
+    ('app_modeler/utils/*.tmpl', 'app_modeler/utils'),
+]
+
+# imported on first use via importlib (AppiumOptionsWidget), not visible to the analysis
+hiddenimports = [
+    'appium.options.android',
+    'appium.options.ios',
+    'appium.options.mac',
+    'appium.options.windows',
 ]
 
+# Qt modules the application does not use, each one drags its libraries and plugins into the bundle
+excludes = [f'PySide6.{module}' for module in [
+    'Qt3DAnimation', 'Qt3DCore', 'Qt3DExtras', 'Qt3DInput', 'Qt3DLogic', 'Qt3DRender',
+    'QtBluetooth', 'QtCharts', 'QtConcurrent', 'QtDataVisualization', 'QtDesigner', 'QtGraphs', 'QtHelp',
+    'QtHttpServer', 'QtLocation', 'QtMultimedia', 'QtMultimediaWidgets', 'QtNetworkAuth', 'QtNfc',
+    'QtOpenGL', 'QtOpenGLWidgets', 'QtPdf', 'QtPdfWidgets', 'QtPositioning', 'QtQml', 'QtQuick',
+    'QtQuick3D', 'QtQuickControls2', 'QtQuickWidgets', 'QtRemoteObjects', 'QtScxml', 'QtSensors',
+    'QtSerialBus', 'QtSerialPort', 'QtSpatialAudio', 'QtSql', 'QtStateMachine', 'QtTest',
+    'QtTextToSpeech', 'QtUiTools', 'QtWebChannel', 'QtWebEngineCore', 'QtWebEngineQuick',
+    'QtWebEngineWidgets', 'QtWebSockets', 'QtXml',
+]] + ['tkinter']
+
 a = Analysis(
     ['app_modeler/main.py'],
     pathex=[],
     binaries=[],
     datas=datas,
-    hiddenimports=[],
+    hiddenimports=hiddenimports,
     hookspath=[],
     runtime_hooks=[],
-    excludes=[],
-    cipher=None,
+    excludes=excludes,
     noarchive=False,
+    # bytecode is precompiled with asserts removed, docstrings are kept for the FormGenerator tooltips
+    optimize=1,
 )
 
 pyz = PYZ(
     a.pure,
     a.zipped_data,
-    cipher=None,
 )
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='app_modeler',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    console=False,
-)
+if BUILD_PROFILE == 'onefile':
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        [],
+        name='app_modeler',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        console=False,
+    )
+    target = exe
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='app_modeler',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        # decompressing the libraries on every launch costs more than it saves
+        upx=False,
+        console=False,
+    )
+    target = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='app_modeler',
+    )
 
 app = BUNDLE(
-    exe,
+    target,
     name='app_modeler.app',
     bundle_identifier=None,
 )
@@ -1,24 +1,43 @@
-import logging
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap, QPainter, QColor, QFont
+from PySide6.QtWidgets import QApplication, QSplashScreen
 
-from PySide6.QtWidgets import QApplication
-
-from app_modeler.MainWindow import MainWindow
+from app_modeler import __version__
+from app_modeler.utils.LogPipeline import log_pipeline
 
 class MainApp(QApplication):
     def __init__(self, *args):
         super().__init__(*args)
         MainApp.configure_logging()
+        splash = self.create_splash()
+        splash.show()
+        self.processEvents()
+        # imported after the splash is shown, the main window pulls in most of the dependencies
+        from app_modeler.MainWindow import MainWindow
         self.widget = MainWindow()
         self.widget.show()
+        splash.finish(self.widget)
+        # settings are restored by the main window
+        app_settings = self.widget.state.app_settings
+        log_pipeline.configure(app_settings.log_levels, app_settings.log_json_file)
+        self.aboutToQuit.connect(log_pipeline.stop)
 
     @staticmethod
-    def configure_logging():
-        logging.basicConfig(level=logging.DEBUG)
-        # disable: httpcore, openai._base_client
-        logging.getLogger('httpx').setLevel(logging.WARNING)
-        logging.getLogger('urllib3').setLevel(logging.WARNING)
-        logging.getLogger('httpcore').setLevel(logging.WARNING)
-        logging.getLogger('openai._base_client').setLevel(logging.WARNING)
-        logging.getLogger('selenium.webdriver.remote.remote_connection').setLevel(logging.WARNING)
-        logging.getLogger('app_modeler.widgets.SettingsWidget').setLevel(logging.WARNING)
+    def create_splash() -> QSplashScreen:
+        pixmap = QPixmap(400, 160)
+        pixmap.fill(QColor("#2b2b2b"))
+        painter = QPainter(pixmap)
+        painter.setPen(QColor("#ffffff"))
+        font = QFont()
+        font.setPointSize(20)
+        painter.setFont(font)
+        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, f"App modeler v{__version__}")
+        painter.end()
+        splash = QSplashScreen(pixmap)
+        splash.showMessage("Loading...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter, QColor("#cccccc"))
+        return splash
 
+    @staticmethod
+    def configure_logging():
+        # records are written by a background thread, levels are refined from the settings later
+        log_pipeline.start()
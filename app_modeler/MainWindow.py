@@ -9,6 +9,7 @@ from app_modeler.widgets.MainMiddleWidget import BottomMiddleWidget
 from app_modeler.widgets.MainStatusBar import MainStatusBar
 from app_modeler.widgets.MainLeftWidget import BottomLeftWidget
 from app_modeler.widgets.MainRightWidget import BottomRightWidget
+from app_modeler.utils.LogPipeline import log_pipeline
 from app_modeler import __version__
 
 class MainWindow(QMainWindow):
@@ -69,6 +70,7 @@ class MainWindow(QMainWindow):
     def on_settings(self):
         dialog = SettingsDialog(self.state.settings, self._app_settings)
         dialog.exec()
+        log_pipeline.configure(self._app_settings.log_levels, self._app_settings.log_json_file)
 
     @Slot(str, result=str)
     def get_text_from_user(self, arg: str) -> str:
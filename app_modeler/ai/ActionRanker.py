@@ -0,0 +1,179 @@
+import abc
+import json
+import logging
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from app_modeler.models.ClassApi import ClassApi, MethodApi
+from app_modeler.models.FunctionCall import FunctionCall
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankedAction:
+    function_call: FunctionCall
+    score: float
+
+
+class ActionRanker(abc.ABC):
+    """
+    Ranks the next actions of a view locally, without asking the AI.
+    """
+    def __init__(self, temperature: float = 0.25):
+        self._temperature = temperature
+
+    @abc.abstractmethod
+    def score(self, view: str, method: MethodApi, history: list[FunctionCall],
+              prior: list[FunctionCall]) -> Optional[float]:
+        """ Score a method of the view, None if the method is not an action """
+
+    def rank(self, class_api: ClassApi, history: list[FunctionCall],
+             prior: Optional[list[FunctionCall]] = None) -> list[RankedAction]:
+        """ Rank the methods of the class, best first.
+        :param class_api: API of the current view.
+        :param history: executed function calls.
+        :param prior: previous candidates of the view, e.g. earlier AI ranking.
+        """
+        ranked = []
+        for method in class_api.methods:
+            score = self.score(class_api.name, method, history, prior or [])
+            if score is None:
+                continue
+            ranked.append(RankedAction(function_call=self.create_function_call(class_api.name, method),
+                                       score=score))
+        ranked.sort(key=lambda action: action.score, reverse=True)
+        return ranked
+
+    def confidence(self, ranked: list[RankedAction]) -> float:
+        """ Probability of the best action (softmax over scores) """
+        if not ranked:
+            return 0.0
+        top = ranked[0].score
+        total = sum(math.exp((action.score - top) / self._temperature) for action in ranked)
+        return 1.0 / total
+
+    @staticmethod
+    def create_function_call(view: str, method: MethodApi) -> FunctionCall:
+        """ Create a function call, required arguments are user input placeholders """
+        args = ", ".join(f'"{{{param.name}}}"' for param in method.parameters if param.default is None)
+        return FunctionCall(view=view, function_name=method.name, args=args, kwargs='')
+
+
+class RuleBasedRanker(ActionRanker):
+    """
+    Heuristic ranking: actionable method types first, unvisited methods preferred,
+    repeated and just executed methods avoided, previous AI ranking used as a prior.
+    """
+    PREFIX_WEIGHTS = {
+        'button_press': 1.0,
+        'textbox_enter': 0.9,
+        'click': 0.8,
+        'tap': 0.8,
+        'press': 0.8,
+        'select': 0.6,
+        'toggle': 0.6,
+        'check': 0.6,
+        'enter': 0.6,
+        'scroll': 0.3,
+        'swipe': 0.3,
+    }
+    DEFAULT_WEIGHT = 0.2
+    # query methods do not change the view
+    IGNORED_PREFIXES = ('get_', 'is_', 'wait_', 'verify_', 'assert_')
+
+    def score(self, view: str, method: MethodApi, history: list[FunctionCall],
+              prior: list[FunctionCall]) -> Optional[float]:
+        if method.name.startswith(self.IGNORED_PREFIXES):
+            return None
+        score = next((weight for prefix, weight in self.PREFIX_WEIGHTS.items() if method.name.startswith(prefix)),
+                     self.DEFAULT_WEIGHT)
+
+        executed = sum(1 for call in history if call.view == view and call.function_name == method.name)
+        if executed == 0:
+            score += 1.0
+        score -= min(executed * 0.5, 2.0)
+        if history and history[-1].view == view and history[-1].function_name == method.name:
+            score -= 1.0
+
+        prior_names = [call.function_name for call in prior]
+        if method.name in prior_names:
+            score += 1.0 - prior_names.index(method.name) / len(prior_names)
+        return score
+
+
+class LearnedRanker(ActionRanker):
+    """
+    Lightweight learned scorer trained from recorded sessions.
+
+    Method names are split to tokens (e.g. button_press_login -> button, press, login) and each token
+    gets a log-odds weight of leading to another view. The score of a method is the mean token weight.
+    """
+    _token_split_re = re.compile(r'[_\W]+')
+
+    def __init__(self, temperature: float = 0.25):
+        super().__init__(temperature)
+        self._positive: dict[str, int] = defaultdict(int)
+        self._negative: dict[str, int] = defaultdict(int)
+
+    @property
+    def samples(self) -> int:
+        return sum(self._positive.values()) + sum(self._negative.values())
+
+    def tokens(self, name: str) -> list[str]:
+        return [token for token in self._token_split_re.split(name.lower()) if token]
+
+    def observe(self, function_call: FunctionCall, view_changed: bool):
+        """ Learn from one executed function call """
+        counts = self._positive if view_changed and function_call.error is None else self._negative
+        for token in self.tokens(function_call.function_name):
+            counts[token] += 1
+
+    def fit(self, history: list[FunctionCall]):
+        """ Learn from a recorded call history, a call is successful when the next call is on another view """
+        for call, next_call in zip(history, history[1:]):
+            self.observe(call, view_changed=call.view != next_call.view)
+
+    def token_weight(self, token: str) -> float:
+        return math.log((self._positive.get(token, 0) + 1) / (self._negative.get(token, 0) + 1))
+
+    def score(self, view: str, method: MethodApi, history: list[FunctionCall],
+              prior: list[FunctionCall]) -> Optional[float]:
+        tokens = self.tokens(method.name)
+        if not tokens:
+            return 0.0
+        return sum(self.token_weight(token) for token in tokens) / len(tokens)
+
+    def save(self, filename: Path):
+        with filename.open('w') as file:
+            json.dump({'positive': self._positive, 'negative': self._negative}, file, indent=4)
+
+    def load(self, filename: Path):
+        with filename.open('r') as file:
+            data = json.load(file)
+        self._positive = defaultdict(int, data.get('positive', {}))
+        self._negative = defaultdict(int, data.get('negative', {}))
+
+
+class CompositeRanker(ActionRanker):
+    """ Rule based ranking adjusted with the learned scorer when it has enough samples """
+    def __init__(self, rules: RuleBasedRanker, learned: Optional[LearnedRanker] = None,
+                 learned_weight: float = 0.5, min_samples: int = 20, temperature: float = 0.25):
+        super().__init__(temperature)
+        self.rules = rules
+        self.learned = learned
+        self._learned_weight = learned_weight
+        self._min_samples = min_samples
+
+    def score(self, view: str, method: MethodApi, history: list[FunctionCall],
+              prior: list[FunctionCall]) -> Optional[float]:
+        score = self.rules.score(view, method, history, prior)
+        if score is None:
+            return None
+        if self.learned and self.learned.samples >= self._min_samples:
+            score += self._learned_weight * self.learned.score(view, method, history, prior)
+        return score
@@ -1,20 +1,65 @@
 import json
+import logging
+import textwrap
+from typing import Optional
 
 from app_modeler.ai.OpenAiAssistant import OpenAIAssistant, AiModel
+from app_modeler.ai.PromptBuilder import PromptBuilder
 from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
+from app_modeler.utils.ClassValidator import ClassValidator, ValidationResult
+
+logger = logging.getLogger(__name__)
 
 
 class ClassRepresentation(AiModel):
     implementation_as_str: str
 
 class AppiumClassGenerator:
-    def __init__(self, ai_assistant: OpenAIAssistant, prompt_template: str = None):
+    REPAIR_PROMPT = textwrap.dedent("""
+        The Python class given below has problems.
+        Fix only these problems and keep everything else unchanged.
+        Output only the class code without any comments or additional text.
+        Class name: {class_name}
+        Problems:
+        {errors}
+        Class code:
+        {class_str}
+        """).strip()
+
+    def __init__(self, ai_assistant: OpenAIAssistant, prompt_template: str = None, max_repair_attempts: int = 1,
+                 model: Optional[str] = None):
         self._ai_assistant = ai_assistant
+        # None uses the default model of the assistant
+        self._model = model
         self._prompt_template = prompt_template
+        self._max_repair_attempts = max_repair_attempts
 
     def generate(self, class_name, elements: [ElementData]) -> str:
-        """ Generate a class representation based on the elements data. """
+        """ Generate a class representation based on the elements data.
+        Generated code is validated before it is returned, trivial issues are repaired
+        and the AI is asked to fix the remaining ones.
+        Raise ValueError if the class is still invalid.
+        """
         elements_dict = [element.asdict_custom() for element in elements]
-        prompt = self._prompt_template.format(class_name=class_name, elements_json=json.dumps(elements_dict))
-        class_representation: ClassRepresentation = self._ai_assistant.ask(prompt, ClassRepresentation)
+        prompt = PromptBuilder(self._prompt_template).build(class_name=class_name,
+                                                            elements_json=json.dumps(elements_dict))
+        class_representation: ClassRepresentation = self._ai_assistant.ask(prompt, ClassRepresentation, model=self._model)
+        class_str = class_representation.implementation_as_str
+
+        validator = ClassValidator(class_name)
+        for attempt in range(self._max_repair_attempts + 1):
+            result = validator.validate(class_str)
+            if result.is_valid:
+                return result.source
+            logger.warning(f"Generated class {class_name} is invalid: {result.errors}")
+            if attempt < self._max_repair_attempts:
+                class_str = self.regenerate(class_name, result)
+        raise ValueError(f"Generated class {class_name} is invalid: {'; '.join(result.errors)}")
+
+    def regenerate(self, class_name: str, result: ValidationResult) -> str:
+        """ Ask the AI to fix the reported problems of the class """
+        prompt = PromptBuilder(self.REPAIR_PROMPT).build(class_name=class_name,
+                                                         errors="\n".join(f"- {error}" for error in result.errors),
+                                                         class_str=result.source)
+        class_representation: ClassRepresentation = self._ai_assistant.ask(prompt, ClassRepresentation, model=self._model)
         return class_representation.implementation_as_str
@@ -0,0 +1,88 @@
+import datetime
+import logging
+import threading
+from typing import Optional
+
+from PySide6.QtCore import QSettings
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(RuntimeError):
+    """ Raised before an AI call which would exceed the token budget """
+
+
+class BudgetGovernor:
+    """
+    Token budget per session and per day. Calls are estimated from the prompt size before they are sent
+    and rejected when the estimate would exceed a limit, the actual usage is recorded afterwards.
+    The daily usage is kept in the settings file so it survives restarts. Usage is recorded from
+    worker threads, so the file is accessed through a short-lived QSettings instance of the calling
+    thread while holding the lock, never through the instance shared with the GUI.
+    """
+    # rough estimate for English text and JSON
+    CHARS_PER_TOKEN = 4
+    DAY_KEY = "AppModeler/Budget/day"
+    USED_KEY = "AppModeler/Budget/used"
+
+    def __init__(self, session_limit: Optional[int] = None, daily_limit: Optional[int] = None,
+                 settings_file: Optional[str] = None):
+        self.session_limit = session_limit or None
+        self.daily_limit = daily_limit or None
+        self._settings_file = settings_file
+        self._lock = threading.Lock()
+        self.session_used = 0
+        self._day = datetime.date.today().isoformat()
+        self._daily_used = 0
+        settings = self._open_settings()
+        if settings is not None and settings.value(self.DAY_KEY, "", type=str) == self._day:
+            self._daily_used = settings.value(self.USED_KEY, 0, type=int)
+
+    def _open_settings(self) -> Optional[QSettings]:
+        # QSettings is reentrant but not thread-safe, each use gets its own instance
+        return QSettings(self._settings_file, QSettings.Format.IniFormat) if self._settings_file else None
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return len(text) // cls.CHARS_PER_TOKEN + 1
+
+    @property
+    def daily_used(self) -> int:
+        self._roll_day()
+        return self._daily_used
+
+    def _roll_day(self):
+        today = datetime.date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            self._daily_used = 0
+
+    def check(self, prompt: str, max_output_tokens: int = 0) -> int:
+        """ Raise BudgetExceeded if the call would exceed a limit, return the estimated tokens """
+        estimate = self.estimate_tokens(prompt) + max_output_tokens
+        with self._lock:
+            if self.session_limit is not None and self.session_used + estimate > self.session_limit:
+                raise BudgetExceeded(f"Session token budget exceeded: {self.session_used} used, "
+                                     f"~{estimate} needed, limit {self.session_limit}")
+            if self.daily_limit is not None and self.daily_used + estimate > self.daily_limit:
+                raise BudgetExceeded(f"Daily token budget exceeded: {self.daily_used} used, "
+                                     f"~{estimate} needed, limit {self.daily_limit}")
+        return estimate
+
+    def record(self, tokens: int):
+        """ Record the actual usage of a call """
+        with self._lock:
+            self._roll_day()
+            self.session_used += tokens
+            self._daily_used += tokens
+            settings = self._open_settings()
+            if settings is not None:
+                settings.setValue(self.DAY_KEY, self._day)
+                settings.setValue(self.USED_KEY, self._daily_used)
+                settings.sync()
+
+    @property
+    def message(self) -> str:
+        parts = [f"session {self.session_used}" + (f"/{self.session_limit}" if self.session_limit else "")]
+        parts.append(f"today {self.daily_used}" + (f"/{self.daily_limit}" if self.daily_limit else ""))
+        return f"Tokens: {', '.join(parts)}"
@@ -0,0 +1,108 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+from app_modeler.ai.BudgetGovernor import BudgetGovernor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Exchange:
+    prompt: str
+    response: str
+
+    @property
+    def tokens(self) -> int:
+        return BudgetGovernor.estimate_tokens(self.prompt) + BudgetGovernor.estimate_tokens(self.response)
+
+
+def extractive_summary(summary: str, exchanges: List[Exchange]) -> str:
+    """ Summary without an AI call: the first line of every response """
+    lines = [summary] if summary else []
+    lines.extend(exchange.response.strip().splitlines()[0] for exchange in exchanges if exchange.response.strip())
+    return "\n".join(lines)
+
+
+class ConversationMemory:
+    """
+    Recent exchanges of one conversation, bounded by count and by estimated tokens.
+    Exchanges dropped from the window are collected and every summarize_every of them
+    are folded into a running summary, which is bounded as well.
+    """
+    MAX_EXCHANGE_CHARS = 2000
+
+    def __init__(self, max_exchanges: int = 10, max_tokens: int = 2000, summarize_every: int = 5,
+                 summarizer: Optional[Callable[[str, List[Exchange]], str]] = None):
+        self.max_tokens = max_tokens
+        self.summarize_every = summarize_every
+        self._summarizer = summarizer or extractive_summary
+        self._exchanges: Deque[Exchange] = deque()
+        self._max_exchanges = max(1, max_exchanges)
+        self._evicted: List[Exchange] = []
+        self._tokens = 0
+        self.summary = ""
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens + BudgetGovernor.estimate_tokens(self.summary)
+
+    def add(self, prompt: str, response: str):
+        # a single large prompt must not take the whole window
+        exchange = Exchange(prompt[:self.MAX_EXCHANGE_CHARS], str(response)[:self.MAX_EXCHANGE_CHARS])
+        self._exchanges.append(exchange)
+        self._tokens += exchange.tokens
+        self._trim()
+
+    def _trim(self):
+        # the summary takes at most a quarter of the window
+        summary_tokens = min(BudgetGovernor.estimate_tokens(self.summary), self.max_tokens // 4)
+        while len(self._exchanges) > 1 and (len(self._exchanges) > self._max_exchanges
+                                            or self._tokens + summary_tokens > self.max_tokens):
+            exchange = self._exchanges.popleft()
+            self._tokens -= exchange.tokens
+            self._evicted.append(exchange)
+        if len(self._evicted) >= self.summarize_every:
+            self._summarize()
+
+    def _summarize(self):
+        evicted, self._evicted = self._evicted, []
+        try:
+            summary = self._summarizer(self.summary, evicted)
+        except Exception as error:
+            logger.warning("Summarizing the conversation failed: %s", error)
+            summary = extractive_summary(self.summary, evicted)
+        max_chars = self.max_tokens // 4 * BudgetGovernor.CHARS_PER_TOKEN
+        # keep the latest part when the summary grows too long
+        self.summary = summary[-max_chars:]
+
+    def messages(self) -> List[Dict[str, str]]:
+        messages = [{"role": "system", "content": f"Summary: {self.summary}"}] if self.summary else []
+        for exchange in self._exchanges:
+            messages.append({"role": "user", "content": exchange.prompt})
+            messages.append({"role": "assistant", "content": exchange.response})
+        return messages
+
+    def render(self, prompt: str) -> str:
+        """ The prompt preceded by the summary and the recent exchanges """
+        if not self.summary and not self._exchanges:
+            return prompt
+        parts = []
+        if self.summary:
+            parts.append(f"Summary of the earlier conversation:\n{self.summary}")
+        if self._exchanges:
+            history = "\n".join(f"{message['role']}: {message['content']}" for message in self.messages()
+                                if message['role'] != 'system')
+            parts.append(f"Previous conversation:\n{history}")
+        parts.append(f"Current question:\n{prompt}")
+        return "\n\n".join(parts)
+
+    def clear(self):
+        self._exchanges.clear()
+        self._evicted.clear()
+        self._tokens = 0
+        self.summary = ""
@@ -1,9 +1,15 @@
 import abc
+import textwrap
 
 import openai
 import logging
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+from app_modeler.ai.BudgetGovernor import BudgetGovernor
+from app_modeler.ai.ConversationMemory import ConversationMemory, Exchange
+from app_modeler.ai.PromptBuilder import Prompt
+from app_modeler.ai.RateLimiter import RateLimiter, RetryDecision, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -11,47 +17,76 @@ class AiModel(BaseModel, abc.ABC):
     pass
 
 
+class ConversationSummary(AiModel):
+    summary: str
+
+
 class OpenAIAssistant:
-    def __init__(self, api_key: str, base_url: Optional[str] = None, model: Optional[str] = None):
+    MAX_RETRIES = 5
+    SUMMARY_PROMPT = textwrap.dedent("""
+        Summarize the conversation below in a few short sentences, keep the facts needed to continue it.
+        Previous summary:
+        {summary}
+        Conversation:
+        {conversation}
+        """).strip()
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: Optional[str] = None,
+                 budget: Optional[BudgetGovernor] = None, rate_limiter: Optional[RateLimiter] = None,
+                 history_exchanges: Optional[int] = None, history_max_tokens: Optional[int] = None):
         """
         Initialize the OpenAIAssistant with an API token.
         :param api_key: OpenAI API mey.
+        :param budget: calls exceeding the token budget are rejected with BudgetExceeded.
+        :param rate_limiter: limits and retries the calls, by default shared by the clients of the API key.
+        :param history_exchanges: recent exchanges included in the prompts, None disables the history.
+        :param history_max_tokens: token limit of the included history.
         """
-        self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
+        # retries are done by the rate limiter, which also adapts the concurrency
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.budget = budget
+        self.rate_limiter = rate_limiter or get_rate_limiter(api_key, base_url)
         self._default_model = model or "gpt-4o-mini"
-        self.conversation_history: Dict[str, List[Dict[str, str]]] = {}
+        self.history_exchanges = history_exchanges or None
+        self.history_max_tokens = history_max_tokens or 2000
+        # one conversation per response format, kept only when the history is enabled
+        self.conversation_history: Dict[str, ConversationMemory] = {}
         self.used_tokens = 0
+        # prompt tokens served from the provider's prefix cache
+        self.cached_tokens = 0
 
     def ask(self,
-            prompt: str,
+            prompt: Union[str, Prompt],
             response_format: AiModel,
             model: Optional[str] = None) -> AiModel:
         """
         Ask the assistant a question, and store the prompt and response in memory.
-        :param prompt: The prompt/question to ask the assistant.
+        :param prompt: The prompt/question to ask the assistant, a Prompt is sent as system and user messages.
         :param response_format: pydantic model to ensure the response format.
         :return: The response from the assistant in JSON format.
         """
-        full_prompt = self._create_full_prompt(response_format, prompt)
-
-        logger.debug(f"prompt: {full_prompt}, full_prompt: {full_prompt}")
-
-        completion = self.client.beta.chat.completions.parse(
+        if isinstance(prompt, str):
+            prompt = Prompt(system="", user=prompt)
+        full_prompt = self._create_full_prompt(response_format, prompt.user)
+        messages = prompt.messages(full_prompt)
+
+        logger.debug("prompt: %s", messages)
+        text = prompt.system + full_prompt
+        estimated_tokens = BudgetGovernor.estimate_tokens(text)
+        if self.budget:
+            self.budget.check(text)
+
+        completion = self._parse(
+            estimated_tokens,
             model=model or self._default_model,
-            messages=[{"role": "user", "content": full_prompt}],
+            messages=messages,
             response_format=response_format
         )
         response = completion.choices[0].message.parsed
-        self.used_tokens += completion.usage.total_tokens
-
+        self._record_usage(estimated_tokens, completion.usage)
 
-        logger.debug(f'AI response (tokens: {self.used_tokens}): {response}')
-        response = response
-
-        if response_format.__name__ not in self.conversation_history:
-            self.conversation_history[response_format.__name__] = []
-        history = self.conversation_history[response_format.__name__]
-        history.append({"role": "assistant", "content": str(response)})
+        logger.debug('AI response (tokens: %d): %s', self.used_tokens, response)
+        self._remember(response_format, prompt.user, response)
 
         return response
 
@@ -68,11 +103,16 @@ class OpenAIAssistant:
         :return: The response from the assistant in JSON format.
         """
 
-        full_prompt = self._create_full_prompt(prompt)
+        full_prompt = self._create_full_prompt(response_format, prompt)
 
-        logger.debug(f"prompt: {prompt}, full_prompt: {full_prompt}")
+        logger.debug("prompt: %s", full_prompt)
+        # the image is not estimated, the output is limited by max_tokens
+        estimated_tokens = BudgetGovernor.estimate_tokens(full_prompt) + 300
+        if self.budget:
+            self.budget.check(full_prompt, max_output_tokens=300)
 
-        completion = self.client.beta.chat.completions.parse(
+        completion = self._parse(
+            estimated_tokens,
             model=model or self._default_model,
             messages=[
                 {
@@ -82,9 +122,6 @@ class OpenAIAssistant:
                           "type": "text",
                            "text": full_prompt
                         },
-                        {"type": "text",
-                         "text": prompt
-                        },
                         {
                             "type": "image_url",
                             "image_url": {
@@ -98,38 +135,98 @@ class OpenAIAssistant:
             response_format=response_format
         )
         response = completion.choices[0].message.parsed
-        self.used_tokens += completion.usage.total_tokens
-
-        logger.debug(f'AI response (tokens: {self.used_tokens}): {response}')
+        self._record_usage(estimated_tokens, completion.usage)
 
-        if response_format.__name__ not in self.conversation_history:
-            self.conversation_history[response_format.__name__] = []
-
-        history = self.conversation_history[response_format.__name__]
-        history.append({"role": "assistant", "content": response})
-        history.append({"role": "assistant", "content": full_prompt})
+        logger.debug('AI response (tokens: %d): %s', self.used_tokens, response)
+        # only the question is kept, the full prompt already contains the history
+        self._remember(response_format, prompt, response)
 
         return response
 
+    def _parse(self, estimated_tokens: int, **kwargs):
+        return self.rate_limiter.call(lambda: self.client.beta.chat.completions.parse(**kwargs),
+                                      estimated_tokens, self.classify_error, max_retries=self.MAX_RETRIES)
+
+    @staticmethod
+    def classify_error(error: Exception) -> RetryDecision:
+        """ Rate limits, timeouts, connection and server errors are retried """
+        if isinstance(error, openai.RateLimitError):
+            return RetryDecision(retry=True, rate_limited=True, retry_after=OpenAIAssistant.retry_after(error))
+        if isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+            return RetryDecision(retry=True, retry_after=OpenAIAssistant.retry_after(error))
+        return RetryDecision(retry=False)
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """ Seconds from the retry-after-ms or retry-after header """
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except ValueError:
+            # the HTTP-date format is not used by the API
+            pass
+        return None
+
+    def _record_usage(self, estimated_tokens: int, usage):
+        tokens = usage.total_tokens
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) or 0
+        if cached_tokens:
+            logger.debug('Cached prompt tokens: %d/%d', cached_tokens, usage.prompt_tokens)
+        self.used_tokens += tokens
+        self.cached_tokens += cached_tokens
+        self.rate_limiter.record_tokens(estimated_tokens, tokens)
+        if self.budget:
+            self.budget.record(tokens)
+
     def _create_full_prompt(self, response_format, prompt: str) -> str:
         """
         Create a full prompt including the history perspective.
         :param prompt: The current prompt/question.
         :return: The full prompt including conversation history.
         """
-        return prompt
-        #history_perspective = "\n\nPrevious conversation history:\n"
-        #if response_format.__name__ not in self.conversation_history:
-        #    self.conversation_history[response_format.__name__] = []
-        ##for message in self.conversation_history[response_format.__name__]:
-        ##    history_perspective += f"{message['role']}: {message['content']}\n"
-        #return history_perspective + "\nCurrent question:\n" + prompt
+        memory = self._memory(response_format)
+        return memory.render(prompt) if memory is not None else prompt
+
+    def _memory(self, response_format) -> Optional[ConversationMemory]:
+        if not self.history_exchanges:
+            return None
+        memory = self.conversation_history.get(response_format.__name__)
+        if memory is None:
+            memory = ConversationMemory(self.history_exchanges, self.history_max_tokens,
+                                        summarizer=self._summarize_history)
+            self.conversation_history[response_format.__name__] = memory
+        return memory
+
+    def _remember(self, response_format, prompt: str, response):
+        memory = self._memory(response_format)
+        if memory is not None:
+            memory.add(prompt, str(response))
+
+    def _summarize_history(self, summary: str, exchanges: List[Exchange]) -> str:
+        """ Summary of the dropped exchanges by the AI, called every few dropped exchanges """
+        conversation = "\n".join(f"user: {exchange.prompt}\nassistant: {exchange.response}" for exchange in exchanges)
+        prompt = self.SUMMARY_PROMPT.format(summary=summary or "-", conversation=conversation)
+        estimated_tokens = BudgetGovernor.estimate_tokens(prompt)
+        if self.budget:
+            self.budget.check(prompt)
+        completion = self._parse(
+            estimated_tokens,
+            model=self._default_model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=ConversationSummary
+        )
+        self._record_usage(estimated_tokens, completion.usage)
+        return completion.choices[0].message.parsed.summary
 
     def get_conversation_history(self, response_format) -> List[Dict[str, str]]:
         """
         Get the conversation history.
-        :return: The conversation history as a list of prompts and responses.
+        :return: The conversation history as a list of prompts and responses, empty when disabled.
         """
-        if response_format.__name__ not in self.conversation_history:
-            self.conversation_history[response_format.__name__] = []
-        return self.conversation_history[response_format.__name__]
+        memory = self._memory(response_format)
+        return memory.messages() if memory is not None else []
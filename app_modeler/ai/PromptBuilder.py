@@ -0,0 +1,65 @@
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+_FORMATTER = string.Formatter()
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """
+    Prompt split for provider-side prefix caching: the static instructions are sent
+    first as the system message, the variable data last as the user message.
+    """
+    system: str
+    user: str
+
+    @property
+    def text(self) -> str:
+        return f"{self.system}\n\n{self.user}" if self.system else self.user
+
+    def messages(self, user: str = None) -> List[Dict[str, str]]:
+        """ Chat messages, user overrides the user content e.g. with history """
+        messages = [{"role": "system", "content": self.system}] if self.system else []
+        messages.append({"role": "user", "content": self.user if user is None else user})
+        return messages
+
+
+def _has_fields(line: str) -> bool:
+    return any(field_name is not None for _, field_name, _, _ in _FORMATTER.parse(line))
+
+
+@lru_cache(maxsize=64)
+def split_template(template: str) -> Tuple[str, str]:
+    """
+    Split a template to the static lines and the lines with {placeholders}, keeping their order.
+    Indented lines belong to the line above them, e.g. the items of a list,
+    and a label line ending with ':' belongs to the placeholder line below it.
+    """
+    static, variable = [], []
+    target = static
+    for line in template.splitlines():
+        if line[:1].isspace() and line.strip():
+            # continuation of the previous line
+            target.append(line)
+            continue
+        target = variable if _has_fields(line) else static
+        if target is variable and static and static[-1].rstrip().endswith(':'):
+            variable.append(static.pop())
+        target.append(line)
+    if any(_has_fields(line) for line in static):
+        # a placeholder in an indented block, keep the whole template as user content
+        return "", template
+    return "\n".join(static).strip(), "\n".join(variable).strip()
+
+
+class PromptBuilder:
+    """ Builds a Prompt from a template, any template layout is reordered to static first """
+    def __init__(self, template: str):
+        self.template = template
+
+    def build(self, **values) -> Prompt:
+        static, variable = split_template(self.template)
+        # static lines may still contain escaped braces
+        return Prompt(system=static.format(), user=variable.format(**values))
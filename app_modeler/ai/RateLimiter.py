@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclass
+class RetryDecision:
+    retry: bool
+    # the provider rejected the call because of its rate limits
+    rate_limited: bool = False
+    # seconds given by the provider, e.g. retry-after header
+    retry_after: Optional[float] = None
+
+
+class TokenBucket:
+    """
+    Refills per_minute units evenly over a minute. Reservations are taken right away
+    and may put the bucket in debt, the caller waits until the debt is paid.
+    """
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """ Take the amount, return seconds to wait before using it """
+        self._refill(now)
+        # a reservation larger than the bucket would never fit
+        self._level -= min(amount, self.capacity)
+        return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def adjust(self, amount: float):
+        """ Correct an earlier reservation, positive amount takes more """
+        self._level = min(self.capacity, self._level - amount)
+
+
+class RateLimiter:
+    """
+    Client side limits for AI calls: requests and tokens per minute (token buckets)
+    and the number of concurrent calls. Concurrency adapts AIMD-style,
+    successful calls increase it slowly and rate limited calls halve it.
+    """
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 60.0
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 max_concurrency: Optional[int] = DEFAULT_MAX_CONCURRENCY):
+        self._condition = threading.Condition()
+        self._requests: Optional[TokenBucket] = None
+        self._tokens: Optional[TokenBucket] = None
+        self._max_concurrency = 1
+        # start at the limit, rate limit errors lower it
+        self._concurrency = float(max(1, max_concurrency or self.DEFAULT_MAX_CONCURRENCY))
+        self._in_flight = 0
+        self._waiting = 0
+        self._blocked_until = 0.0
+        self.configure(requests_per_minute, tokens_per_minute, max_concurrency)
+
+    def configure(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                  max_concurrency: Optional[int] = DEFAULT_MAX_CONCURRENCY):
+        """ None or 0 per minute limits are unlimited, None or 0 concurrency uses the default """
+        with self._condition:
+            if (self._requests.capacity if self._requests else None) != requests_per_minute:
+                self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+            if (self._tokens.capacity if self._tokens else None) != tokens_per_minute:
+                self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+            self._max_concurrency = max(1, max_concurrency or self.DEFAULT_MAX_CONCURRENCY)
+            self._concurrency = min(max(self._concurrency, 1.0), self._max_concurrency)
+            self._condition.notify_all()
+
+    @property
+    def queue_depth(self) -> int:
+        """ Calls waiting for a free slot """
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def concurrency(self) -> int:
+        return int(self._concurrency)
+
+    @property
+    def message(self) -> str:
+        return f"AI calls: {self._in_flight}/{self.concurrency} running, {self._waiting} queued"
+
+    def _acquire(self, estimated_tokens: int):
+        with self._condition:
+            self._waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        self._condition.wait(self._blocked_until - now)
+                    elif self._in_flight >= int(self._concurrency):
+                        self._condition.wait()
+                    else:
+                        break
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens:
+                wait = max(wait, self._tokens.reserve(estimated_tokens, now))
+        if wait > 0:
+            logger.debug('Rate limit: waiting %.1fs, %d queued', wait, self._waiting)
+            time.sleep(wait)
+
+    def _release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def record_tokens(self, estimated_tokens: int, used_tokens: int):
+        """ Correct the token reservation with the actual usage """
+        with self._condition:
+            if self._tokens:
+                self._tokens.adjust(used_tokens - estimated_tokens)
+
+    def on_success(self):
+        with self._condition:
+            previous = int(self._concurrency)
+            self._concurrency = min(self._max_concurrency, self._concurrency + 1.0 / self._concurrency)
+            if int(self._concurrency) > previous:
+                self._condition.notify()
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        with self._condition:
+            self._concurrency = max(1.0, self._concurrency / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        logger.warning('Rate limited, concurrency %d, retry after %s', self.concurrency, retry_after)
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after:
+            return retry_after
+        return min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def call(self, func: Callable[[], T], estimated_tokens: int,
+             classify: Callable[[Exception], RetryDecision], max_retries: int = 5) -> T:
+        """ Call func within the limits, retry errors the classifier considers retryable """
+        attempt = 0
+        while True:
+            self._acquire(estimated_tokens)
+            try:
+                result = func()
+            except Exception as error:
+                decision = classify(error)
+                if decision.rate_limited:
+                    self.on_rate_limited(decision.retry_after)
+                if not decision.retry or attempt >= max_retries:
+                    raise
+                delay = self.backoff(attempt, decision.retry_after)
+                attempt += 1
+                logger.info('AI call failed (%s), retry %d/%d in %.1fs', type(error).__name__, attempt,
+                            max_retries, delay)
+            else:
+                self.on_success()
+                return result
+            finally:
+                self._release()
+            time.sleep(delay)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str, base_url: Optional[str] = None, **limits) -> RateLimiter:
+    """ Rate limiter shared by all clients of the same API key and endpoint, limits are updated """
+    key = hashlib.sha256(f"{base_url or ''}\n{api_key}".encode()).hexdigest()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(**limits)
+            return limiter
+    limiter.configure(**limits)
+    return limiter
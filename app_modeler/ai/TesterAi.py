@@ -1,26 +1,39 @@
 import json
 import logging
+from typing import Optional
 
 import openai
 
 from app_modeler.ai.OpenAiAssistant import OpenAIAssistant
+from app_modeler.ai.PromptBuilder import PromptBuilder
+from app_modeler.models.ClassApi import ClassApi
 from app_modeler.models.FunctionCall import NextFunctionList, FunctionCall
 
 logger = logging.getLogger(__name__)
 
 
 class TesterAi:
-    def __init__(self, ai_assistant: OpenAIAssistant, prompt_template: str = None):
+    def __init__(self, ai_assistant: OpenAIAssistant, prompt_template: str = None, model: Optional[str] = None):
         self.ai = ai_assistant
         self.prompt_template = prompt_template
+        # None uses the default model of the assistant
+        self.model = model
 
-    def ask_next_step(self, class_docstring: [dict], previous_steps: [str]) -> [FunctionCall]:
-        prompt =self.prompt_template.format(previous_steps=json.dumps(previous_steps),
-                                            class_docstring=json.dumps(class_docstring))
+    def ask_next_step(self, class_api: ClassApi, previous_steps: [str]) -> [FunctionCall]:
+        prompt = PromptBuilder(self.prompt_template).build(previous_steps=json.dumps(previous_steps),
+                                                           class_docstring=json.dumps(class_api.to_prompt_dict()))
         try:
-            response: NextFunctionList = self.ai.ask(prompt=prompt, response_format=NextFunctionList)
+            response: NextFunctionList = self.ai.ask(prompt=prompt, response_format=NextFunctionList, model=self.model)
         except openai.BadRequestError as error:
             logger.error(error.message)
             raise StopIteration("openAI fails to provide the next step")
         dump = response.model_dump()
-        return [FunctionCall(**step) for step in dump['candidates']]
+        candidates = [FunctionCall(**step) for step in dump['candidates']]
+        # drop methods that do not exist in the class
+        known = [candidate for candidate in candidates if candidate.function_name in class_api]
+        unknown = [candidate.function_name for candidate in candidates if candidate.function_name not in class_api]
+        if unknown:
+            logger.warning(f"Ignoring unknown methods: {unknown}")
+        if not known:
+            raise StopIteration("openAI did not provide any known method")
+        return known
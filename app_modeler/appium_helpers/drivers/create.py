@@ -7,5 +7,6 @@ logger = logging.getLogger(__name__)
 
 def create_driver(start_options: StartOptions):
     options = start_options.appium_options
-    logger.debug(f'Creating driver with options: {options.to_capabilities()}')
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Creating driver with options: %s', options.to_capabilities())
     return webdriver.Remote(start_options.appium_server_url, options=options)
@@ -35,6 +35,8 @@ class ElementData:
     # Windows-specific fields
     automation_id: Optional[str] = None
     name: Optional[str] = None
+    # element size is used by the screenshot overlay only
+    size: Optional[dict] = field(default=None, metadata={'exclude': True})
 
     def asdict_custom(self):
         result = {}
@@ -47,24 +49,34 @@ class ElementData:
             result[f.name] = value
         return result
 
+    def locators(self) -> list[tuple[str, str]]:
+        """ Locators which can address the element, as (AppiumBy attribute name, value) """
+        candidates = [('ID', self.resource_id),
+                      ('ACCESSIBILITY_ID', self.content_desc),
+                      ('ACCESSIBILITY_ID', self.label),
+                      ('ACCESSIBILITY_ID', self.automation_id),
+                      ('NAME', self.name),
+                      ('XPATH', self.xpath)]
+        return [(strategy, value) for strategy, value in candidates if value]
+
 
 class ElementsDiscover:
     def __init__(self, driver):
         self.driver = driver
 
     def scan_view(self, progress_callback) -> [ElementData]:
-        """ Scan the current view and return elements data as json """
+        """ Scan the current view and return elements data.
+        progress_callback(done, total) is called after each processed element.
+        """
         elements_data = []
         root = resolve_root(self.driver)
         elements = root.find_elements(by=By.XPATH, value='//*')
-        for element in elements:
+        for index, element in enumerate(elements, start=1):
             try:
-                elem_data = self.detect_element(element)
+                elements_data.append(self.detect_element(element))
             except ValueError as error:
                 logger.warning(f"Error detecting element: {error}")
-                continue
-            elements_data.append(elem_data)
-            progress_callback(len(elements_data))
+            progress_callback(index, len(elements))
 
         if not elements_data:
             raise StopIteration("No elements found in the view")
@@ -87,9 +99,12 @@ class ElementsDiscover:
         except (StaleElementReferenceException, NoSuchAttributeException, KeyError) as error:
             raise ValueError(str(error)) from error
 
+        # XCUITest may report fractional points, the index and the tree work on whole pixels
+        rect = {key: int(round(value)) for key, value in element.rect.items()}
         return ElementData( element=element,
                             text=element.text,
-                            location=element.location,
+                            location={'x': rect['x'], 'y': rect['y']},
+                            size={'width': rect['width'], 'height': rect['height']},
                             **details)
 
 
@@ -1,10 +1,26 @@
-import sys
+import time
+STARTED = time.perf_counter()
 
-from app_modeler.MainApp import MainApp
+import os  # noqa: E402
+import sys  # noqa: E402
+
+from PySide6.QtCore import QTimer  # noqa: E402
+
+from app_modeler.MainApp import MainApp  # noqa: E402
+
+# when set the application exits as soon as the main window is shown, used to compare build variants
+STARTUP_PROBE_ENV = 'APP_MODELER_STARTUP_PROBE'
+
+
+def report_startup(app: MainApp):
+    print(f"startup: {time.perf_counter() - STARTED:.3f}s", file=sys.stderr, flush=True)
+    app.quit()
 
 
 def main():
     app = MainApp(sys.argv)
+    if os.environ.get(STARTUP_PROBE_ENV):
+        QTimer.singleShot(0, lambda: report_startup(app))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 import textwrap
-from typing import Optional
+from typing import Optional, Dict
 
 from PySide6.QtCore import QObject
 
@@ -13,10 +13,26 @@ class AppSettings(QObject):
         self._token: SecretStr = SecretStr("")
         self._base_url: Optional[str] = None
         self._model: Optional[str] = 'gpt-4o-mini'
+        self._local_ranker_confidence: Optional[float] = None
+        self._ranker_model_file: Optional[str] = None
+        self._fastest_navigation: bool = False
+        self._max_steps_per_test: Optional[int] = None
+        self._remove_navigation_loops: bool = False
+        self._log_levels: Dict[str, str] = {}
+        self._ranking_model: Optional[str] = None
+        self._class_generation_model: Optional[str] = None
+        self._session_token_limit: Optional[int] = None
+        self._daily_token_limit: Optional[int] = None
+        self._requests_per_minute: Optional[int] = None
+        self._tokens_per_minute: Optional[int] = None
+        self._max_concurrent_requests: Optional[int] = 4
+        self._history_exchanges: Optional[int] = None
+        self._history_max_tokens: Optional[int] = 2000
+        self._log_json_file: Optional[str] = None
 
         self._class_generator_prompt: MultilineStr = MultilineStr(textwrap.dedent("""
-            Generate a Python class {class_name} with best practises, inheriting from AppiumInterface for an Appium-based view model.
-            Include the following elements and output only the class code without any comments or additional text.
+            Generate a Python class with best practises, inheriting from AppiumInterface for an Appium-based view model.
+            Include the elements given at the end and output only the class code without any comments or additional text.
             Do not include any prefixes or suffixes like ```python."
             
             Create a class that inherits from ‘AppiumInterface’. 
@@ -29,8 +45,6 @@ class AppSettings(QObject):
                 •scroll_to_element(locator: Tuple[AppiumBy, str]) -> None
                 •wait_for_element(locator: Tuple[AppiumBy, str], timeout: int = 10) -> WebElement
             
-            Elements: {elements_json}
-            
             Include methods that call the base class methods for each actionable element, 
             using the element name as the function name and type as prefix. 
              e.g. 'def button_press_start(self)` or `def textbox_enter_email(self, email: str)`.
@@ -38,7 +52,7 @@ class AppSettings(QObject):
             Use the following method signature for the constructor:
             
             def __init__(self, driver):
-                super().init(driver)
+                super().__init__(driver)
             
             Define locators as tuples of (AppiumBy, value), for example:
             (AppiumBy.ACCESSIBILITY_ID, ‘’) or (AppiumBy.ID, ‘<resource_id>’). Prefer using the resource_id if available.
@@ -46,6 +60,9 @@ class AppSettings(QObject):
             Include the following imports:
             from appium.webdriver.common.appiumby import AppiumBy
             from app_modeler.appium_helpers.AppiumInterface import AppiumInterface
+            
+            Class name: {class_name}
+            Elements: {elements_json}
             """).strip())
 
         self._tester_prompt = MultilineStr(textwrap.dedent("""
@@ -56,8 +73,10 @@ class AppSettings(QObject):
                 Give only the method call as a string, e.g. click_tab1.
                 Do not include parenthesis ("()").
                 Do not include anything else in response.
-                Previous steps was: {previous_steps}, do not repeat unless it's only option.
-                please review the following class content: {class_docstring}
+                Do not repeat the previous steps unless it's only option.
+                Please review the class content below.
+                Class content: {class_docstring}
+                Previous steps: {previous_steps}
               """).strip())
 
     #@property
@@ -100,12 +119,189 @@ class AppSettings(QObject):
         """ Set the model """
         self._model = value
 
+    @property
+    def local_ranker_confidence(self) -> Optional[float]:
+        """ Minimum confidence (0..1) to use local next step ranking instead of AI. None (default) always asks AI """
+        return self._local_ranker_confidence
+
+    @local_ranker_confidence.setter
+    def local_ranker_confidence(self, value: Optional[float]):
+        """ Set the local ranker confidence threshold """
+        self._local_ranker_confidence = value
+
+    @property
+    def ranker_model_file(self) -> Optional[str]:
+        """ JSON file where the learned next step ranking model is stored """
+        return self._ranker_model_file
+
+    @ranker_model_file.setter
+    def ranker_model_file(self, value: Optional[str]):
+        """ Set the learned ranking model file """
+        self._ranker_model_file = value
+
+    @property
+    def fastest_navigation(self) -> bool:
+        """ Navigate to known views by the fastest path instead of the fewest steps """
+        return self._fastest_navigation
+
+    @fastest_navigation.setter
+    def fastest_navigation(self, value: bool):
+        """ Set the navigation path preference """
+        self._fastest_navigation = value
+
+    @property
+    def max_steps_per_test(self) -> Optional[int]:
+        """ Split exported history to independent tests of about this many steps. None exports one test """
+        return self._max_steps_per_test
+
+    @max_steps_per_test.setter
+    def max_steps_per_test(self, value: Optional[int]):
+        """ Set the exported test length """
+        self._max_steps_per_test = value
+
+    @property
+    def remove_navigation_loops(self) -> bool:
+        """ Drop exported detours which only navigate away and back through known transitions """
+        return self._remove_navigation_loops
+
+    @remove_navigation_loops.setter
+    def remove_navigation_loops(self, value: bool):
+        """ Set the navigation loop removal """
+        self._remove_navigation_loops = value
+
+    @property
+    def ranking_model(self) -> Optional[str]:
+        """ Model for the next step ranking, a small model is usually enough. None uses the model """
+        return self._ranking_model
+
+    @ranking_model.setter
+    def ranking_model(self, value: Optional[str]):
+        """ Set the ranking model """
+        self._ranking_model = value
+
+    @property
+    def class_generation_model(self) -> Optional[str]:
+        """ Model for the view class generation, benefits from a stronger model. None uses the model """
+        return self._class_generation_model
+
+    @class_generation_model.setter
+    def class_generation_model(self, value: Optional[str]):
+        """ Set the class generation model """
+        self._class_generation_model = value
+
+    @property
+    def session_token_limit(self) -> Optional[int]:
+        """ Stop AI calls when the session would use more tokens. None is unlimited """
+        return self._session_token_limit
+
+    @session_token_limit.setter
+    def session_token_limit(self, value: Optional[int]):
+        """ Set the session token limit """
+        self._session_token_limit = value
+
+    @property
+    def daily_token_limit(self) -> Optional[int]:
+        """ Stop AI calls when today's usage would exceed this many tokens. None is unlimited """
+        return self._daily_token_limit
+
+    @daily_token_limit.setter
+    def daily_token_limit(self, value: Optional[int]):
+        """ Set the daily token limit """
+        self._daily_token_limit = value
+
+    @property
+    def requests_per_minute(self) -> Optional[int]:
+        """ Client side limit of AI requests per minute for the API key. None or 0 means no limit """
+        return self._requests_per_minute
+
+    @requests_per_minute.setter
+    def requests_per_minute(self, value: Optional[int]):
+        """ Set the requests per minute limit """
+        self._requests_per_minute = value
+
+    @property
+    def tokens_per_minute(self) -> Optional[int]:
+        """ Client side limit of AI tokens per minute for the API key. None or 0 means no limit """
+        return self._tokens_per_minute
+
+    @tokens_per_minute.setter
+    def tokens_per_minute(self, value: Optional[int]):
+        """ Set the tokens per minute limit """
+        self._tokens_per_minute = value
+
+    @property
+    def max_concurrent_requests(self) -> Optional[int]:
+        """ Upper limit of parallel AI requests, lowered automatically while the API reports rate limits.
+        None or 0 uses the default of 4 """
+        return self._max_concurrent_requests
+
+    @max_concurrent_requests.setter
+    def max_concurrent_requests(self, value: Optional[int]):
+        """ Set the concurrent requests limit """
+        self._max_concurrent_requests = value
+
+    @property
+    def history_exchanges(self) -> Optional[int]:
+        """ Recent AI exchanges included in the next prompts, older ones are summarized. None disables the history """
+        return self._history_exchanges
+
+    @history_exchanges.setter
+    def history_exchanges(self, value: Optional[int]):
+        """ Set the number of history exchanges """
+        self._history_exchanges = value
+
+    @property
+    def history_max_tokens(self) -> Optional[int]:
+        """ Token limit of the history included in a prompt """
+        return self._history_max_tokens
+
+    @history_max_tokens.setter
+    def history_max_tokens(self, value: Optional[int]):
+        """ Set the history token limit """
+        self._history_max_tokens = value
+
+    @property
+    def log_levels(self) -> Dict[str, str]:
+        """ Log level per logger name, e.g. app_modeler.ai: DEBUG. Overrides the defaults """
+        return self._log_levels
+
+    @log_levels.setter
+    def log_levels(self, value: Dict[str, str]):
+        """ Set the log levels """
+        self._log_levels = value
+
+    @property
+    def log_json_file(self) -> Optional[str]:
+        """ Write the log records also as JSON lines to this file, e.g. for crawl analytics """
+        return self._log_json_file
+
+    @log_json_file.setter
+    def log_json_file(self, value: Optional[str]):
+        """ Set the JSON log file """
+        self._log_json_file = value
+
     def update(self, settings: 'AppSettings'):
         """ Update the settings """
         #self.ai_service = settings.ai_service
         self.token = settings.token
         self.base_url = settings.base_url
         self.model = settings.model
+        self.local_ranker_confidence = settings.local_ranker_confidence
+        self.ranker_model_file = settings.ranker_model_file
+        self.fastest_navigation = settings.fastest_navigation
+        self.max_steps_per_test = settings.max_steps_per_test
+        self.remove_navigation_loops = settings.remove_navigation_loops
+        self.ranking_model = settings.ranking_model
+        self.class_generation_model = settings.class_generation_model
+        self.session_token_limit = settings.session_token_limit
+        self.daily_token_limit = settings.daily_token_limit
+        self.requests_per_minute = settings.requests_per_minute
+        self.tokens_per_minute = settings.tokens_per_minute
+        self.max_concurrent_requests = settings.max_concurrent_requests
+        self.history_exchanges = settings.history_exchanges
+        self.history_max_tokens = settings.history_max_tokens
+        self.log_levels = dict(settings.log_levels)
+        self.log_json_file = settings.log_json_file
         self.class_generator_prompt = settings.class_generator_prompt
 
     @property
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ParameterApi:
+    name: str
+    annotation: Optional[str] = None
+    default: Optional[str] = None
+
+    def __str__(self):
+        text = self.name
+        if self.annotation:
+            text += f": {self.annotation}"
+        if self.default is not None:
+            text += f" = {self.default}"
+        return text
+
+
+@dataclass(frozen=True)
+class LocatorApi:
+    """ Locator used by a method, e.g. (AppiumBy.ID, 'com.app:id/start') """
+    strategy: str
+    value: str
+
+
+@dataclass(frozen=True)
+class MethodApi:
+    name: str
+    parameters: tuple[ParameterApi, ...] = ()
+    returns: Optional[str] = None
+    locators: tuple[LocatorApi, ...] = ()
+
+    @property
+    def parameter_names(self) -> list[str]:
+        return [param.name for param in self.parameters]
+
+    @property
+    def signature(self) -> str:
+        """ Compact signature, e.g. textbox_enter_email(email: str) """
+        signature = f"{self.name}({', '.join(str(param) for param in self.parameters)})"
+        if self.returns and self.returns != 'None':
+            signature += f" -> {self.returns}"
+        return signature
+
+
+@dataclass(frozen=True)
+class ClassApi:
+    """ Public API of a generated view class """
+    name: str
+    methods: tuple[MethodApi, ...] = ()
+
+    def get_method(self, name: str) -> Optional[MethodApi]:
+        return next((method for method in self.methods if method.name == name), None)
+
+    def __contains__(self, method_name: str) -> bool:
+        return self.get_method(method_name) is not None
+
+    def methods_for_locators(self, locators: list[tuple[str, str]]) -> list[MethodApi]:
+        """ Methods using any of the (strategy, value) locators """
+        wanted = set(locators)
+        return [method for method in self.methods
+                if any((locator.strategy, locator.value) in wanted for locator in method.locators)]
+
+    def asdict(self) -> dict:
+        """ JSON-like dictionary with full method details """
+        return {
+            "class": self.name,
+            "methods": [{
+                "name": method.name,
+                "parameters": method.parameter_names,
+                "annotations": {param.name: param.annotation for param in method.parameters if param.annotation},
+                "defaults": {param.name: param.default for param in method.parameters if param.default is not None},
+                "returns": method.returns,
+                "locators": [[locator.strategy, locator.value] for locator in method.locators],
+            } for method in self.methods]
+        }
+
+    def to_prompt_dict(self) -> dict:
+        """ Compact JSON-like dictionary for AI prompts """
+        return {
+            "class": self.name,
+            "methods": [method.signature for method in self.methods]
+        }
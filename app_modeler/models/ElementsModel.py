@@ -0,0 +1,131 @@
+from typing import Any, List, Optional
+import logging
+
+from PySide6.QtCore import Qt, QModelIndex, QAbstractTableModel, QObject, QSortFilterProxyModel
+
+from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
+
+logger = logging.getLogger(__name__)
+
+
+class ElementsModel(QAbstractTableModel):
+    """
+    Table of discovered elements. All rows are exposed at once, the table view is virtualized
+    and requests data only for the visible rows, so sorting always sees every element.
+    """
+    # UserRole returns the element itself, sorting uses its own role
+    SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self.elements: List[ElementData] = []
+        self._headers = ['Type', 'Text', 'Identifier', 'Clickable', 'Location', 'Size']
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.elements)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self._headers)
+
+    @staticmethod
+    def identifier(element: ElementData) -> Optional[str]:
+        return (element.resource_id or element.content_desc or element.label or element.automation_id
+                or element.name or element.xpath)
+
+    def display(self, element: ElementData, column: int) -> Optional[str]:
+        if column == 0:
+            return element.type
+        if column == 1:
+            return element.text
+        if column == 2:
+            return self.identifier(element)
+        if column == 3:
+            return "" if element.clickable is None else str(element.clickable)
+        if column == 4:
+            return f"{element.location.get('x')}, {element.location.get('y')}" if element.location else None
+        if column == 5:
+            return f"{element.size.get('width')} x {element.size.get('height')}" if element.size else None
+        return None
+
+    def sort_key(self, element: ElementData, column: int) -> Any:
+        """ Numeric keys for the location (x, y) and the size (area), text for the other columns """
+        if column == 4:
+            return (element.location.get('x'), element.location.get('y')) if element.location else (-1, -1)
+        if column == 5:
+            return element.size.get('width') * element.size.get('height') if element.size else -1
+        return self.display(element, column) or ""
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        element = self.elements[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.UserRole:
+            return element
+
+        if role == self.SORT_ROLE:
+            return self.sort_key(element, column)
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(element, column)
+
+        if role == Qt.ItemDataRole.ToolTipRole and column == 2:
+            return "\n".join(f"AppiumBy.{strategy}: {value}" for strategy, value in element.locators()) or None
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def clear(self):
+        self.update_items([])
+
+    def update_items(self, elements: List[ElementData]):
+        self.beginResetModel()
+        self.elements = list(elements)
+        self.endResetModel()
+
+    def row_of(self, element: ElementData) -> int:
+        """ Row of the element, -1 if not found """
+        return next((row for row, item in enumerate(self.elements) if item is element), -1)
+
+
+class ElementsFilterProxyModel(QSortFilterProxyModel):
+    """ Filter elements by type, clickable and resource id """
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._type: Optional[str] = None
+        self._clickable_only = False
+        self._resource_id = ""
+
+    def set_type(self, element_type: Optional[str]):
+        self._type = element_type or None
+        self.invalidateFilter()
+
+    def set_clickable_only(self, clickable_only: bool):
+        self._clickable_only = bool(clickable_only)
+        self.invalidateFilter()
+
+    def set_resource_id(self, resource_id: str):
+        self._resource_id = resource_id.strip().lower()
+        self.invalidateFilter()
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        # the location key is a tuple, which QVariant comparison does not order
+        return left.data(self.sortRole()) < right.data(self.sortRole())
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        element: ElementData = self.sourceModel().elements[source_row]
+        if self._type and element.type != self._type:
+            return False
+        if self._clickable_only and not element.clickable:
+            return False
+        if self._resource_id and self._resource_id not in (element.resource_id or "").lower():
+            return False
+        return True
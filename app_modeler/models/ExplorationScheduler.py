@@ -0,0 +1,66 @@
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from app_modeler.models.FunctionCall import FunctionCall
+from app_modeler.models.TestSession import TestSession, ClassData
+
+logger = logging.getLogger(__name__)
+
+
+class ExplorationScheduler:
+    """
+    Picks the next action for automatic exploration.
+
+    Unexecuted candidates of the current view are tried first, in their ranked order.
+    When the current view is fully explored the scheduler backtracks through the
+    known transitions towards the nearest view which still has unexecuted candidates.
+    """
+    def __init__(self, session: TestSession):
+        self._session = session
+        self._executed: dict[str, set[str]] = defaultdict(set)
+
+    def mark_executed(self, function_call: FunctionCall):
+        self._executed[function_call.view].add(function_call.function_name)
+
+    def is_executed(self, view: str, function_name: str) -> bool:
+        return function_name in self._executed.get(view, ())
+
+    def unexplored(self, class_data: ClassData) -> list[FunctionCall]:
+        """ Candidates of the view which have not been executed yet """
+        return [call for call in class_data.function_candidates
+                if not self.is_executed(class_data.name, call.function_name)]
+
+    def next_action(self, current: ClassData) -> Optional[FunctionCall]:
+        """ Get the next function call to execute, None when there is nothing left to explore """
+        unexplored = self.unexplored(current)
+        if unexplored:
+            return unexplored[0]
+
+        classes = {class_data.name: class_data for class_data in self._session.classes}
+
+        def has_unexplored(view: str) -> bool:
+            class_data = classes.get(view)
+            return class_data is not None and bool(self.unexplored(class_data))
+
+        path = self._session.graph.find_path(current.name, has_unexplored)
+        if not path:
+            logger.info(f'Nothing left to explore from {current.name}')
+            return None
+        target = path[-1].target
+        logger.debug(f'Backtracking from {current.name} to {target} in {len(path)} steps')
+        # copy, the recorded call is part of the history
+        return path[0].function_call.model_copy(update={'return_value': None, 'error': None})
+
+    def coverage(self) -> tuple[int, int]:
+        """ Executed and total candidate count of the discovered views """
+        executed = total = 0
+        for class_data in self._session.classes:
+            names = {call.function_name for call in class_data.function_candidates}
+            total += len(names)
+            executed += len(names & self._executed.get(class_data.name, set()))
+        return executed, total
+
+    def coverage_message(self) -> str:
+        executed, total = self.coverage()
+        return f'Explored {executed}/{total} actions in {len(self._session.classes)} views'
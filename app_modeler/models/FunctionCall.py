@@ -7,6 +7,9 @@ from PySide6.QtCore import QMetaObject, Qt, Q_ARG, Q_RETURN_ARG
 from PySide6.QtWidgets import QInputDialog
 from pydantic import BaseModel
 
+from app_modeler.utils import ArgumentParser
+from app_modeler.utils.ArgumentParser import Argument, parse_args, parse_kwargs, format_args
+
 logger = logging.getLogger(__name__)
 
 class NextFunction(BaseModel):
@@ -22,21 +25,35 @@ class NextFunction(BaseModel):
 class NextFunctionList(BaseModel):
     candidates: list[NextFunction]
 
+_IDENTIFIER = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+
+
 class FunctionCall(NextFunction):
     return_value: Optional[str] = None
     error: Optional[object] = None
 
+    @property
+    def parsed_args(self) -> tuple[Argument, ...]:
+        """ Parsed positional arguments, parsing is cached by the text """
+        return parse_args(self.args)
+
+    @property
+    def parsed_kwargs(self) -> tuple[tuple[str, Argument], ...]:
+        return parse_kwargs(self.kwargs)
+
     def get_args(self) -> tuple:
-        out = ()
-        for arg in self.args.split(','):
-            item = (arg.strip().strip('"'),)
-            if re.match(r'^{([^}]*)}$', item[0]):
-                value = self.get_input_from_user(item[0])
+        arguments = list(self.parsed_args)
+        asked = False
+        for index, argument in enumerate(arguments):
+            if argument.placeholder:
+                value = self.get_input_from_user(argument.placeholder)
                 logger.debug(f'User input: {value}')
-                item = (f'"{value}"',)
-                self.args = self.args.replace(arg, item[0])
-            out += item
-        return out
+                arguments[index] = Argument(value)
+                asked = True
+        if asked:
+            # the given values are recorded for the history and the generated tests
+            self.args = format_args(arguments)
+        return tuple(argument.value for argument in arguments)
 
     @staticmethod
     def get_input_from_user(arg: str) -> str:
@@ -53,27 +70,40 @@ class FunctionCall(NextFunction):
         return result
 
     def get_kwargs(self) -> dict:
-        out = {}
-        for arg in self.kwargs.split(','):
-            key_value = arg.split('=')
-            if len(key_value) == 2:
-                key, value = key_value
-                out[key.strip().strip('"')] = value.strip().strip('"')
-            else:
-                logger.warning(f"Invalid key-value pair: {arg}")
-        return out
+        return {key: argument.value for key, argument in self.parsed_kwargs}
 
-    def test(self):
-        if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', self.view):
-            raise ValueError(f"Invalid view name: {self.view}")
+    @staticmethod
+    def validate_view(view: str):
+        if not _IDENTIFIER.fullmatch(view):
+            raise ValueError(f"Invalid view name: {view}")
+
+    @staticmethod
+    def validate_function_name(function_name: str):
         # function name can be a regex
-        if not(self.function_name.startswith('/') and self.function_name.endswith('/')):
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', self.function_name):
-                raise ValueError(f"Invalid function name: {self.function_name}")
-        if self.args != '' and not re.match(r'^"([^"]*)"(?:,\s*"([^"]*)")*$', self.args):
-            raise ValueError(f"Invalid args: {self.args}")
-        if self.kwargs != '' and not re.match(r'^(?:"\w+"|\w+)=(?:"[^"]+"|\d+)(?:,\s*(?:"\w+"|\w+)=(?:"[^"]+"|\d+))*$', self.kwargs):
-            raise ValueError(f"Invalid kwargs: {self.kwargs}")
+        if function_name.startswith('/') and function_name.endswith('/'):
+            return
+        if not _IDENTIFIER.fullmatch(function_name):
+            raise ValueError(f"Invalid function name: {function_name}")
+
+    @staticmethod
+    def validate_args(args: str):
+        try:
+            ArgumentParser.validate_args(args)
+        except ValueError as error:
+            raise ValueError(f"Invalid args: {args}: {error}") from error
+
+    @staticmethod
+    def validate_kwargs(kwargs: str):
+        try:
+            ArgumentParser.validate_kwargs(kwargs)
+        except ValueError as error:
+            raise ValueError(f"Invalid kwargs: {kwargs}: {error}") from error
+
+    def test(self):
+        self.validate_view(self.view)
+        self.validate_function_name(self.function_name)
+        self.validate_args(self.args)
+        self.validate_kwargs(self.kwargs)
 
     def __str__(self):
         args = f"{self.args}"
@@ -1,9 +1,9 @@
-import re
-from typing import List, Any
+from typing import List, Any, Callable, Optional
 import logging
 
 from PySide6.QtCore import Qt, QModelIndex, QAbstractTableModel, QObject, Signal
 
+from app_modeler.models.ClassApi import ClassApi
 from app_modeler.models.FunctionCall import FunctionCall
 
 logger = logging.getLogger(__name__)
@@ -11,12 +11,24 @@ logger = logging.getLogger(__name__)
 
 class FunctionCallModel(QAbstractTableModel):
     layoutResetFinished = Signal()  # Custom signal to notify view
+    # editable column: (field, validator)
+    FIELDS = {
+        0: ('view', FunctionCall.validate_view),
+        1: ('function_name', FunctionCall.validate_function_name),
+        2: ('args', FunctionCall.validate_args),
+        3: ('kwargs', FunctionCall.validate_kwargs),
+    }
 
     def __init__(self, all_editable: bool = False, parent: QObject = None):
         super().__init__(parent)
         self._all_editable = all_editable
         self.functions: List[FunctionCall] = []
         self._headers = ['View', 'Function Name', 'Args', 'Kwargs']
+        self._api_resolver: Optional[Callable[[str], Optional[ClassApi]]] = None
+
+    def set_api_resolver(self, resolver: Callable[[str], Optional[ClassApi]]):
+        """ Set a callable which resolves the class API by view name, used for tooltips """
+        self._api_resolver = resolver
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self.functions)
@@ -43,6 +55,16 @@ class FunctionCallModel(QAbstractTableModel):
             elif column == 3:
                 return func.kwargs
 
+        if role == Qt.ItemDataRole.ToolTipRole and self._api_resolver:
+            class_api = self._api_resolver(func.view)
+            method = class_api.get_method(func.function_name) if class_api else None
+            if method is None:
+                return None
+            tooltip = f"{func.view}.{method.signature}"
+            for locator in method.locators:
+                tooltip += f"\nAppiumBy.{locator.strategy}: {locator.value}"
+            return tooltip
+
         return None
 
     def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
@@ -51,35 +73,14 @@ class FunctionCallModel(QAbstractTableModel):
         func = self.functions[index.row()]
         column = index.column()
 
-        if role == Qt.ItemDataRole.EditRole:
-            if column == 0:
-                try:
-                    FunctionCall(view=value, function_name=func.function_name, args=func.args, kwargs=func.kwargs).test()
-                except Exception as error:
-                    logger.warning(f'invalid function args: {error}')
-                    return False
-                func.view = value
-            if column == 1:
-                try:
-                    FunctionCall(view=func.view, function_name=value, args=func.args, kwargs=func.kwargs).test()
-                except Exception as error:
-                    logger.warning(f'invalid function args: {error}')
-                    return False
-                func.function_name = value
-            if column == 2:
-                try:
-                    FunctionCall(view=func.view, function_name=func.function_name, args=value, kwargs=func.kwargs).test()
-                except Exception as error:
-                    logger.warning(f'invalid function args: {error}')
-                    return False
-                func.args = value
-            elif column == 3:
-                try:
-                    FunctionCall(view=func.view, function_name=func.function_name, args=func.args, kwargs=value).test()
-                except Exception as error:
-                    logger.warning(f'invalid function kwargs: {error}')
-                    return False
-                func.kwargs = value
+        if role == Qt.ItemDataRole.EditRole and column in self.FIELDS:
+            field, validate = self.FIELDS[column]
+            try:
+                validate(value)
+            except ValueError as error:
+                logger.warning(f'invalid function {field}: {error}')
+                return False
+            setattr(func, field, value)
             self.dataChanged.emit(index, index, [role])
             return True
         return False
@@ -121,20 +122,34 @@ class FunctionCallModel(QAbstractTableModel):
         self.functions.append(function)
         self.endInsertRows()
 
+    def append_many(self, functions: List[FunctionCall]):
+        if not functions:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.functions), len(self.functions) + len(functions) - 1)
+        self.functions.extend(functions)
+        self.endInsertRows()
+
     def get_data(self) -> List[FunctionCall]:
         return self.functions
 
-    def update_args(self, function_call: FunctionCall):
-        self.beginResetModel()
-        for idx, func in enumerate(self.functions):
-            if function_call.function_name.startswith('/') and function_call.function_name.endswith('/'):
-                is_right = re.match(function_call.function_name[1:-1], func.function_name)
-            else:
-                is_right = func.function_name == function_call.function_name
-
-            if is_right:
-                func.args = function_call.args
-                func.kwargs = function_call.kwargs
-                break
-        self.endResetModel()
-        self.layoutResetFinished.emit()
+    def remove_rows(self, rows: List[int]):
+        """ Remove the rows, each row is removed with its own notification """
+        for row in sorted(set(rows), reverse=True):
+            if 0 <= row < len(self.functions):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.functions.pop(row)
+                self.endRemoveRows()
+
+    def refresh(self):
+        """ Notify views that the function calls were changed outside of the model, e.g. by execution """
+        if self.functions:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.functions) - 1, self.columnCount() - 1))
+
+    def apply_injects(self, apply: Callable[[List[FunctionCall]], List[int]]):
+        """ Apply the injects to the functions, changes are notified with a single signal
+        :param apply: applies the injects in place and returns the changed rows, e.g. ModelerState.apply_injects
+        """
+        changed_rows = apply(self.functions)
+        if changed_rows:
+            self.dataChanged.emit(self.index(changed_rows[0], 2), self.index(changed_rows[-1], 3),
+                                  [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
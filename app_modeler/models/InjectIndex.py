@@ -0,0 +1,59 @@
+import logging
+import re
+from collections import defaultdict
+from typing import List
+
+from app_modeler.models.FunctionCall import FunctionCall
+
+logger = logging.getLogger(__name__)
+
+
+class InjectIndex:
+    """
+    Argument presets (injects) indexed by function name.
+
+    Exact names are looked up from a dict, /regex/ names are compiled once when the index is built.
+    Each inject is applied to the first matching function, when several injects match
+    the same function the last one wins.
+    """
+    def __init__(self, injects: List[FunctionCall]):
+        self._injects = list(injects)
+        self._patterns: dict[int, re.Pattern] = {}
+        for order, inject in enumerate(self._injects):
+            if self.is_pattern(inject.function_name):
+                try:
+                    self._patterns[order] = re.compile(inject.function_name[1:-1])
+                except re.error as error:
+                    logger.warning(f"Invalid inject pattern {inject.function_name}: {error}")
+
+    def __len__(self) -> int:
+        return len(self._injects)
+
+    @staticmethod
+    def is_pattern(function_name: str) -> bool:
+        return len(function_name) > 1 and function_name.startswith('/') and function_name.endswith('/')
+
+    def apply(self, functions: List[FunctionCall]) -> List[int]:
+        """ Apply the injects to the functions, return the changed rows """
+        first_by_name: dict[str, int] = {}
+        for row, func in enumerate(functions):
+            first_by_name.setdefault(func.function_name, row)
+
+        # patterns are scanned one by one: each pattern needs its own first match, which a single
+        # alternation regex can not tell. The candidate lists are short and the patterns are precompiled.
+        targets: dict[int, List[FunctionCall]] = defaultdict(list)
+        for order, inject in enumerate(self._injects):
+            if self.is_pattern(inject.function_name):
+                pattern = self._patterns.get(order)
+                row = next((row for row, func in enumerate(functions)
+                            if pattern and pattern.match(func.function_name)), None)
+            else:
+                row = first_by_name.get(inject.function_name)
+            if row is not None:
+                targets[row].append(inject)
+
+        for row, injects in targets.items():
+            inject = injects[-1]
+            functions[row].args = inject.args
+            functions[row].kwargs = inject.kwargs
+        return sorted(targets)
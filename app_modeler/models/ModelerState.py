@@ -1,25 +1,32 @@
-import json
 import logging
-from typing import Optional
+import time
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
 
 from PySide6.QtCore import QObject, Signal, QSettings
-from appium import webdriver
 from selenium.common import NoSuchDriverException, InvalidSessionIdException
 from urllib3.exceptions import MaxRetryError
 
-from app_modeler.ai.OpenAiAssistant import OpenAIAssistant
-from app_modeler.ai.AppiumClassGenerator import AppiumClassGenerator
-from app_modeler.ai.TesterAi import TesterAi
-from app_modeler.appium_helpers.drivers.create import create_driver
+from app_modeler.ai.ActionRanker import CompositeRanker, LearnedRanker, RuleBasedRanker
+from app_modeler.ai.BudgetGovernor import BudgetGovernor
 from app_modeler.appium_helpers.elements.ElementsDiscover import ElementsDiscover
 from app_modeler.appium_helpers.elements.utils import resolve_root
 from app_modeler.models.AppSettings import AppSettings
+from app_modeler.models.ClassApi import ClassApi
+from app_modeler.models.ExplorationScheduler import ExplorationScheduler
 from app_modeler.models.FunctionCall import FunctionCall
+from app_modeler.models.InjectIndex import InjectIndex
+from app_modeler.models.Progress import Progress, ProgressReporter
 from app_modeler.models.StartOptions import StartOptions
 from app_modeler.models.TestSession import TestSession, ClassData
+from app_modeler.models.TransitionGraph import PathCost
 from app_modeler.models.WorkerThread import WorkerThread
-from app_modeler.utils.utils import load_module_from_code, generate_class_json_from_code, \
-    get_human_friendly_error_message
+from app_modeler.utils.utils import module_registry, get_class_api, get_human_friendly_error_message, view_fingerprint
+
+if TYPE_CHECKING:
+    # heavy imports, loaded on first use to keep the startup fast
+    from appium import webdriver
+    from app_modeler.ai.OpenAiAssistant import OpenAIAssistant
 
 logger = logging.getLogger(__name__)
 
@@ -34,13 +41,18 @@ class Signals(QObject):
     execute = Signal(FunctionCall)
     executed = Signal(FunctionCall)
     processing = Signal(bool)
+    progress = Signal(Progress)
     screenshot = Signal(bytearray)
     tokens_spend = Signal(int)
     class_propose = Signal(str)
-    elements_propose = Signal(str)
+    elements_propose = Signal(list)
+    element_selected = Signal(object)
     import_module = Signal()
     module_imported = Signal()
     next_func_candidates = Signal()
+    navigate = Signal(str)
+    # function calls replayed by a navigation, emitted once per navigation
+    navigated = Signal(list)
 
 
 class ModelerState(QObject):
@@ -49,14 +61,25 @@ class ModelerState(QObject):
         super().__init__()
         self._app_settings = app_settings
         self._appium_options: Optional[StartOptions] = None
-        self.ai_assistant: Optional[OpenAIAssistant] = None
+        self.ai_assistant: Optional['OpenAIAssistant'] = None
         self.signals = Signals()
         self.session = TestSession()
         self.worker_thread = None
-        self.driver: webdriver = None
+        self.driver: Optional['webdriver.Remote'] = None
         self.settings = QSettings("app_modeler.ini", QSettings.Format.IniFormat)
         self._current_view: Optional[ClassData] = None
+        # set when a navigation left the recorded path, the current view must be analysed again
+        self._view_stale = False
         self._view_index = 0
+        self.learned_ranker = LearnedRanker()
+        self.action_ranker = CompositeRanker(RuleBasedRanker(), self.learned_ranker)
+        self._observed_calls = 0
+        # duration of the last executed call, recorded to the transition graph
+        self._last_latency: Optional[float] = None
+        self.scheduler = ExplorationScheduler(self.session)
+        self.inject_index = InjectIndex([])
+        # shared by the assistants of all connections, the session usage accumulates across reconnects
+        self.budget = BudgetGovernor(settings_file=self.settings.fileName())
         self._connect_signals()
 
     def _connect_signals(self):
@@ -65,12 +88,19 @@ class ModelerState(QObject):
         self.signals.analyse.connect(self.on_analyse)
         self.signals.import_module.connect(self.on_import_module)
         self.signals.execute.connect(self.on_execute)
+        self.signals.navigate.connect(self.on_navigate)
         self.signals.executed.connect(self.session.call_history.append)
+        self.signals.navigated.connect(self.session.call_history.extend)
 
     @property
     def current_view(self) -> Optional[ClassData]:
         return self._current_view
 
+    def get_class_api(self, view_name: str) -> Optional[ClassApi]:
+        """ Get the API of the given view if it is known """
+        class_data = self.session.get_class(view_name)
+        return class_data.api if class_data else None
+
     @property
     def app_settings(self) -> AppSettings:
         return self._app_settings
@@ -86,7 +116,7 @@ class ModelerState(QObject):
                 logger.debug('Waiting for thread to finish')
                 self.worker_thread.wait()
                 logger.debug('Thread finished')
-            logger.debug(f'Calling {func.__name__}')
+            logger.debug('Calling %s', func.__name__)
             return func(self, *args, **kwargs)
         return wrapper
 
@@ -101,6 +131,9 @@ class ModelerState(QObject):
     def do_connect(self, start_options: StartOptions) -> bytes:
         self.signals.status_message.emit('Connecting to appium server')
         self._appium_options = start_options
+        from app_modeler.appium_helpers.drivers.create import create_driver
+        from app_modeler.ai.OpenAiAssistant import OpenAIAssistant
+        from app_modeler.ai.RateLimiter import get_rate_limiter
         try:
             self.driver = create_driver(start_options)
         except MaxRetryError as error:
@@ -108,7 +141,19 @@ class ModelerState(QObject):
         token = start_options.app_settings.token
         base_url = start_options.app_settings.base_url
         model = start_options.app_settings.model
-        self.ai_assistant = OpenAIAssistant(api_key=token, base_url=base_url, model=model)
+        self.budget.session_limit = start_options.app_settings.session_token_limit or None
+        self.budget.daily_limit = start_options.app_settings.daily_token_limit or None
+        app_settings = start_options.app_settings
+        # shared with other assistants of the same key, the limits are updated
+        rate_limiter = get_rate_limiter(token, base_url,
+                                        requests_per_minute=app_settings.requests_per_minute,
+                                        tokens_per_minute=app_settings.tokens_per_minute,
+                                        max_concurrency=app_settings.max_concurrent_requests)
+        self.ai_assistant = OpenAIAssistant(api_key=token, base_url=base_url, model=model, budget=self.budget,
+                                            rate_limiter=rate_limiter,
+                                            history_exchanges=app_settings.history_exchanges,
+                                            history_max_tokens=app_settings.history_max_tokens)
+        self.load_ranker_model()
         return self.get_screenshot()
 
     def get_screenshot(self):
@@ -117,6 +162,17 @@ class ModelerState(QObject):
             return root.get_screenshot_as_png()
         return root.screenshot_as_png
 
+    def load_ranker_model(self):
+        filename = self.app_settings.ranker_model_file
+        if filename and Path(filename).exists():
+            self.learned_ranker.load(Path(filename))
+            logger.debug(f'Loaded ranker model with {self.learned_ranker.samples} samples')
+
+    def save_ranker_model(self):
+        filename = self.app_settings.ranker_model_file
+        if filename and self.learned_ranker.samples:
+            self.learned_ranker.save(Path(filename))
+
     def on_connected(self, screenshot: bytes):
         self.signals.screenshot.emit(screenshot)
         self.signals.connected.emit()
@@ -129,6 +185,9 @@ class ModelerState(QObject):
             except InvalidSessionIdException:
                 pass
         self.driver = None
+        self.save_ranker_model()
+        # instantiated views are bound to the old driver
+        module_registry.clear_instances()
         self.signals.disconnected.emit()
 
     @wait_for_thread
@@ -164,19 +223,17 @@ class ModelerState(QObject):
         logger.debug('Discover elements')
         self.signals.status_message.emit('Discovering elements')
         discover = ElementsDiscover(self.driver)
-        def progress_callback(elements: int):
-            self.signals.status_message.emit(f'Discovering elements: {elements}')
-        elements_data = discover.scan_view(progress_callback)
-        elements_str = json.dumps([elem.asdict_custom() for elem in elements_data], indent=4)
-        self.signals.elements_propose.emit(elements_str)
+        reporter = ProgressReporter(self.signals.progress, 'Discovering elements')
+        elements_data = discover.scan_view(reporter.update)
+        self.signals.elements_propose.emit(elements_data)
 
         # look if we have a previous class
-        class_data: ClassData = next((cd for cd in self.session.classes
-                                      if cd.elements == elements_data),  # compare elements
-                                     None)
+        fingerprint = view_fingerprint(elements_data)
+        class_data: Optional[ClassData] = self.session.find_class(fingerprint)
         if class_data:
             logger.debug('Found previous class, reuse it')
             self._current_view = class_data
+            self._view_stale = False
             class_name = class_data.name
             class_str = class_data.class_str
         else:
@@ -184,22 +241,35 @@ class ModelerState(QObject):
             self.signals.status_message.emit('Generating class code')
             class_name = f'View{self._view_index}'
             self._view_index += 1
-            class_generator = AppiumClassGenerator(self.ai_assistant, prompt_template=self.app_settings.class_generator_prompt)
+            from app_modeler.ai.AppiumClassGenerator import AppiumClassGenerator
+            class_generator = AppiumClassGenerator(self.ai_assistant, prompt_template=self.app_settings.class_generator_prompt,
+                                                   model=self.app_settings.class_generation_model)
             class_str = class_generator.generate(class_name=class_name, elements=elements_data)
             self.signals.tokens_spend.emit(self.ai_assistant.used_tokens)
 
         self.signals.class_propose.emit(class_str)
-
-        logger.debug('Ask next functions')
-        self.signals.status_message.emit('Asking next functions')
-        tester = TesterAi(self.ai_assistant, prompt_template=self.app_settings.tester_prompt)
-
-        class_docstring = generate_class_json_from_code(class_str, class_name)
-        previous_steps = [str(func_call) for func_call in self.session.call_history]
-        logger.debug(f"Previous steps: {previous_steps}")
-        next_functions: [FunctionCall] = tester.ask_next_step(class_docstring, previous_steps=previous_steps)
-        logger.debug(f"Next functions: {next_functions}")
-        self.signals.tokens_spend.emit(self.ai_assistant.used_tokens)
+        self.session.graph.add_view(class_name, fingerprint)
+        logger.info('Analysed view %s', class_name,
+                    extra={'event': 'view', 'view': class_name, 'elements': len(elements_data),
+                           'known': class_data is not None})
+        self.observe_last_call(class_name)
+
+        class_api = get_class_api(class_str, class_name)
+        ai_candidates = class_data.ai_candidates if class_data else []
+        next_functions = self.rank_locally(class_api, prior=ai_candidates)
+        if next_functions is None:
+            logger.debug('Ask next functions')
+            self.signals.status_message.emit('Asking next functions')
+            from app_modeler.ai.TesterAi import TesterAi
+            tester = TesterAi(self.ai_assistant, prompt_template=self.app_settings.tester_prompt,
+                              model=self.app_settings.ranking_model)
+
+            previous_steps = [str(func_call) for func_call in self.session.call_history]
+            logger.debug("Previous steps: %s", previous_steps)
+            next_functions: [FunctionCall] = tester.ask_next_step(class_api, previous_steps=previous_steps)
+            ai_candidates = next_functions
+            self.signals.tokens_spend.emit(self.ai_assistant.used_tokens)
+        logger.debug("Next functions: %s", next_functions)
 
         if not class_data:
             # create new class
@@ -207,15 +277,61 @@ class ModelerState(QObject):
                                    screenshot=screenshot,
                                    elements=elements_data,
                                    class_str=class_str,
-                                   function_candidates=next_functions)
+                                   function_candidates=next_functions,
+                                   ai_candidates=ai_candidates,
+                                   fingerprint=fingerprint)
             self.session.classes.append(class_data)
             self._current_view = class_data
+            self._view_stale = False
         else:
             # update new next function candidates
             class_data.function_candidates = next_functions
+            class_data.ai_candidates = ai_candidates
 
         logger.debug('Next functions available')
 
+    def rank_locally(self, class_api: ClassApi, prior: [FunctionCall]) -> Optional[list[FunctionCall]]:
+        """ Rank next functions without AI. Return None when the ranking is not confident enough """
+        threshold = self.app_settings.local_ranker_confidence
+        if threshold is None:
+            return None
+        ranked = self.action_ranker.rank(class_api, self.session.call_history, prior=prior)
+        confidence = self.action_ranker.confidence(ranked)
+        if not ranked or confidence < threshold:
+            logger.debug(f'Local ranking not confident: {confidence:.2f} < {threshold}')
+            return None
+        logger.info(f'Using local ranking, confidence: {confidence:.2f}')
+        return [action.function_call for action in ranked]
+
+    def observe_last_call(self, view_name: str):
+        """ Record the transition of the last executed call and teach the learned ranker whether it changed the view """
+        history = self.session.call_history
+        # calls executed without analyse in between are skipped, their outcome is unknown
+        if len(history) > self._observed_calls:
+            last_call = history[-1]
+            if last_call.error is None:
+                self.session.graph.add_transition(last_call.view, last_call, view_name, latency=self._last_latency)
+            self.learned_ranker.observe(last_call, view_changed=last_call.view != view_name)
+        self.session.graph.add_view(view_name)
+        self._observed_calls = len(history)
+
+    def set_injects(self, injects: list[FunctionCall]):
+        """ Set the argument presets, patterns are compiled once here """
+        self.inject_index = InjectIndex(injects)
+
+    def apply_injects(self, function_calls: list[FunctionCall]) -> list[int]:
+        """ Apply the argument presets to the function calls, return the changed indexes.
+        Shared by the GUI and the headless callers, so both use the same index """
+        return self.inject_index.apply(function_calls)
+
+    def next_exploration_action(self) -> Optional[FunctionCall]:
+        """ Pick the next function call for automatic exploration, None when everything reachable is explored """
+        if self._current_view is None or self._view_stale:
+            return None
+        function_call = self.scheduler.next_action(self._current_view)
+        self.signals.status_message.emit(self.scheduler.coverage_message())
+        return function_call
+
     @wait_for_thread
     def on_import_module(self):
         logger.debug('Importing module')
@@ -228,12 +344,13 @@ class ModelerState(QObject):
     def do_import_module(self, class_name):
         logger.debug('Do import module')
         class_str = self._current_view.class_str
-        self._current_view.view = load_module_from_code(class_str, class_name, self.driver)
-        logger.debug(f'Imported module: {self._current_view.view}')
+        # compiled module and instance are reused when switching back to a visited view
+        self._current_view.view = module_registry.get_instance(class_str, class_name, self.driver)
+        logger.debug('Imported module: %s', self._current_view.view)
 
     @wait_for_thread
     def on_execute(self, function_call: FunctionCall):
-        logger.debug(f'Execute function: {function_call}')
+        logger.debug('Execute function: %s', function_call)
         self.worker_thread = WorkerThread(self.do_execute, function_call)
         self.worker_thread.busy.connect(self.signals.processing.emit)
         self.worker_thread.result_signal.connect(self.signals.executed.emit)
@@ -243,10 +360,97 @@ class ModelerState(QObject):
         self.worker_thread.start()
 
     def do_execute(self, function_call: FunctionCall) -> FunctionCall:
-        function_call.call(self._current_view.view)
+        if self._view_stale:
+            raise ValueError('Current view is unknown after the navigation, analyse the view first')
+        # failing calls count as explored too, otherwise auto execute would retry them forever
+        self.scheduler.mark_executed(function_call)
+        self._last_latency = None
+        start = time.perf_counter()
+        try:
+            function_call.call(self._current_view.view)
+        except Exception:
+            self.session.graph.add_failure(function_call.view, function_call)
+            raise
+        self._last_latency = time.perf_counter() - start
+        logger.info('Executed %s', function_call,
+                    extra={'event': 'execute', 'view': function_call.view, 'function': function_call.function_name,
+                           'latency': self._last_latency})
         return function_call
 
+    @wait_for_thread
+    def on_navigate(self, view_name: str):
+        logger.debug(f'Navigate to view: {view_name}')
+        self.worker_thread = WorkerThread(self.do_navigate, view_name)
+        self.worker_thread.busy.connect(self.signals.processing.emit)
+        self.worker_thread.result_signal.connect(self.on_navigated)
+        self.worker_thread.error_signal.connect(self.on_navigation_failed)
+        self.worker_thread.start()
 
-
-
-
+    def do_navigate(self, view_name: str) -> list[FunctionCall]:
+        """ Drive the device to a known view through the shortest known path
+        :return: executed function calls
+        :raise: the error of the failing hop, its executed attribute holds the calls executed so far
+        """
+        if self._current_view is None or self._view_stale:
+            raise ValueError('Current view is unknown, analyse the view first')
+        cost = PathCost.TIME if self.app_settings.fastest_navigation else PathCost.STEPS
+        path = self.session.graph.shortest_path(self._current_view.name, view_name, cost)
+        if path is None:
+            raise ValueError(f'No known path from {self._current_view.name} to {view_name}')
+
+        executed = []
+        reporter = ProgressReporter(self.signals.progress, f'Navigating to {view_name}', total=len(path))
+        for transition in path:
+            class_data = self.session.get_class(transition.source)
+            view = module_registry.get_instance(class_data.class_str, class_data.name, self.driver)
+            function_call = transition.function_call.model_copy(update={'return_value': None, 'error': None})
+            start = time.perf_counter()
+            try:
+                function_call.call(view)
+            except Exception as error:
+                self.session.graph.add_failure(transition.source, function_call)
+                # the call failed before leaving the view
+                self._current_view = class_data
+                error.executed = executed + [function_call]
+                raise
+            latency = time.perf_counter() - start
+            reached = self.identify_view()
+            if reached is None or reached.name != transition.target:
+                # the app did not follow the recorded transition, stop before acting on a wrong view
+                # keep the last known view until the screen is analysed again
+                self._current_view = class_data
+                self._view_stale = True
+                reached_name = reached.name if reached else 'an unknown view'
+                error = RuntimeError(f'Navigation to {view_name} stopped: {function_call} led to '
+                                     f'{reached_name} instead of {transition.target}')
+                error.executed = executed + [function_call]
+                raise error
+            self.session.graph.add_transition(transition.source, function_call, transition.target, latency=latency)
+            self._current_view = reached
+            executed.append(function_call)
+            reporter.update(len(executed))
+        return executed
+
+    def identify_view(self) -> Optional[ClassData]:
+        """ Known view matching the elements currently on the screen """
+        try:
+            elements_data = ElementsDiscover(self.driver).scan_view(lambda done, total: None)
+        except StopIteration:
+            return None
+        return self.session.find_class(view_fingerprint(elements_data))
+
+    def on_navigated(self, executed: list[FunctionCall]):
+        # not emitted as executed calls, auto analyse would run once per call
+        self.signals.navigated.emit(executed)
+        # navigation transitions are already recorded
+        self._observed_calls = len(self.session.call_history)
+        # refresh the screenshot and the candidates once
+        self.signals.analyse.emit()
+
+    def on_navigation_failed(self, error: Exception):
+        # the hops executed before the failure and the failing call still belong to the history
+        executed = getattr(error, 'executed', None)
+        if executed:
+            self.signals.navigated.emit(executed)
+            self._observed_calls = len(self.session.call_history)
+        self.on_error(error)
@@ -0,0 +1,53 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import SignalInstance
+
+
+@dataclass
+class Progress:
+    stage: str
+    done: int = 0
+    total: Optional[int] = None
+    # estimated seconds left
+    eta: Optional[float] = None
+
+    @property
+    def message(self) -> str:
+        if self.total is None:
+            return f"{self.stage}: {self.done}"
+        message = f"{self.stage}: {self.done}/{self.total}"
+        if self.eta is not None and self.done < self.total:
+            message += f" (ETA {self.eta:.0f}s)"
+        return message
+
+
+class ProgressReporter:
+    """
+    Coalesces progress updates of a worker to a signal.
+    Updates are emitted at most max_rate times per second, the final update is always emitted.
+    """
+    def __init__(self, signal: SignalInstance, stage: str, total: Optional[int] = None, max_rate: float = 20.0):
+        self._signal = signal
+        self._interval = 1.0 / max_rate
+        self._stage = stage
+        self._total = total
+        self._started = time.monotonic()
+        self._last_emit = 0.0
+
+    def update(self, done: int, total: Optional[int] = None):
+        if total is not None:
+            self._total = total
+        now = time.monotonic()
+        final = self._total is not None and done >= self._total
+        if not final and now - self._last_emit < self._interval:
+            return
+        self._last_emit = now
+        self._signal.emit(Progress(stage=self._stage, done=done, total=self._total, eta=self._eta(done, now)))
+
+    def _eta(self, done: int, now: float) -> Optional[float]:
+        if not self._total or done <= 0:
+            return None
+        elapsed = now - self._started
+        return elapsed / done * (self._total - done)
@@ -3,7 +3,10 @@ from typing import Optional
 
 from app_modeler.appium_helpers.AppiumInterface import AppiumInterface
 from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
+from app_modeler.models.ClassApi import ClassApi
 from app_modeler.models.FunctionCall import FunctionCall
+from app_modeler.models.TransitionGraph import TransitionGraph
+from app_modeler.utils.utils import get_class_api
 
 
 @dataclass
@@ -14,10 +17,27 @@ class ClassData:
     class_str: str
     view: Optional[AppiumInterface] = None
     function_candidates: [FunctionCall] = field(default_factory=list)
+    # latest candidates ranked by AI, used as a prior for local ranking
+    ai_candidates: [FunctionCall] = field(default_factory=list)
+    fingerprint: Optional[str] = None
+
+    @property
+    def api(self) -> ClassApi:
+        """ API of the class, parsed once per class source """
+        return get_class_api(self.class_str, self.name)
 
 
 @dataclass
 class TestSession:
     classes: [ClassData] = field(default_factory=list)
     call_history: [FunctionCall] = field(default_factory=list)
+    graph: TransitionGraph = field(default_factory=TransitionGraph)
+
+    def get_class(self, name: str) -> Optional[ClassData]:
+        return next((class_data for class_data in self.classes if class_data.name == name), None)
+
+    def find_class(self, fingerprint: str) -> Optional[ClassData]:
+        """ Find a visited view by its elements fingerprint """
+        name = self.graph.find_view(fingerprint)
+        return self.get_class(name) if name else None
 
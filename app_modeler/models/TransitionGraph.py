@@ -0,0 +1,153 @@
+import heapq
+import itertools
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from app_modeler.models.FunctionCall import FunctionCall
+
+
+class PathCost(Enum):
+    STEPS = 'steps'
+    TIME = 'time'
+
+
+@dataclass
+class ViewNode:
+    name: str
+    fingerprint: Optional[str] = None
+
+
+@dataclass
+class Transition:
+    """ Function call on the source view which lead to the target view """
+    source: str
+    function_call: FunctionCall
+    target: str
+    successes: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+
+    @property
+    def attempts(self) -> int:
+        return self.successes + self.failures
+
+    @property
+    def success_rate(self) -> float:
+        # unknown edges are assumed to work
+        return self.successes / self.attempts if self.attempts else 1.0
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """ Mean duration of the successful calls in seconds """
+        return self.total_latency / self.successes if self.successes else None
+
+    def cost(self, cost: PathCost, default_latency: float) -> float:
+        """ Expected cost to pass the edge, failing edges are retried """
+        if cost == PathCost.TIME:
+            latency = self.mean_latency if self.mean_latency is not None else default_latency
+        else:
+            latency = 1.0
+        return latency / self.success_rate
+
+
+class TransitionGraph:
+    """
+    Graph of the discovered views (nodes) and executed function calls (edges).
+    Views are identified by the class name, the elements fingerprint maps a scanned view to its node.
+    """
+    DEFAULT_LATENCY = 1.0
+
+    def __init__(self):
+        self._views: dict[str, ViewNode] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._transitions: dict[str, dict[str, Transition]] = defaultdict(dict)
+
+    @property
+    def views(self) -> set[str]:
+        return set(self._views)
+
+    def add_view(self, view: str, fingerprint: Optional[str] = None) -> ViewNode:
+        node = self._views.setdefault(view, ViewNode(name=view))
+        if fingerprint:
+            node.fingerprint = fingerprint
+            self._fingerprints[fingerprint] = view
+        return node
+
+    def find_view(self, fingerprint: str) -> Optional[str]:
+        """ Name of the view with the fingerprint """
+        return self._fingerprints.get(fingerprint)
+
+    def get_transition(self, source: str, function_call: FunctionCall) -> Optional[Transition]:
+        return self._transitions.get(source, {}).get(str(function_call))
+
+    def add_transition(self, source: str, function_call: FunctionCall, target: str,
+                       latency: Optional[float] = None) -> Transition:
+        """ Record a successful call of the function from the source view to the target view """
+        self.add_view(source)
+        self.add_view(target)
+        transition = self.get_transition(source, function_call)
+        if transition is None:
+            transition = Transition(source=source, function_call=function_call, target=target)
+            self._transitions[source][str(function_call)] = transition
+        transition.target = target
+        transition.successes += 1
+        if latency is not None:
+            transition.total_latency += latency
+        return transition
+
+    def add_failure(self, source: str, function_call: FunctionCall) -> Optional[Transition]:
+        """ Record a failed call, only known transitions are tracked """
+        transition = self.get_transition(source, function_call)
+        if transition is not None:
+            transition.failures += 1
+        return transition
+
+    def transitions_from(self, view: str) -> list[Transition]:
+        return list(self._transitions.get(view, {}).values())
+
+    def find_path(self, source: str, is_target: Callable[[str], bool]) -> Optional[list[Transition]]:
+        """ Find the shortest path (breadth first) from the source view to the nearest view accepted by is_target.
+        Return an empty list if the source itself is a target, None if there is no path.
+        """
+        if is_target(source):
+            return []
+        visited = {source}
+        queue = deque([(source, [])])
+        while queue:
+            view, path = queue.popleft()
+            for transition in self.transitions_from(view):
+                if transition.target in visited or transition.successes == 0:
+                    continue
+                new_path = path + [transition]
+                if is_target(transition.target):
+                    return new_path
+                visited.add(transition.target)
+                queue.append((transition.target, new_path))
+        return None
+
+    def shortest_path(self, source: str, target: str, cost: PathCost = PathCost.STEPS) -> Optional[list[Transition]]:
+        """ Find the cheapest path (Dijkstra) from the source view to the target view.
+        :param cost: PathCost.STEPS for fewest actions, PathCost.TIME for fastest.
+        :return: transitions to execute, empty if source is target, None if the target is unreachable.
+        """
+        if source == target:
+            return []
+        counter = itertools.count()  # tie breaker, transitions are not comparable
+        queue = [(0.0, next(counter), source, [])]
+        best = {source: 0.0}
+        while queue:
+            distance, _, view, path = heapq.heappop(queue)
+            if view == target:
+                return path
+            if distance > best.get(view, float('inf')):
+                continue
+            for transition in self.transitions_from(view):
+                if transition.successes == 0:
+                    continue
+                new_distance = distance + transition.cost(cost, self.DEFAULT_LATENCY)
+                if new_distance < best.get(transition.target, float('inf')):
+                    best[transition.target] = new_distance
+                    heapq.heappush(queue, (new_distance, next(counter), transition.target, path + [transition]))
+        return None
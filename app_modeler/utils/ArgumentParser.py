@@ -0,0 +1,108 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Union
+
+# a value followed by a comma or the end of the text, quoted values may contain commas and escaped quotes
+_VALUE = re.compile(r'\s*(?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<bare>[^,"]*?))\s*(?:(?P<separator>,)|$)')
+_KEYWORD = re.compile(r'\s*(?:"(?P<quoted>\w+)"|(?P<bare>\w+))\s*=')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_ESCAPE = re.compile(r'\\(.)')
+_PLACEHOLDER = re.compile(r'{([^}]*)}')
+
+CACHE_SIZE = 4096
+
+
+class ArgumentError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Argument:
+    value: Union[str, int, float]
+    quoted: bool = True
+
+    @property
+    def placeholder(self) -> Optional[str]:
+        """ The {name} placeholder, the value is asked from the user when called """
+        if isinstance(self.value, str) and _PLACEHOLDER.fullmatch(self.value):
+            return self.value
+        return None
+
+    @property
+    def source(self) -> str:
+        if not self.quoted:
+            return str(self.value)
+        escaped = str(self.value).replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped}"'
+
+
+def _convert(match: re.Match) -> Argument:
+    quoted = match.group('quoted')
+    if quoted is not None:
+        return Argument(_ESCAPE.sub(r'\1', quoted))
+    bare = match.group('bare')
+    if not bare:
+        raise ArgumentError(f"Missing value at {match.start()}")
+    if _NUMBER.fullmatch(bare):
+        return Argument(float(bare) if '.' in bare else int(bare), quoted=False)
+    return Argument(bare, quoted=False)
+
+
+def _parse_values(text: str, position: int = 0, keywords: bool = False) -> list[tuple[Optional[str], Argument]]:
+    items = []
+    while True:
+        key = None
+        if keywords:
+            match = _KEYWORD.match(text, position)
+            if match is None:
+                raise ArgumentError(f"Invalid key-value pair at {position}: {text[position:]}")
+            key = match.group('quoted') or match.group('bare')
+            position = match.end()
+        match = _VALUE.match(text, position)
+        if match is None:
+            raise ArgumentError(f"Invalid value at {position}: {text[position:]}")
+        items.append((key, _convert(match)))
+        position = match.end()
+        if match.group('separator') is None:
+            return items
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_args(text: str) -> tuple[Argument, ...]:
+    """ Parse comma separated positional arguments, e.g. '"a, b", 5' """
+    if not text.strip():
+        return ()
+    return tuple(argument for _, argument in _parse_values(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_kwargs(text: str) -> tuple[tuple[str, Argument], ...]:
+    """ Parse comma separated keyword arguments, e.g. 'text="a, b", index=5' """
+    if not text.strip():
+        return ()
+    return tuple(_parse_values(text, keywords=True))
+
+
+def _check_quoted(arguments: list[Argument]):
+    for argument in arguments:
+        if not argument.quoted and isinstance(argument.value, str):
+            raise ArgumentError(f"String value must be quoted: {argument.value}")
+
+
+def validate_args(text: str) -> tuple[Argument, ...]:
+    """ Strict parsing used for edited values, strings have to be quoted """
+    arguments = parse_args(text)
+    _check_quoted(list(arguments))
+    return arguments
+
+
+def validate_kwargs(text: str) -> tuple[tuple[str, Argument], ...]:
+    """ Strict parsing used for edited values, strings have to be quoted """
+    kwargs = parse_kwargs(text)
+    _check_quoted([argument for _, argument in kwargs])
+    return kwargs
+
+
+def format_args(arguments: list[Argument]) -> str:
+    return ", ".join(argument.source for argument in arguments)
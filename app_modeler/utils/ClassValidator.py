@@ -0,0 +1,187 @@
+import ast
+import inspect
+import logging
+import re
+from dataclasses import dataclass, field
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from app_modeler.appium_helpers.AppiumInterface import AppiumInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ValidationResult:
+    """ Result of the generated class validation """
+    source: str
+    errors: list[str] = field(default_factory=list)
+    fixes: list[str] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+class ClassValidator:
+    """
+    Static validation of the AI generated view classes.
+
+    The source is analysed with AST without executing it. Trivial issues
+    (code fences, missing imports, misspelled super().__init__ call, wrong class name)
+    are repaired in place, everything else is reported as an error.
+    """
+    REQUIRED_IMPORTS = {
+        'AppiumBy': 'from appium.webdriver.common.appiumby import AppiumBy',
+        'AppiumInterface': 'from app_modeler.appium_helpers.AppiumInterface import AppiumInterface',
+    }
+    LOCATOR_STRATEGIES = frozenset(name for name in dir(AppiumBy) if name.isupper())
+    BASE_METHODS = frozenset(name for name, _ in inspect.getmembers(AppiumInterface, inspect.isfunction))
+
+    _code_fence_re = re.compile(r'^\s*```[a-zA-Z]*\s*\n(.*?)\n\s*```\s*$', re.DOTALL)
+    _super_init_typo_re = re.compile(r'super\(\)\.(?:init|_init_|__init)\(')
+
+    def __init__(self, class_name: str):
+        self._class_name = class_name
+
+    def validate(self, source: str) -> ValidationResult:
+        """ Validate the class source and repair trivial issues """
+        result = ValidationResult(source=source)
+        self._repair_code_fences(result)
+        self._repair_super_init(result)
+        try:
+            tree = ast.parse(result.source)
+        except SyntaxError as error:
+            result.errors.append(f"Syntax error at line {error.lineno}: {error.msg}")
+            return result
+
+        class_node = self._find_class(tree, result)
+        if class_node is None:
+            return result
+        if self._repair_imports(tree, result):
+            tree = ast.parse(result.source)
+            class_node = self._find_class(tree, result)
+
+        self._check_base_class(class_node, result)
+        self._check_constructor(class_node, result)
+        self._check_locators(class_node, result)
+        self._check_method_references(class_node, result)
+
+        for fix in result.fixes:
+            logger.debug(f'Repaired {self._class_name}: {fix}')
+        return result
+
+    def _repair_code_fences(self, result: ValidationResult):
+        match = self._code_fence_re.match(result.source)
+        if match:
+            result.source = match.group(1)
+            result.fixes.append("removed markdown code fences")
+
+    def _repair_super_init(self, result: ValidationResult):
+        source, count = self._super_init_typo_re.subn('super().__init__(', result.source)
+        if count:
+            result.source = source
+            result.fixes.append("fixed super().__init__ call")
+
+    def _find_class(self, tree: ast.Module, result: ValidationResult):
+        classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+        class_node = next((node for node in classes if node.name == self._class_name), None)
+        if class_node is not None:
+            return class_node
+        if len(classes) == 1:
+            # the class has just been named differently
+            wrong_name = classes[0].name
+            result.source = self._rename_class(result.source, classes[0], self._class_name)
+            result.fixes.append(f"renamed class {wrong_name} to {self._class_name}")
+            return self._find_class(ast.parse(result.source), result)
+        result.errors.append(f"Class '{self._class_name}' not found")
+        return None
+
+    @staticmethod
+    def _rename_class(source: str, class_node: ast.ClassDef, name: str) -> str:
+        """ Rename only the class definition, strings and other references keep the old name """
+        lines = source.splitlines(keepends=True)
+        line = lines[class_node.lineno - 1]
+        # top level class, col_offset points to the 'class' keyword
+        pattern = re.compile(rf'(class\s+){re.escape(class_node.name)}\b')
+        lines[class_node.lineno - 1] = (line[:class_node.col_offset]
+                                        + pattern.sub(rf'\g<1>{name}', line[class_node.col_offset:], count=1))
+        return "".join(lines)
+
+    def _repair_imports(self, tree: ast.Module, result: ValidationResult) -> bool:
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                imported.update(alias.asname or alias.name.split('.')[0] for alias in node.names)
+        used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        missing = [name for name in self.REQUIRED_IMPORTS if name in used and name not in imported]
+        if not missing:
+            return False
+        imports = "\n".join(self.REQUIRED_IMPORTS[name] for name in missing)
+        result.source = f"{imports}\n{result.source}"
+        result.fixes.append(f"added missing imports: {', '.join(missing)}")
+        return True
+
+    @staticmethod
+    def _check_base_class(class_node: ast.ClassDef, result: ValidationResult):
+        base_names = [base.id if isinstance(base, ast.Name) else getattr(base, 'attr', None)
+                      for base in class_node.bases]
+        if 'AppiumInterface' not in base_names:
+            result.errors.append(f"Class '{class_node.name}' must inherit from AppiumInterface")
+
+    @staticmethod
+    def _check_constructor(class_node: ast.ClassDef, result: ValidationResult):
+        init = next((node for node in class_node.body
+                     if isinstance(node, ast.FunctionDef) and node.name == '__init__'), None)
+        if init is None:
+            # inherited constructor is fine
+            return
+        args = init.args
+        positional = [arg.arg for arg in args.posonlyargs + args.args]
+        required_kwonly = [arg.arg for arg, default in zip(args.kwonlyargs, args.kw_defaults) if default is None]
+        if len(positional) - len(args.defaults) > 2 or len(positional) < 2 or required_kwonly:
+            result.errors.append(f"Constructor signature must be __init__(self, driver), "
+                                 f"got __init__({', '.join(positional + required_kwonly)})")
+        calls_super = any(isinstance(node, ast.Call)
+                          and isinstance(node.func, ast.Attribute) and node.func.attr == '__init__'
+                          and isinstance(node.func.value, ast.Call)
+                          and isinstance(node.func.value.func, ast.Name) and node.func.value.func.id == 'super'
+                          for node in ast.walk(init))
+        if not calls_super:
+            result.errors.append("Constructor must call super().__init__(driver)")
+
+    def _check_locators(self, class_node: ast.ClassDef, result: ValidationResult):
+        for node in ast.walk(class_node):
+            if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                    and node.value.id == 'AppiumBy'):
+                continue
+            if node.attr not in self.LOCATOR_STRATEGIES:
+                result.errors.append(f"Unknown locator strategy AppiumBy.{node.attr} at line {node.lineno}")
+        for node in ast.walk(class_node):
+            if not (isinstance(node, ast.Tuple) and node.elts and isinstance(node.elts[0], ast.Attribute)
+                    and isinstance(node.elts[0].value, ast.Name) and node.elts[0].value.id == 'AppiumBy'):
+                continue
+            if len(node.elts) != 2:
+                result.errors.append(f"Locator at line {node.lineno} must be a (AppiumBy, value) tuple")
+            elif isinstance(node.elts[1], ast.Constant) and not isinstance(node.elts[1].value, str):
+                result.errors.append(f"Locator value at line {node.lineno} must be a string")
+
+    def _check_method_references(self, class_node: ast.ClassDef, result: ValidationResult):
+        known = set(self.BASE_METHODS)
+        known.update(node.name for node in class_node.body
+                     if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)))
+        for node in ast.walk(class_node):
+            # attributes assigned in the class, e.g. self.locator = (...) or class level constants
+            if isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Attribute):
+                        known.add(target.attr)
+                    elif isinstance(target, ast.Name):
+                        known.add(target.id)
+        known.add('driver')
+        for node in ast.walk(class_node):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == 'self'
+                    and node.func.attr not in known):
+                result.errors.append(f"Unknown method self.{node.func.attr}() at line {node.lineno}")
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+# logger name: level, the root logger has an empty name
+DEFAULT_LEVELS = {
+    '': 'INFO',
+    'app_modeler': 'DEBUG',
+    # prompts and responses are large, enable explicitly when needed
+    'app_modeler.ai': 'INFO',
+    'app_modeler.widgets.SettingsWidget': 'WARNING',
+    'httpx': 'WARNING',
+    'urllib3': 'WARNING',
+    'httpcore': 'WARNING',
+    'openai._base_client': 'WARNING',
+    'selenium.webdriver.remote.remote_connection': 'WARNING',
+}
+
+# attributes of every LogRecord, anything else was given with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line, fields given with extra={...} are included """
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        data.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class LogPipeline:
+    """
+    Log records are put to a queue by the emitting thread and formatted and written
+    by a listener thread, so slow handlers do not block the GUI or the workers.
+    """
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._queue_handler = QueueHandler(self._queue)
+        self._stream_handler = logging.StreamHandler()
+        self._stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self._json_handler: Optional[logging.FileHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._levels: dict[str, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None
+
+    def start(self, levels: Optional[dict[str, str]] = None, json_file: Optional[str] = None):
+        if self.running:
+            self.stop()
+        root = logging.getLogger()
+        root.addHandler(self._queue_handler)
+        self.set_levels(levels or {})
+        self._set_json_handler(json_file)
+        self._start_listener()
+
+    def stop(self):
+        """ Write the queued records and stop the listener thread """
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+        logging.getLogger().removeHandler(self._queue_handler)
+        self._set_json_handler(None)
+
+    def configure(self, levels: Optional[dict[str, str]] = None, json_file: Optional[str] = None):
+        """ Apply the user settings, levels override the defaults """
+        self.set_levels(levels or {})
+        current = self._json_handler.baseFilename if self._json_handler else None
+        wanted = os.path.abspath(json_file) if json_file else None
+        if wanted != current:
+            restart = self.running
+            if self._listener:
+                self._listener.stop()
+                self._listener = None
+            self._set_json_handler(wanted)
+            if restart:
+                self._start_listener()
+
+    def set_levels(self, levels: dict[str, str]):
+        # loggers configured earlier but not anymore fall back to their parents
+        for name in set(self._levels) - set(DEFAULT_LEVELS) - set(levels):
+            logging.getLogger(name or None).setLevel(logging.NOTSET)
+        self._levels = {**DEFAULT_LEVELS, **levels}
+        for name, level in self._levels.items():
+            try:
+                logging.getLogger(name or None).setLevel(level.strip().upper())
+            except (ValueError, TypeError) as error:
+                logger.warning(f"Invalid log level for '{name}': {error}")
+
+    def _set_json_handler(self, json_file: Optional[str]):
+        if self._json_handler:
+            self._json_handler.close()
+            self._json_handler = None
+        if json_file:
+            try:
+                self._json_handler = logging.FileHandler(json_file, encoding='utf-8')
+            except OSError as error:
+                logger.warning(f"Cannot open JSON log file {json_file}: {error}")
+                return
+            self._json_handler.setFormatter(JsonFormatter())
+
+    def _start_listener(self):
+        handlers = [self._stream_handler] + ([self._json_handler] if self._json_handler else [])
+        self._listener = QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+
+log_pipeline = LogPipeline()
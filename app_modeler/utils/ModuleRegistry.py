@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import sys
+import types
+from collections import OrderedDict
+from typing import Type
+
+from app_modeler.appium_helpers.AppiumInterface import AppiumInterface
+
+logger = logging.getLogger(__name__)
+
+
+def source_hash(source_code: str) -> str:
+    """ Get a stable content hash for the given source code """
+    return hashlib.sha1(source_code.encode('utf-8')).hexdigest()
+
+
+class ModuleRegistry:
+    """
+    Registry of dynamically loaded view modules.
+
+    Each class source is compiled and executed only once, keyed by its content hash, and registered
+    under a unique module name so that views never clobber each other in sys.modules.
+    Instantiated classes are reused as long as they are bound to the same driver.
+    Least recently used modules are evicted when the registry grows over max_modules.
+    """
+    MODULE_PREFIX = 'app_modeler_view'
+
+    def __init__(self, max_modules: int = 32):
+        self._max_modules = max_modules
+        self._modules: OrderedDict[str, types.ModuleType] = OrderedDict()
+        # keyed by (source hash, class name), the same source may define more than one view class
+        self._instances: dict[tuple[str, str], AppiumInterface] = {}
+
+    def __len__(self):
+        return len(self._modules)
+
+    def __contains__(self, source_code: str) -> bool:
+        return source_hash(source_code) in self._modules
+
+    def get_module(self, source_code: str, class_name: str) -> types.ModuleType:
+        """Get the module for the given source code, compiling it on first use.
+
+        Args:
+            source_code (str): The code of the module as a string.
+            class_name (str): The name of the main class in the module, used in the module name.
+
+        Returns:
+            types.ModuleType: The executed module.
+
+        Raises:
+            SyntaxError: If the module code contains syntax errors.
+            Exception: If an error occurs during module execution.
+        """
+        key = source_hash(source_code)
+        module = self._modules.get(key)
+        if module is not None:
+            self._modules.move_to_end(key)
+            return module
+
+        module_name = f'{self.MODULE_PREFIX}_{class_name}_{key[:12]}'
+        module = types.ModuleType(module_name)
+        module.__file__ = f'<{module_name}>'
+        try:
+            code = compile(source_code, module.__file__, 'exec')
+            exec(code, module.__dict__)
+        except Exception as e:
+            logger.error(f"Error executing module code: {e}")
+            raise
+
+        sys.modules[module_name] = module
+        self._modules[key] = module
+        logger.debug(f'Registered module: {module_name}')
+        self._evict_unused()
+        return module
+
+    def get_class(self, source_code: str, class_name: str) -> Type[AppiumInterface]:
+        """Get the view class from the given source code.
+
+        Raises:
+            AttributeError: If the class is not found in the module.
+            TypeError: If the class is not a subclass of AppiumInterface.
+        """
+        module = self.get_module(source_code, class_name)
+        try:
+            the_class: Type[AppiumInterface] = getattr(module, class_name)
+        except AttributeError as e:
+            logger.error(f"Class '{class_name}' not found in module code: {e}")
+            raise
+
+        if not isinstance(the_class, type) or not issubclass(the_class, AppiumInterface):
+            logger.error(f"Class '{class_name}' is not a subclass of AppiumInterface")
+            raise TypeError(f"Class '{class_name}' must inherit from AppiumInterface")
+        return the_class
+
+    def get_instance(self, source_code: str, class_name: str, driver) -> AppiumInterface:
+        """Get an instance of the view class bound to the given driver.
+
+        The instance is created only when there is none yet or the previous one
+        was created for another driver (e.g. after reconnecting).
+        """
+        key = source_hash(source_code)
+        instance = self._instances.get((key, class_name))
+        if instance is not None and instance.driver is driver:
+            self._modules.move_to_end(key)
+            return instance
+        the_class = self.get_class(source_code, class_name)
+        instance = the_class(driver)
+        self._instances[(key, class_name)] = instance
+        return instance
+
+    def clear_instances(self):
+        """ Drop instantiated views, e.g. when the driver is gone """
+        self._instances.clear()
+
+    def clear(self):
+        """ Remove all modules and instances """
+        for key in list(self._modules):
+            self._remove(key)
+
+    def _evict_unused(self):
+        while len(self._modules) > self._max_modules:
+            key = next(iter(self._modules))
+            self._remove(key)
+
+    def _remove(self, key: str):
+        module = self._modules.pop(key, None)
+        for instance_key in [instance_key for instance_key in self._instances if instance_key[0] == key]:
+            del self._instances[instance_key]
+        if module is not None:
+            sys.modules.pop(module.__name__, None)
+            logger.debug(f'Evicted module: {module.__name__}')
@@ -0,0 +1,79 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app_modeler.models.FunctionCall import FunctionCall
+from app_modeler.models.TransitionGraph import TransitionGraph
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Scenario:
+    """ Independent test scenario, navigation brings the app from the launch view to the first step """
+    steps: [FunctionCall] = field(default_factory=list)
+    navigation: [FunctionCall] = field(default_factory=list)
+
+    @property
+    def calls(self) -> [FunctionCall]:
+        return self.navigation + self.steps
+
+
+class ScenarioOptimizer:
+    """
+    Shortens recorded call histories for the exported tests.
+    """
+    def __init__(self, graph: TransitionGraph):
+        self._graph = graph
+
+    def is_navigation(self, call: FunctionCall) -> bool:
+        """ Call recorded in the graph as a reliable move to another view """
+        transition = self._graph.get_transition(call.view, call)
+        return (transition is not None and transition.target != call.view
+                and transition.failures == 0)
+
+    def has_side_effects(self, call: FunctionCall) -> bool:
+        """ Only known navigation calls without arguments are considered free of side effects,
+        anything else, e.g. save() or delete(), may change the app state
+        """
+        return bool(call.args or call.kwargs) or call.error is not None or not self.is_navigation(call)
+
+    def remove_navigation_loops(self, calls: [FunctionCall]) -> [FunctionCall]:
+        """ Remove call sequences which return to an already visited view through navigation calls only,
+        e.g. open_settings() -> back() when nothing was done in the settings view.
+        """
+        result = []
+        # view -> index of the first call made from the view since the last side effect
+        entered: dict[str, int] = {}
+        for call in calls:
+            index = entered.get(call.view)
+            # a loop closes only on a view change, consecutive calls of a view may change it unnoticed
+            returned = bool(result) and result[-1].view != call.view
+            if returned and index is not None:
+                logger.debug(f"Removing navigation loop: {[str(c) for c in result[index:]]}")
+                del result[index:]
+                entered = {view: i for view, i in entered.items() if i <= index}
+            entered.setdefault(call.view, len(result))
+            result.append(call)
+            if self.has_side_effects(call):
+                entered.clear()
+        return result
+
+    def split(self, calls: [FunctionCall], max_steps: Optional[int] = None) -> [Scenario]:
+        """ Split the history into independent scenarios of about max_steps calls.
+        A scenario can start only from a view which is reachable from the launch view,
+        the shortest known path is used to navigate there.
+        """
+        if not calls or not max_steps:
+            return [Scenario(steps=list(calls))]
+        launch_view = calls[0].view
+        scenarios = [Scenario()]
+        for call in calls:
+            current = scenarios[-1]
+            if len(current.steps) >= max_steps:
+                path = self._graph.shortest_path(launch_view, call.view)
+                if path is not None:
+                    current = Scenario(navigation=[transition.function_call for transition in path])
+                    scenarios.append(current)
+            current.steps.append(call)
+        return scenarios
@@ -0,0 +1,42 @@
+from collections import defaultdict
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class SpatialIndex(Generic[T]):
+    """
+    Uniform grid index of rectangles for point hit-testing.
+
+    Each rectangle is registered to the grid cells it overlaps, so a point query only
+    checks the rectangles of a single cell instead of every element of the view.
+    """
+    def __init__(self, cell_size: int = 64):
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[tuple[int, int, int, int, T]]] = defaultdict(list)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._cells.clear()
+        self._count = 0
+
+    def insert(self, item: T, x: float, y: float, width: float, height: float):
+        x, y, width, height = (int(round(value)) for value in (x, y, width, height))
+        if width <= 0 or height <= 0:
+            return
+        rect = (x, y, x + width, y + height, item)
+        for cell_x in range(x // self._cell_size, (x + width - 1) // self._cell_size + 1):
+            for cell_y in range(y // self._cell_size, (y + height - 1) // self._cell_size + 1):
+                self._cells[(cell_x, cell_y)].append(rect)
+        self._count += 1
+
+    def query(self, x: float, y: float) -> list[T]:
+        """ Items containing the point, the smallest (innermost) first """
+        cell = (int(x // self._cell_size), int(y // self._cell_size))
+        hits = [rect for rect in self._cells.get(cell, ())
+                if rect[0] <= x < rect[2] and rect[1] <= y < rect[3]]
+        hits.sort(key=lambda rect: (rect[2] - rect[0]) * (rect[3] - rect[1]))
+        return [rect[4] for rect in hits]
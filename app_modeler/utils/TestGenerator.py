@@ -1,18 +1,29 @@
+import json
 from pathlib import Path
+from typing import Optional
 import logging
 
 from app_modeler.models.FunctionCall import FunctionCall
 from app_modeler.models.StartOptions import StartOptions
-from app_modeler.models.TestSession import TestSession, ClassData
+from app_modeler.models.TestSession import TestSession
+from app_modeler.utils.ScenarioOptimizer import ScenarioOptimizer, Scenario
 
 
 logger = logging.getLogger(__name__)
 
 
 class TestGenerator:
-    def __init__(self, start_options: StartOptions, session: TestSession):
+    def __init__(self, start_options: StartOptions, session: TestSession, max_steps_per_test: Optional[int] = None,
+                 remove_navigation_loops: bool = False):
+        """
+        :param max_steps_per_test: split the history to independent tests of about this many steps, None for one test.
+        :param remove_navigation_loops: drop recorded detours which only navigate away and back.
+        """
         self._start_options = start_options
         self._session = session
+        self._max_steps_per_test = max_steps_per_test
+        self._remove_navigation_loops = remove_navigation_loops
+        self._optimizer = ScenarioOptimizer(session.graph)
 
     def generate(self, output_path: str):
         generated_files = []
@@ -29,11 +40,15 @@ class TestGenerator:
         init_file = Path(output_path) / "__init__.py"
         init_file.touch()
 
-        class_list = self._session.classes
-        history_list = self._session.call_history
-        for call in history_list:
-            class_name = call.view
-            the_class: ClassData = next((c for c in class_list if c.name == class_name), None)
+        calls = list(self._session.call_history)
+        if self._remove_navigation_loops:
+            calls = self._optimizer.remove_navigation_loops(calls)
+        scenarios = self._optimizer.split(calls, self._max_steps_per_test)
+
+        # write each used view once
+        view_names = dict.fromkeys(call.view for scenario in scenarios for call in scenario.calls)
+        for class_name in view_names:
+            the_class = self._session.get_class(class_name)
             if the_class is None:
                 logger.warning(f"Class {class_name} not found")
                 continue
@@ -48,26 +63,38 @@ class TestGenerator:
                 file.write(the_class.screenshot)
             generated_files.append(str(screenshot_filename))
 
-        pytest_script = self.generate_pytest_case(history_list)
+        pytest_script = self.generate_pytest_case(scenarios)
         pytest_filename = Path(output_path) / "test_sample.py"
         pytest_filename.write_text(pytest_script)
         generated_files.append(str(pytest_filename))
-        return generated_files
 
-    def generate_pytest_case(self, calls: list[FunctionCall]):
+        conftest_filename = Path(output_path) / "conftest.py"
+        conftest_filename.write_text(self.generate_conftest())
+        generated_files.append(str(conftest_filename))
 
-        view_names = set()
-        for call in calls:
-            view_names.add(call.view)
+        devices_filename = Path(output_path) / "devices.json"
+        devices_filename.write_text(self.generate_devices_config())
+        generated_files.append(str(devices_filename))
+        return generated_files
+
+    def generate_pytest_case(self, scenarios: list[Scenario]):
+        view_names = dict.fromkeys(call.view for scenario in scenarios for call in scenario.calls)
         view_imports = "\n".join([f"from .{view} import {view}" for view in view_names])
 
-        calls_code = ""
-        for index, call in enumerate(calls):
-            calls_code += f"{' '*4}# Step #{index}\n"
-            calls_code += f"{' '*4}view = {call.view}(appium_driver)\n"
-            calls_code += f"{' '*4}view.{call}\n"
-            calls_code += "\n"
+        if len(scenarios) == 1:
+            tests_code = self.generate_test_function("test_sample", scenarios[0])
+        else:
+            tests_code = "\n\n\n".join(self.generate_test_function(f"test_scenario_{index}", scenario)
+                                      for index, scenario in enumerate(scenarios, start=1))
+
+        template_file = Path(__file__).parent / "pytest_template.tmpl"
+        template = template_file.read_text()
+        pytest_test_template = template.format(view_imports=view_imports,
+                                               tests_code=tests_code)
+        return pytest_test_template
 
+    def generate_conftest(self) -> str:
+        """ Generate conftest.py with the device pool and application reset fixtures """
         driver_imports = {
             "Mac2Options": "from appium.options.mac import Mac2Options",
             "UiAutomator2Options": "from appium.options.android import UiAutomator2Options",
@@ -78,14 +105,52 @@ class TestGenerator:
         }
         driver_import = driver_imports.get(self._start_options.appium_options.__class__.__name__, "")
 
-        template_file = Path(__file__).parent / "pytest_template.tmpl"
+        template_file = Path(__file__).parent / "conftest_template.tmpl"
         template = template_file.read_text()
-        print(template)
-        pytest_test_template = template.format(driver_import=driver_import,
-                                               appium_class=self._start_options.appium_options.__class__.__name__,
-                                               capabilities=self._start_options.appium_options.to_capabilities(),
-                                               appium_url=self._start_options.appium_server_url,
-                                               view_imports=view_imports,
-                                               calls_code=calls_code)
-        return pytest_test_template
+        return template.format(driver_import=driver_import,
+                               appium_class=self._start_options.appium_options.__class__.__name__)
+
+    def generate_devices_config(self) -> str:
+        """ Generate devices.json with the recorded device, more devices can be added for parallel runs """
+        config = {
+            "capabilities": self._start_options.appium_options.to_capabilities(),
+            "devices": [
+                {
+                    "appium_url": self._start_options.appium_server_url,
+                    "capabilities": {}
+                }
+            ]
+        }
+        return json.dumps(config, indent=4, default=str)
+
+    def generate_test_function(self, test_name: str, scenario: Scenario) -> str:
+        """ Generate a test function, each view is instantiated once per test """
+        calls_code = ""
+        instances = set()
+
+        def call_code(call: FunctionCall) -> str:
+            code = ""
+            variable = call.view.lower()
+            if variable not in instances:
+                instances.add(variable)
+                code += f"{' '*4}{variable} = {call.view}(appium_driver)\n"
+            code += f"{' '*4}{variable}.{call}\n"
+            return code
+
+        if scenario.navigation:
+            calls_code += f"{' '*4}# Navigate to {scenario.steps[0].view}\n"
+            for call in scenario.navigation:
+                calls_code += call_code(call)
+            calls_code += "\n"
+
+        for index, call in enumerate(scenario.steps):
+            the_class = self._session.get_class(call.view)
+            method = the_class.api.get_method(call.function_name) if the_class else None
+            if method is None:
+                logger.warning(f"Method {call.view}.{call.function_name} not found")
+            calls_code += f"{' '*4}# Step #{index}: {method.signature if method else call.function_name}\n"
+            calls_code += call_code(call)
+            calls_code += "\n"
+        calls_code = calls_code.rstrip() or f"{' '*4}pass"
+        return f"def {test_name}(appium_driver):\n{calls_code}\n"
 
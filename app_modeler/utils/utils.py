@@ -1,19 +1,28 @@
 import inspect
-import types
+import json
 from pathlib import Path
 from importlib import import_module
 import logging
 import ast
-from typing import Type
+from collections import OrderedDict
+from typing import Type, Optional
 import sys
 
 from PySide6.QtGui import QIcon, QPixmap
 from urllib3.exceptions import MaxRetryError
 
 from app_modeler.appium_helpers.AppiumInterface import AppiumInterface
+from app_modeler.models.ClassApi import ClassApi, MethodApi, ParameterApi, LocatorApi
+from app_modeler.utils.ModuleRegistry import ModuleRegistry, source_hash
 
 logger = logging.getLogger(__name__)
 
+# shared registry of dynamically loaded view modules
+module_registry = ModuleRegistry()
+
+_CLASS_API_CACHE_SIZE = 128
+_class_api_cache: OrderedDict[tuple[str, str], ClassApi] = OrderedDict()
+
 
 def load_module_file(module_file: Path, *args) -> AppiumInterface:
     """Load a view module from a file and instantiate its main class.
@@ -55,6 +64,9 @@ def load_module_file(module_file: Path, *args) -> AppiumInterface:
 def load_module_from_code(module_code: str, class_name: str, *args, **kwargs) -> AppiumInterface:
     """Load a module from a code string and instantiate a class from it.
 
+    The module is compiled only once per unique code string and kept in the
+    shared module registry under a unique module name.
+
     Args:
         module_code (str): The code of the module as a string.
         class_name (str): The name of the class to instantiate from the module.
@@ -70,34 +82,7 @@ def load_module_from_code(module_code: str, class_name: str, *args, **kwargs) ->
         TypeError: If the class is not a subclass of AppiumInterface.
         Exception: If an error occurs during module execution.
     """
-    # Create a unique module name
-    module_name = 'dynamic_module'
-
-    # Create a new module object
-    module = types.ModuleType(module_name)
-    module.__file__ = '<string>'
-
-    # Execute the module code in the module's namespace
-    try:
-        exec(module_code, module.__dict__)
-    except Exception as e:
-        logger.error(f"Error executing module code: {e}")
-        raise
-
-    # Add the module to sys.modules
-    sys.modules[module_name] = module
-
-    # Get the class from the module
-    try:
-        the_class: Type[AppiumInterface] = getattr(module, class_name)
-    except AttributeError as e:
-        logger.error(f"Class '{class_name}' not found in module code: {e}")
-        raise
-
-    # Check if the class is a subclass of AppiumInterface
-    if not issubclass(the_class, AppiumInterface):
-        logger.error(f"Class '{class_name}' is not a subclass of AppiumInterface")
-        raise TypeError(f"Class '{class_name}' must inherit from AppiumInterface")
+    the_class = module_registry.get_class(module_code, class_name)
 
     # Instantiate the class
     instance = the_class(*args, **kwargs)
@@ -130,12 +115,40 @@ def generate_class_json_from_code(source_code: str, class_name: str) -> dict:
         class_name (str): The name of the class to analyze.
 
     Returns:
-        dict: A JSON-like dictionary representing the class and its methods.
+        dict: A compact JSON-like dictionary representing the class and its method signatures.
 
     Raises:
         ValueError: If the class is not found in the source code.
     """
+    return get_class_api(source_code, class_name).to_prompt_dict()
 
+def get_class_api(source_code: str, class_name: str) -> ClassApi:
+    """ Get the API of a class from Python source code.
+    The source is parsed only once, results are cached by source hash.
+
+    Args:
+        source_code (str): The source code of the class.
+        class_name (str): The name of the class to analyze.
+
+    Returns:
+        ClassApi: public methods with parameter annotations, defaults and used locators.
+
+    Raises:
+        ValueError: If the class is not found in the source code.
+    """
+    key = (source_hash(source_code), class_name)
+    class_api = _class_api_cache.get(key)
+    if class_api is not None:
+        _class_api_cache.move_to_end(key)
+        return class_api
+
+    class_api = _parse_class_api(source_code, class_name)
+    _class_api_cache[key] = class_api
+    if len(_class_api_cache) > _CLASS_API_CACHE_SIZE:
+        _class_api_cache.popitem(last=False)
+    return class_api
+
+def _parse_class_api(source_code: str, class_name: str) -> ClassApi:
     # Parse the source code into an AST
     tree = ast.parse(source_code)
 
@@ -149,33 +162,68 @@ def generate_class_json_from_code(source_code: str, class_name: str) -> dict:
     if not class_node:
         raise ValueError(f"Class '{class_name}' not given.")
 
-    # Extract methods from the class
+    # Locators stored as class or instance attributes, e.g. self.start_button = (AppiumBy.ID, '...')
+    attribute_locators = {}
+    for node in ast.walk(class_node):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and _locator_from_node(node.value):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                name = target.attr if isinstance(target, ast.Attribute) else getattr(target, 'id', None)
+                if name:
+                    attribute_locators[name] = _locator_from_node(node.value)
+
+    # Extract public methods from the class
     methods = []
     for item in class_node.body:
-        if isinstance(item, ast.FunctionDef):  # Look for method definitions
-            method_name = item.name
-
-            # Get parameters
-            params = []
-            for arg in item.args.args:
-                if arg.arg != "self":  # Skip 'self'
-                    params.append(arg.arg)
-
-            # Add method info
-            methods.append({
-                "name": method_name,
-                # "description": ast.get_docstring(item) or "No description provided.",
-                "parameters": params,
-                "returns": None  # AST doesn't provide type hints easily
-            })
-
-    # Build the class JSON representation
-    class_api = {
-        "class": class_name,
-        "methods": methods
-    }
+        if not isinstance(item, ast.FunctionDef) or item.name.startswith('_'):
+            continue
+
+        # Get parameters, defaults are aligned to the last positional parameters
+        args = [arg for arg in item.args.args if arg.arg != "self"]
+        defaults = [None] * (len(args) - len(item.args.defaults)) + list(item.args.defaults)
+        params = [ParameterApi(name=arg.arg,
+                               annotation=ast.unparse(arg.annotation) if arg.annotation else None,
+                               default=ast.unparse(default) if default is not None else None)
+                  for arg, default in zip(args, defaults)]
+
+        locators = []
+        for node in ast.walk(item):
+            locator = _locator_from_node(node)
+            if locator is None and isinstance(node, ast.Attribute):
+                locator = attribute_locators.get(node.attr)
+            if locator and locator not in locators:
+                locators.append(locator)
+
+        methods.append(MethodApi(name=item.name,
+                                 parameters=tuple(params),
+                                 returns=ast.unparse(item.returns) if item.returns else None,
+                                 locators=tuple(locators)))
+
+    return ClassApi(name=class_name, methods=tuple(methods))
+
+def _locator_from_node(node: ast.AST) -> Optional[LocatorApi]:
+    """ Get locator from (AppiumBy.<strategy>, '<value>') tuple node """
+    if not (isinstance(node, ast.Tuple) and len(node.elts) == 2):
+        return None
+    strategy, value = node.elts
+    if not (isinstance(strategy, ast.Attribute) and isinstance(strategy.value, ast.Name)
+            and strategy.value.id == 'AppiumBy'):
+        return None
+    if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+        return None
+    return LocatorApi(strategy=strategy.attr, value=value.value)
+
+def view_fingerprint(elements: list) -> str:
+    """Stable fingerprint of a view, views with the same elements share the fingerprint.
 
-    return class_api
+    Args:
+        elements (list): ElementData list of the view.
+
+    Returns:
+        str: The fingerprint hex digest.
+    """
+    data = json.dumps([element.asdict_custom() for element in elements], sort_keys=True, default=str)
+    return source_hash(data)
 
 def get_instance_methods(obj: object) -> [str]:
     cls = obj.__class__
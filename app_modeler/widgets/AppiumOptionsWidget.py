@@ -1,11 +1,8 @@
+from importlib import import_module
 from typing import Optional
 
 from PySide6.QtCore import QSettings
-from PySide6.QtWidgets import QComboBox, QVBoxLayout, QLabel, QLineEdit, QGroupBox
-from appium.options.mac import Mac2Options
-from appium.options.android import UiAutomator2Options, EspressoOptions
-from appium.options.ios import XCUITestOptions, SafariOptions
-from appium.options.windows import WindowsOptions
+from PySide6.QtWidgets import QComboBox, QVBoxLayout, QLabel, QLineEdit, QGroupBox, QStackedWidget, QWidget
 
 from app_modeler.widgets.FormGenerator import FormGenerator
 from app_modeler.widgets.SettingsWidget import SettingsWidget
@@ -13,20 +10,24 @@ from app_modeler.widgets.utils.QUrlValidator import QUrlValidator
 
 
 class AppiumOptionsWidget(SettingsWidget):
+    # option classes are imported when selected, appium options pull in large parts of selenium
+    APPIUM_OPTIONS = {
+        "Mac2Options": ("appium.options.mac", "Mac2Options"),
+        "AndroidOptions": ("appium.options.android", "UiAutomator2Options"),
+        "EspressoOptions": ("appium.options.android", "EspressoOptions"),
+        "IOSOptions": ("appium.options.ios", "XCUITestOptions"),
+        "SafariOptions": ("appium.options.ios", "SafariOptions"),
+        "WindowsOptions": ("appium.options.windows", "WindowsOptions"),
+    }
 
     def __init__(self, settings: QSettings):
         super().__init__()
         self._options = None
         self.settings = settings
         self.form_generator: Optional[FormGenerator] = None
-        self._appium_options = {
-            "Mac2Options": Mac2Options,
-            "AndroidOptions": UiAutomator2Options,
-            "EspressoOptions": EspressoOptions,
-            "IOSOptions": XCUITestOptions,
-            "SafariOptions": SafariOptions,
-            "WindowsOptions": WindowsOptions
-        }
+        # forms and option instances are created once per driver, switching driver swaps them
+        self._forms: dict[str, FormGenerator] = {}
+        self._driver_options: dict[str, object] = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -47,7 +48,7 @@ class AppiumOptionsWidget(SettingsWidget):
 
         self.driver_combo = QComboBox()
         self.driver_combo.setObjectName('appium_driver_selector')
-        self.driver_combo.addItems(self._appium_options.keys())
+        self.driver_combo.addItems(self.APPIUM_OPTIONS.keys())
         self.driver_combo.currentTextChanged.connect(self.on_option_changed)
         self.appium_group_box_layout.addWidget(self.driver_combo)
         layout.addWidget(self.appium_group_box)
@@ -55,6 +56,8 @@ class AppiumOptionsWidget(SettingsWidget):
         self.appium_options_box = QGroupBox("Appium Options")
         self.appium_options_layout = QVBoxLayout()
         self.appium_options_box.setLayout(self.appium_options_layout)
+        self.options_stack = QStackedWidget()
+        self.appium_options_layout.addWidget(self.options_stack)
         layout.addWidget(self.appium_options_box)
 
         self.setLayout(layout)
@@ -82,26 +85,46 @@ class AppiumOptionsWidget(SettingsWidget):
         self.driver_combo.setCurrentText(data['driver'])
         self.update_options(data['driver'], data['capabilities'])
 
+    @classmethod
+    def options_class(cls, driver: str) -> type:
+        module_name, class_name = cls.APPIUM_OPTIONS[driver]
+        return getattr(import_module(module_name), class_name)
+
     def on_option_changed(self, text):
         self.update_options(driver=text)
 
-    def update_options(self, driver: str, capabilities: Optional[dict] = None):
-        if self.form_generator:
-            self.appium_options_layout.removeWidget(self.form_generator)
-            self.form_generator.setVisible(False)
-            self.form_generator.deleteLater()
-            self.form_generator = None
-        self._options = self._appium_options[driver]()
+    def create_options(self, driver: str, capabilities: Optional[dict] = None):
+        options = self.options_class(driver)()
         if driver == 'Mac2Options':
-            self._options.platform_name = 'mac'
-            self._options.automation_name = 'mac2'
+            options.platform_name = 'mac'
+            options.automation_name = 'mac2'
         elif driver == 'AndroidOptions':
-            self._options.platform_name = 'android'
-            self._options.automation_name = 'uiautomator2'
+            options.platform_name = 'android'
+            options.automation_name = 'uiautomator2'
         if capabilities:
-            self._options.load_capabilities(capabilities)
-        self.form_generator = FormGenerator(self._options, self)
-        self.appium_options_layout.addWidget(self.form_generator)
+            options.load_capabilities(capabilities)
+        return options
+
+    def update_options(self, driver: str, capabilities: Optional[dict] = None):
+        if capabilities or driver not in self._driver_options:
+            self._driver_options[driver] = self.create_options(driver, capabilities)
+        self._options = self._driver_options[driver]
+        form = self._forms.get(driver)
+        if form is None:
+            form = FormGenerator(self._options, self)
+            self._forms[driver] = form
+            self.options_stack.addWidget(form)
+        elif form.instance is not self._options:
+            form.set_instance(self._options)
+        self.form_generator = form
+        self.options_stack.setCurrentWidget(form)
+        self.refresh_settings_widgets()
+
+    def _find_settings_widgets(self) -> list[QWidget]:
+        # only the form of the selected driver is persisted, forms share the field names
+        hidden_forms = [form for form in self._forms.values() if form is not self.form_generator]
+        return [widget for widget in super()._find_settings_widgets()
+                if not any(form.isAncestorOf(widget) for form in hidden_forms)]
 
     @property
     def options(self):
@@ -1,18 +1,114 @@
+from typing import Optional
+
 from PySide6 import QtGui
 from PySide6.QtWidgets import QPlainTextEdit
 from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QFontDatabase
 from PySide6.QtCore import Qt, QRegularExpression
 
-class PythonSyntaxHighlighter(QSyntaxHighlighter):
+
+class TokenHighlighter(QSyntaxHighlighter):
+    """
+    Single pass highlighter. All token patterns are combined to one alternation with named groups,
+    so each block is scanned once. The first alternative matching at a position wins,
+    e.g. a keyword inside a string is highlighted as a string.
+
+    Large documents are highlighted lazily: blocks outside of the visible range are skipped
+    and highlighted by highlight_range when they are scrolled into view.
+    """
+    # documents with more blocks are highlighted lazily, None always highlights the whole document
+    LAZY_BLOCK_THRESHOLD: Optional[int] = 500
+
     def __init__(self, document):
         super().__init__(document)
+        self.formats: dict[str, QTextCharFormat] = {}
         self._initialize_formats()
-        self._setup_rules()
+        tokens = self._tokens()
+        self._token_names = [name for name, _ in tokens]
+        self._expression = (QRegularExpression("|".join(f"(?<{name}>{pattern})" for name, pattern in tokens))
+                            if tokens else None)
+        self._visible_range: Optional[tuple[int, int]] = None
+        self._pending: set[int] = set()
 
     def _initialize_formats(self):
-        # Initialize formats for different syntax elements
-        self.formats = {}
+        """ Fill self.formats, keys are the token names. Tokens without a format are not highlighted """
+
+    def _tokens(self) -> list[tuple[str, str]]:
+        """ (token name, regular expression) list in priority order, no tokens highlights nothing """
+        return []
+
+    def set_visible_range(self, first: int, last: int):
+        self._visible_range = (first, last)
+
+    def reset_pending(self):
+        self._pending.clear()
+
+    def highlight_range(self, first: int, last: int):
+        """ Highlight the skipped blocks of the range """
+        self.set_visible_range(first, last)
+        pending = sorted(number for number in self._pending if first <= number <= last)
+        for number in pending:
+            self._pending.discard(number)
+            block = self.document().findBlockByNumber(number)
+            if block.isValid():
+                self.rehighlightBlock(block)
+
+    def _is_deferred(self) -> bool:
+        if (self.LAZY_BLOCK_THRESHOLD is None or self._visible_range is None
+                or self.document().blockCount() <= self.LAZY_BLOCK_THRESHOLD):
+            return False
+        number = self.currentBlock().blockNumber()
+        first, last = self._visible_range
+        if first <= number <= last:
+            return False
+        self._pending.add(number)
+        return True
+
+    def highlightBlock(self, text):
+        if self._is_deferred():
+            # keep the multiline state of the previous block for the following blocks
+            self.setCurrentBlockState(self.previousBlockState())
+            return
+        iterator = self._expression.globalMatch(text) if self._expression else None
+        while iterator is not None and iterator.hasNext():
+            match = iterator.next()
+            name = next(name for name in self._token_names if match.capturedStart(name) >= 0)
+            fmt = self.formats.get(name)
+            if fmt is not None:
+                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+        self.highlight_multiline(text)
+
+    def highlight_multiline(self, text):
+        """ Hook for tokens spanning multiple blocks """
 
+
+class PythonSyntaxHighlighter(TokenHighlighter):
+    KEYWORDS = [
+        'and', 'as', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def',
+        'del', 'elif', 'else', 'except', 'False', 'finally', 'for', 'from', 'global',
+        'if', 'import', 'in', 'is', 'lambda', 'None', 'nonlocal', 'not', 'or', 'pass',
+        'raise', 'return', 'True', 'try', 'while', 'with', 'yield'
+    ]
+    BUILTINS = [
+        'abs', 'dict', 'help', 'min', 'setattr', 'all', 'dir', 'hex', 'next', 'slice',
+        'any', 'divmod', 'id', 'object', 'sorted', 'ascii', 'enumerate', 'input', 'oct', 'staticmethod',
+        'bin', 'eval', 'int', 'open', 'str', 'bool', 'exec', 'isinstance', 'ord', 'sum',
+        'bytearray', 'filter', 'issubclass', 'pow', 'super', 'bytes', 'float', 'iter', 'print', 'tuple',
+        'callable', 'format', 'len', 'property', 'type', 'chr', 'frozenset', 'list', 'range', 'vars',
+        'classmethod', 'getattr', 'locals', 'repr', 'zip', 'compile', 'globals', 'map', 'reversed', '__import__',
+        'complex', 'hasattr', 'max', 'round', 'delattr', 'hash', 'memoryview', 'set',
+        'Ellipsis', 'NotImplemented', '__debug__'
+    ]
+
+    # block states, the string delimiter still open at the end of the block
+    STATE_NONE, STATE_SINGLE_QUOTES, STATE_DOUBLE_QUOTES = 0, 1, 2
+
+    def __init__(self, document):
+        super().__init__(document)
+        self._triple_quote = QRegularExpression("'''|\"\"\"")
+        self._delimiters = {self.STATE_SINGLE_QUOTES: QRegularExpression("'''"),
+                            self.STATE_DOUBLE_QUOTES: QRegularExpression('"""')}
+
+    def _initialize_formats(self):
         # Keywords
         keyword_format = QTextCharFormat()
         keyword_format.setForeground(QColor("#800080"))  # dark purrple
@@ -50,115 +146,124 @@ class PythonSyntaxHighlighter(QSyntaxHighlighter):
         brace_format.setForeground(QColor("#FFFFFF"))  # White
         self.formats['brace'] = brace_format
 
-    def _setup_rules(self):
-        # Regular expressions for syntax elements
-        self.rules = []
-
-        # Keywords
-        keywords = [
-            'and', 'as', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def',
-            'del', 'elif', 'else', 'except', 'False', 'finally', 'for', 'from', 'global',
-            'if', 'import', 'in', 'is', 'lambda', 'None', 'nonlocal', 'not', 'or', 'pass',
-            'raise', 'return', 'True', 'try', 'while', 'with', 'yield'
+    def _tokens(self) -> list[tuple[str, str]]:
+        return [
+            # triple quotes are handled by highlight_multiline
+            ('triple_quote', r"'''|\"\"\""),
+            ('comment', r'#.*'),
+            ('string', r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''),
+            ('keyword', r'\b(?:{})\b'.format('|'.join(self.KEYWORDS))),
+            ('builtin', r'\b(?:{})\b'.format('|'.join(self.BUILTINS))),
+            ('number', r'\b[+-]?(?:0[xX][0-9A-Fa-f]+|[0-9]+\.[0-9]*(?:[eE][+-]?[0-9]+)?|[0-9]+)[lL]?\b'),
+            ('operator', r'\*\*=?|//=?|>>=?|<<=?|[=!<>]=|[-+*/%^&|]=|[=<>+\-*/%^|&~]'),
+            ('brace', r'[{}()\[\]]'),
         ]
-        keyword_patterns = [r'\b{}\b'.format(word) for word in keywords]
-        for pattern in keyword_patterns:
-            self.rules.append((QRegularExpression(pattern), self.formats['keyword']))
-
-        # Built-in functions and constants
-        builtins = [
-            'abs', 'dict', 'help', 'min', 'setattr', 'all', 'dir', 'hex', 'next', 'slice',
-            'any', 'divmod', 'id', 'object', 'sorted', 'ascii', 'enumerate', 'input', 'oct', 'staticmethod',
-            'bin', 'eval', 'int', 'open', 'str', 'bool', 'exec', 'isinstance', 'ord', 'sum',
-            'bytearray', 'filter', 'issubclass', 'pow', 'super', 'bytes', 'float', 'iter', 'print', 'tuple',
-            'callable', 'format', 'len', 'property', 'type', 'chr', 'frozenset', 'list', 'range', 'vars',
-            'classmethod', 'getattr', 'locals', 'repr', 'zip', 'compile', 'globals', 'map', 'reversed', '__import__',
-            'complex', 'hasattr', 'max', 'round', 'delattr', 'hash', 'memoryview', 'set', 'setattr',
-            'Ellipsis', 'NotImplemented', '__debug__'
-        ]
-        builtin_patterns = [r'\b{}\b'.format(word) for word in builtins]
-        for pattern in builtin_patterns:
-            self.rules.append((QRegularExpression(pattern), self.formats['builtin']))
 
-        # Comments
-        self.rules.append((QRegularExpression(r'#.*'), self.formats['comment']))
+    def highlight_multiline(self, text):
+        """ Triple quoted strings, the open delimiter is carried to the next block as the block state """
+        fmt = self.formats['string']
+        state = max(self.previousBlockState(), self.STATE_NONE)
+        start = 0
+        position = 0
+        while True:
+            if state == self.STATE_NONE:
+                match = self._triple_quote.match(text, position)
+                if not match.hasMatch():
+                    self.setCurrentBlockState(self.STATE_NONE)
+                    return
+                state = self.STATE_SINGLE_QUOTES if match.captured() == "'''" else self.STATE_DOUBLE_QUOTES
+                start = match.capturedStart()
+                position = match.capturedEnd()
+            match = self._delimiters[state].match(text, position)
+            if not match.hasMatch():
+                self.setFormat(start, len(text) - start, fmt)
+                self.setCurrentBlockState(state)
+                return
+            self.setFormat(start, match.capturedEnd() - start, fmt)
+            position = match.capturedEnd()
+            state = self.STATE_NONE
 
-        # Strings (single and double quotes)
-        self.rules.append((QRegularExpression(r'"[^"\\]*(\\.[^"\\]*)*"'), self.formats['string']))
-        self.rules.append((QRegularExpression(r"'[^'\\]*(\\.[^'\\]*)*'"), self.formats['string']))
 
-        # Numbers
-        self.rules.append((QRegularExpression(r'\b[+-]?[0-9]+[lL]?\b'), self.formats['number']))
-        self.rules.append((QRegularExpression(r'\b[+-]?0[xX][0-9A-Fa-f]+[lL]?\b'), self.formats['number']))
-        self.rules.append((QRegularExpression(r'\b[+-]?[0-9]+\.[0-9]*([eE][+-]?[0-9]+)?\b'), self.formats['number']))
+class JsonSyntaxHighlighter(TokenHighlighter):
+    # only the small element details are shown as JSON
+    LAZY_BLOCK_THRESHOLD = None
 
-        # Operators
-        operators = [
-            '=', '==', '!=', '<', '<=', '>', '>=',
-            r'\+', '-', r'\*', '/', '//', '%', r'\*\*',
-            r'\+=', '-=', r'\*=', '/=', '%=', '^=', '&=', r'\|=', '>>=', '<<=',
-            '\^', r'\\|', '&', '~', '>>', '<<'
-        ]
-        operator_patterns = [r'{}'.format(op) for op in operators]
-        for pattern in operator_patterns:
-            self.rules.append((QRegularExpression(pattern), self.formats['operator']))
+    def _initialize_formats(self):
+        key_format = QTextCharFormat()
+        key_format.setForeground(QColor("#000080"))  # Navy
+        self.formats['key'] = key_format
 
-        # Braces
-        braces = [r'\{', r'\}', r'\(', r'\)', r'\[', r'\]']
-        for brace in braces:
-            self.rules.append((QRegularExpression(brace), self.formats['brace']))
+        string_format = QTextCharFormat()
+        string_format.setForeground(QColor("#800000"))  # Maroon
+        self.formats['string'] = string_format
+
+        number_format = QTextCharFormat()
+        number_format.setForeground(QColor("#FF00FF"))  # Magenta
+        self.formats['number'] = number_format
+
+        literal_format = QTextCharFormat()
+        literal_format.setForeground(QColor("#800080"))  # dark purple
+        literal_format.setFontWeight(QFont.Bold)
+        self.formats['literal'] = literal_format
+
+    def _tokens(self) -> list[tuple[str, str]]:
+        return [
+            ('key', r'"[^"\\]*(?:\\.[^"\\]*)*"(?=\s*:)'),
+            ('string', r'"[^"\\]*(?:\\.[^"\\]*)*"'),
+            ('number', r'-?\b[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\b'),
+            ('literal', r'\b(?:true|false|null)\b'),
+        ]
 
-    def highlightBlock(self, text):
-        for pattern, fmt in self.rules:
-            expression = pattern.globalMatch(text)
-            while expression.hasNext():
-                match = expression.next()
-                start = match.capturedStart()
-                length = match.capturedLength()
-                self.setFormat(start, length, fmt)
-
-        self.setCurrentBlockState(0)
-
-        # Multiline strings (''' or """)
-        in_multiline = self.match_multiline(text, r"'''", self.formats['string'])
-        if not in_multiline:
-            self.match_multiline(text, r'"""', self.formats['string'])
-
-    def match_multiline(self, text, delimiter, fmt):
-        start_delim = QRegularExpression(delimiter)
-        end_delim = QRegularExpression(delimiter)
-        if self.previousBlockState() == 1:
-            start = 0
-            add = 0
-        else:
-            match = start_delim.match(text)
-            start = match.capturedStart()
-            add = match.capturedLength()
-
-        while start >= 0:
-            match = end_delim.match(text, start + add)
-            if match.hasMatch():
-                end = match.capturedEnd()
-                length = end - start
-                self.setFormat(start, length, fmt)
-                start = start_delim.match(text, end).capturedStart()
-            else:
-                self.setCurrentBlockState(1)
-                length = len(text) - start
-                self.setFormat(start, length, fmt)
-                return True
-        return False
 
 class CodeWidget(QPlainTextEdit):
-    def __init__(self, parent=None):
+    HIGHLIGHTERS = {
+        'python': PythonSyntaxHighlighter,
+        'json': JsonSyntaxHighlighter,
+    }
+    # blocks highlighted around the visible ones
+    HIGHLIGHT_MARGIN = 50
+
+    def __init__(self, parent=None, language: str = 'python'):
         super().__init__(parent)
         self.setReadOnly(True)
         self.setLineWrapMode(QPlainTextEdit.NoWrap)
         font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
         font.setPointSize(10)
         self.setFont(font)
-        self.highlighter = PythonSyntaxHighlighter(self.document())
+        self.highlighter = self.HIGHLIGHTERS[language](self.document())
         self.setWordWrapMode(QtGui.QTextOption.WrapMode.NoWrap)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setTabStopDistance(4 * self.fontMetrics().horizontalAdvance(' '))
+        self.verticalScrollBar().valueChanged.connect(self._highlight_visible)
+
+    def _visible_range(self, first: Optional[int] = None) -> tuple[int, int]:
+        if first is None:
+            first = self.firstVisibleBlock().blockNumber()
+        lines = self.viewport().height() // max(self.fontMetrics().lineSpacing(), 1) + 1
+        return max(first - self.HIGHLIGHT_MARGIN, 0), first + lines + self.HIGHLIGHT_MARGIN
+
+    def _highlight_visible(self):
+        self.highlighter.highlight_range(*self._visible_range())
+
+    def setPlainText(self, text: str):
+        self.highlighter.reset_pending()
+        # new text is shown from the top
+        self.highlighter.set_visible_range(*self._visible_range(first=0))
+        super().setPlainText(text)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._highlight_visible()
+
+    def select_text(self, text: str) -> bool:
+        """ Select the first occurrence of the (multiline) text and scroll to it """
+        position = self.toPlainText().find(text)
+        if position < 0:
+            return False
+        cursor = self.textCursor()
+        cursor.setPosition(position)
+        cursor.setPosition(position + len(text), QtGui.QTextCursor.MoveMode.KeepAnchor)
+        self.setTextCursor(cursor)
+        self.ensureCursorVisible()
+        return True
@@ -0,0 +1,129 @@
+import json
+import logging
+from typing import List
+
+from PySide6.QtCore import Qt, QModelIndex
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QLineEdit, QTableView, \
+    QHeaderView, QSplitter
+
+from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
+from app_modeler.models.ElementsModel import ElementsModel, ElementsFilterProxyModel
+from app_modeler.widgets.CodeWidget import CodeWidget
+
+logger = logging.getLogger(__name__)
+
+
+class ElementsWidget(QWidget):
+    """ Sortable and filterable table of the view elements, JSON of the selected element below """
+    ALL_TYPES = "All types"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = ElementsModel(self)
+        self.proxy = ElementsFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(ElementsModel.SORT_ROLE)
+        self._setup_ui()
+        self._connect_signals()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        filter_layout = QHBoxLayout()
+        self.type_combo = QComboBox()
+        self.type_combo.addItem(self.ALL_TYPES)
+        self.clickable_checkbox = QCheckBox("Clickable")
+        self.resource_id_edit = QLineEdit()
+        self.resource_id_edit.setPlaceholderText("Resource id")
+        self.resource_id_edit.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.type_combo)
+        filter_layout.addWidget(self.clickable_checkbox)
+        filter_layout.addWidget(self.resource_id_edit, stretch=1)
+        layout.addLayout(filter_layout)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)  # keep the discovery order until sorted
+        self.view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+
+        self.element_json = CodeWidget(language='json')
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.view)
+        splitter.addWidget(self.element_json)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
+
+    def _connect_signals(self):
+        self.type_combo.currentTextChanged.connect(self.on_type_changed)
+        self.clickable_checkbox.toggled.connect(self.on_clickable_changed)
+        self.resource_id_edit.textChanged.connect(self.on_resource_id_changed)
+        self.view.selectionModel().currentRowChanged.connect(self.on_current_changed)
+
+    def set_elements(self, elements: List[ElementData]):
+        self.element_json.clear()
+        self.model.update_items(elements)
+        selected_type = self.type_combo.currentText()
+        self.type_combo.blockSignals(True)
+        self.type_combo.clear()
+        self.type_combo.addItem(self.ALL_TYPES)
+        self.type_combo.addItems(sorted({element.type for element in elements if element.type}))
+        self.type_combo.setCurrentText(selected_type)
+        self.type_combo.blockSignals(False)
+        self.on_type_changed(self.type_combo.currentText())
+
+    def clear(self):
+        self.set_elements([])
+
+    def on_type_changed(self, element_type: str):
+        self.proxy.set_type(None if element_type == self.ALL_TYPES else element_type)
+
+    def on_clickable_changed(self, clickable_only: bool):
+        self.proxy.set_clickable_only(clickable_only)
+
+    def on_resource_id_changed(self, resource_id: str):
+        self.proxy.set_resource_id(resource_id)
+
+    def on_current_changed(self, current: QModelIndex, _previous: QModelIndex):
+        element: ElementData = current.data(Qt.ItemDataRole.UserRole) if current.isValid() else None
+        if element is None:
+            self.element_json.clear()
+            return
+        self.element_json.setPlainText(json.dumps(element.asdict_custom(), indent=4))
+
+    def select_element(self, element: ElementData) -> bool:
+        """ Select the element and scroll to it, filters hiding the element are cleared """
+        row = self.model.row_of(element)
+        if row < 0:
+            return False
+        if not self.proxy.filterAcceptsRow(row, QModelIndex()):
+            self.type_combo.setCurrentText(self.ALL_TYPES)
+            self.clickable_checkbox.setChecked(False)
+            self.resource_id_edit.clear()
+        index = self.proxy.mapFromSource(self.model.index(row, 0))
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index, QTableView.ScrollHint.PositionAtCenter)
+        return True
+
+
+if __name__ == "__main__":
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication([])
+    widget = ElementsWidget()
+    widget.set_elements([ElementData(element=None, text=f"Item {index}", location={'x': 0, 'y': index * 10},
+                                     size={'width': 100, 'height': 10}, type='button' if index % 3 else 'text',
+                                     resource_id=f"com.app:id/item{index}", clickable=index % 3 != 0)
+                         for index in range(5000)])
+    widget.resize(600, 800)
+    widget.show()
+    app.exec()
@@ -1,6 +1,8 @@
 import datetime
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import get_type_hints, get_origin, get_args, Union, NewType, List, Dict
+from functools import lru_cache
+from typing import get_type_hints, get_origin, get_args, Union, NewType, List, Dict, Optional
 import logging
 
 
@@ -21,6 +23,73 @@ SecretStr = NewType('SecretStr', str)
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_TYPES = (str, bool, int, float, datetime.timedelta, MultilineStr, SecretStr, List[str], Dict[str, str])
+
+
+@dataclass(frozen=True)
+class FieldSchema:
+    name: str
+    actual_type: type
+    optional: bool
+    docstring: Optional[str]
+
+
+@dataclass(frozen=True)
+class GroupSchema:
+    title: str
+    fields: tuple[FieldSchema, ...]
+
+
+def _parse_text(text: str, actual_type):
+    """ Value of a line edit, raise ValueError for empty or invalid numbers """
+    if actual_type in [int, datetime.timedelta]:
+        return int(text)
+    if actual_type is float:
+        return float(text)
+    return text
+
+
+def _resolve_type(type_hint) -> tuple[Optional[type], bool]:
+    """ Returns (actual type, is optional) e.g. (int, True) for Optional[int] """
+    origin = get_origin(type_hint)
+    args = get_args(type_hint)
+    if origin is Union and type(None) in args:
+        # Get the actual type (e.g., int from Optional[int])
+        non_none_types = [arg for arg in args if arg is not type(None)]
+        return (non_none_types[0] if non_none_types else None), True
+    return type_hint, False
+
+
+@lru_cache(maxsize=None)
+def get_form_schema(cls: type) -> tuple[GroupSchema, ...]:
+    """
+    Properties with getter and setter methods of the class, grouped by declaring class.
+    Reflection is done once per class.
+    """
+    groups = []
+    seen = set()
+    for base in cls.__mro__:
+        if base is object:
+            continue
+        fields = []
+        for name, member in vars(base).items():
+            if not (isinstance(member, property) and member.fget and member.fset):
+                continue
+            if name in seen:
+                logger.debug(f"Skipping duplicate property: {name}")
+                continue
+            # Get type hint from the getter method
+            type_hint = get_type_hints(member.fget).get('return', None)
+            actual_type, optional = _resolve_type(type_hint)
+            if actual_type is None or actual_type not in SUPPORTED_TYPES:
+                continue
+            seen.add(name)
+            fields.append(FieldSchema(name=name, actual_type=actual_type, optional=optional,
+                                      docstring=member.fget.__doc__))
+        if fields:
+            groups.append(GroupSchema(title=base.__name__, fields=tuple(fields)))
+    return tuple(groups)
+
 
 class FormGenerator(QWidget):
     """
@@ -30,6 +99,7 @@ class FormGenerator(QWidget):
         super().__init__(parent)
         self.instance = instance
         self.widgets = {}  # Store widgets and their types
+        self._none_checkboxes: dict[str, Optional[QCheckBox]] = {}
         self._setup_ui()
 
     def _setup_ui(self):
@@ -41,104 +111,76 @@ class FormGenerator(QWidget):
         scroll_content = QWidget()
         scroll_layout = QVBoxLayout(scroll_content)
 
-        class_properties = self._get_class_properties(type(self.instance))
-
-        for base_cls, properties in class_properties.items():
-            group_box = QGroupBox(base_cls.__name__)
+        for group in get_form_schema(type(self.instance)):
+            group_box = QGroupBox(group.title)
             form_layout = QFormLayout()
             form_layout.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
 
-            has_fields = False
+            for field in group.fields:
+                name = field.name
+                widget = self._create_widget_for_type(field.actual_type)
+                none_checkbox = QCheckBox("Set to None") if field.optional else None
 
-            for name, (prop, type_hint) in properties.items():
+                # Initialize widget value from the instance
+                value = getattr(self.instance, name, None)
+                self._set_widget_value(widget, value, field.actual_type)
 
-                if name in self.widgets:
-                    logger.debug(f"Skipping duplicate property: {name}")
-                    continue
+                # Connect signals to update the instance's properties
+                self._connect_widget_signal(widget, name, field.actual_type)
 
-                widget_pair = self._create_widget_for_type(type_hint)
-                if widget_pair:
-                    has_fields = True
-                    widget, none_checkbox, actual_type = widget_pair
-
-                    # Initialize widget value from the instance
-                    value = getattr(self.instance, name, None)
-                    self._set_widget_value(widget, value, actual_type)
-
-                    # Connect signals to update the instance's properties
-                    self._connect_widget_signal(widget, name, actual_type)
-
-                    # Get docstring for tooltip
-                    docstring = prop.fget.__doc__
-                    if docstring:
-                        widget.setToolTip(docstring)
-                        if none_checkbox:
-                            none_checkbox.setToolTip(docstring)
-                    widget.setObjectName(name)
-
-                    # Handle the 'Set to None' checkbox if the field is optional
+                if field.docstring:
+                    widget.setToolTip(field.docstring)
                     if none_checkbox:
-                        none_checkbox.setObjectName(f"{name}_none")
-                        # Set the checkbox state based on whether the value is None
-                        none_checkbox.setChecked(value is None)
-                        self._connect_none_checkbox(none_checkbox, widget, name, actual_type)
-                        # Create a horizontal layout for the widget and checkbox
-                        h_layout = QHBoxLayout()
-                        h_layout.addWidget(widget)
-                        h_layout.addWidget(none_checkbox)
-                        form_layout.addRow(name, h_layout)
-                    else:
-                        form_layout.addRow(name, widget)
-
-                    self.widgets[name] = (widget, actual_type)  # Store widget and type
-            if has_fields:
-                group_box.setLayout(form_layout)
-                scroll_layout.addWidget(group_box)
+                        none_checkbox.setToolTip(field.docstring)
+                widget.setObjectName(name)
+
+                # Handle the 'Set to None' checkbox if the field is optional
+                if none_checkbox:
+                    none_checkbox.setObjectName(f"{name}_none")
+                    # Set the checkbox state based on whether the value is None
+                    none_checkbox.setChecked(value is None)
+                    self._connect_none_checkbox(none_checkbox, widget, name, field.actual_type)
+                    # Create a horizontal layout for the widget and checkbox
+                    h_layout = QHBoxLayout()
+                    h_layout.addWidget(widget)
+                    h_layout.addWidget(none_checkbox)
+                    form_layout.addRow(name, h_layout)
+                else:
+                    form_layout.addRow(name, widget)
+
+                self.widgets[name] = (widget, field.actual_type)  # Store widget and type
+                self._none_checkboxes[name] = none_checkbox
+            group_box.setLayout(form_layout)
+            scroll_layout.addWidget(group_box)
 
         scroll_content.setLayout(scroll_layout)
         scroll_area.setWidget(scroll_content)
         main_layout.addWidget(scroll_area)
         self.setLayout(main_layout)
 
-    def _get_class_properties(self, cls):
+    def set_instance(self, instance):
         """
-        Retrieves properties with getter and setter methods, grouped by declaring class.
+        Bind the form to another instance of the same class, widget values are refreshed from it.
         """
-        class_properties = {}
-        for base in cls.__mro__:
-            if base is object:
-                continue
-            base_properties = {}
-            for name, member in vars(base).items():
-                if isinstance(member, property) and member.fget and member.fset:
-                    # Get type hint from the getter method
-                    type_hints = get_type_hints(member.fget)
-                    type_hint = type_hints.get('return', None)
-                    base_properties[name] = (member, type_hint)
-            if base_properties:
-                class_properties[base] = base_properties
-        return class_properties
-
-    def _create_widget_for_type(self, type_hint):
+        assert type(instance) is type(self.instance), f"Expected {type(self.instance)}, got {type(instance)}"
+        self.instance = instance
+        for name, (widget, actual_type) in self.widgets.items():
+            value = getattr(instance, name, None)
+            none_checkbox = self._none_checkboxes.get(name)
+            # the instance already has the values, block writing them back
+            widget.blockSignals(True)
+            self._set_widget_value(widget, value, actual_type)
+            widget.blockSignals(False)
+            if none_checkbox:
+                none_checkbox.blockSignals(True)
+                none_checkbox.setChecked(value is None)
+                none_checkbox.blockSignals(False)
+                widget.setEnabled(value is not None)
+
+    def _create_widget_for_type(self, actual_type) -> QWidget:
         """
-        Creates a widget based on the provided type hint.
-        Returns a tuple of (widget, none_checkbox, actual_type) if the field is optional.
+        Creates a widget for a type supported by the schema.
         """
-        is_optional = False
-        origin = get_origin(type_hint)
-        args = get_args(type_hint)
-
-        if origin is Union and type(None) in args:
-            is_optional = True
-            # Get the actual type (e.g., int from Optional[int])
-            non_none_types = [arg for arg in args if arg is not type(None)]
-            actual_type = non_none_types[0] if non_none_types else None
-        else:
-            actual_type = type_hint
-
-        if actual_type is None:
-            return None  # Unsupported type
-
         if actual_type is str:
             widget = QLineEdit()
         elif actual_type is bool:
@@ -163,14 +205,8 @@ class FormGenerator(QWidget):
         elif actual_type is Dict[str, str]:
             widget = DictEditorWidget(self)
         else:
-            # Handle other types or return None to skip
-            return None
-
-        if is_optional:
-            none_checkbox = QCheckBox("Set to None")
-            return widget, none_checkbox, actual_type
-        else:
-            return widget, None, actual_type
+            raise ValueError(f"Unsupported type: {actual_type}")
+        return widget
 
     def _set_widget_value(self, widget, value, actual_type):
         """
@@ -183,7 +219,7 @@ class FormGenerator(QWidget):
         if isinstance(widget, QLineEdit):
             if actual_type in (int, float):
                 widget.setText(str(value))
-            if actual_type is timedelta:
+            elif actual_type is timedelta:
                 widget.setText(str(value.total_seconds()))
             else:
                 widget.setText(value)
@@ -205,19 +241,11 @@ class FormGenerator(QWidget):
             if not widget.isEnabled():
                 return
             if isinstance(widget, QLineEdit):
-                text = widget.text()
-                if actual_type in [int, datetime.timedelta]:
-                    try:
-                        value = int(text)
-                    except ValueError:
-                        value = 0
-                elif actual_type is float:
-                    try:
-                        value = float(text)
-                    except ValueError:
-                        value = 0.0
-                else:
-                    value = text
+                try:
+                    value = _parse_text(widget.text(), actual_type)
+                except ValueError:
+                    # empty or incomplete number, keep the current value instead of writing 0
+                    return
             elif isinstance(widget, QTextEdit):
                 value = widget.toPlainText()
             elif isinstance(widget, QComboBox):
@@ -253,6 +281,7 @@ class FormGenerator(QWidget):
         elif isinstance(widget, DictEditorWidget):
             # Connect the widget's signals to update the property
             widget.table.itemChanged.connect(update_property)
+            widget.table.model().rowsRemoved.connect(update_property)
 
     def _connect_none_checkbox(self, none_checkbox, widget, property_name, actual_type):
         """
@@ -276,19 +305,11 @@ class FormGenerator(QWidget):
         Updates the property value from the widget's current value.
         """
         if isinstance(widget, QLineEdit):
-            text = widget.text()
-            if actual_type in [int, datetime.timedelta]:
-                try:
-                    value = int(text)
-                except ValueError:
-                    value = 0
-            elif actual_type is float:
-                try:
-                    value = float(text)
-                except ValueError:
-                    value = 0.0
-            else:
-                value = text
+            try:
+                value = _parse_text(widget.text(), actual_type)
+            except ValueError:
+                # nothing entered yet, the property keeps its value
+                return
         elif isinstance(widget,QTextEdit):
             value = widget.toPlainText()
         elif isinstance(widget, QCheckBox):
@@ -308,19 +329,10 @@ class FormGenerator(QWidget):
         values = {}
         for name, (widget, actual_type) in self.widgets.items():
             if isinstance(widget, QLineEdit):
-                text = widget.text()
-                if actual_type in [int, datetime.timedelta]:
-                    try:
-                        values[name] = int(text)
-                    except ValueError:
-                        values[name] = 0
-                elif actual_type is float:
-                    try:
-                        values[name] = float(text)
-                    except ValueError:
-                        values[name] = 0.0
-                else:
-                    values[name] = text
+                try:
+                    values[name] = _parse_text(widget.text(), actual_type)
+                except ValueError:
+                    values[name] = None
             elif isinstance(widget, type(MultilineStr)) or isinstance(widget, type(SecretStr)):
                 values[name] = widget.text()
             elif isinstance(widget, QCheckBox):
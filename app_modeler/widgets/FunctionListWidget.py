@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QWidget, QTableView, QVBoxLayout, QHeaderView, QMenu
-from PySide6.QtCore import Signal, QModelIndex, Qt
-from typing import List
+from PySide6.QtCore import Signal, QModelIndex, Qt, QTimer
+from typing import Callable, List
 import logging
 
 from app_modeler.models.FunctionCall import FunctionCall
@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 
 class FunctionListWidget(QWidget):
     execute_signal = Signal(FunctionCall)
+    # column widths are recomputed once changes have settled
+    RESIZE_DELAY_MS = 50
+
     def __init__(self, allow_add_behaviour: bool=False):
         super().__init__()
         self.model = FunctionCallModel(all_editable=allow_add_behaviour)
@@ -24,12 +27,19 @@ class FunctionListWidget(QWidget):
         header = self.view.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)  # Default mode for all columns
         header.setSectionResizeMode(self.model.columnCount() - 1, QHeaderView.Stretch)  # Last column stretches
+        # only the visible rows are measured
+        header.setResizeContentsPrecision(0)
 
         # Connect model signals to adjust column widths dynamically
-        self.model.dataChanged.connect(self.view.resizeColumnsToContents)
-        self.model.layoutChanged.connect(self.view.resizeColumnsToContents)
-        self.model.rowsInserted.connect(self.view.resizeColumnsToContents)
-        self.model.layoutResetFinished.connect(self.view.resizeColumnsToContents)
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_DELAY_MS)
+        self._resize_timer.timeout.connect(self.view.resizeColumnsToContents)
+        self.model.dataChanged.connect(self._schedule_resize)
+        self.model.layoutChanged.connect(self._schedule_resize)
+        self.model.rowsInserted.connect(self._schedule_resize)
+        self.model.rowsRemoved.connect(self._schedule_resize)
+        self.model.layoutResetFinished.connect(self._schedule_resize)
 
         self._allow_add_behaviour = allow_add_behaviour
         if allow_add_behaviour:
@@ -42,8 +52,11 @@ class FunctionListWidget(QWidget):
         layout = QVBoxLayout(self)
         layout.addWidget(self.view)
 
+    def _schedule_resize(self, *_):
+        self._resize_timer.start()
+
     def refresh(self):
-        self.model.layoutResetFinished.emit()
+        self.model.refresh()
 
     def execute_function(self, row: int):
         func = self.model.functions[row]
@@ -66,16 +79,17 @@ class FunctionListWidget(QWidget):
         if action == add_row_action:
             func = FunctionCall(view='view', function_name='function_name', args='', kwargs='')
             self.model.append(func)
-            self.model.layoutResetFinished.emit()
         elif action == remove_row_action:
             selected_rows = self.view.selectionModel().selectedRows()
-            for row in selected_rows:
-                self.model.functions.pop(row.row())
-            self.model.layoutResetFinished.emit()
+            self.model.remove_rows([index.row() for index in selected_rows])
 
     def clear(self):
         self.model.clear()
 
+    def set_api_resolver(self, resolver):
+        """ Show method signatures and locators as tooltips using the given class API resolver """
+        self.model.set_api_resolver(resolver)
+
     def update_items(self, functions: List[FunctionCall]):
         self.model.update_items(functions)
 
@@ -83,8 +97,7 @@ class FunctionListWidget(QWidget):
         self.model.append(function)
 
     def append_many(self, functions: List[FunctionCall]):
-        for function in functions:
-            self.append(function)
+        self.model.append_many(functions)
 
     def to_dict(self):
         return [func.model_dump() for func in self.model.functions]
@@ -93,10 +106,9 @@ class FunctionListWidget(QWidget):
         funcs = [FunctionCall(**func) for func in data]
         self.update_items(funcs)
 
-    def inject_many(self, function_list_widget: 'FunctionListWidget'):
-        """Inject all functions from given function list widget."""
-        for function in function_list_widget.model.functions:
-            self.model.update_args(function)
+    def inject_many(self, apply: Callable[[List[FunctionCall]], List[int]]):
+        """Inject the arguments with the given apply function, e.g. ModelerState.apply_injects."""
+        self.model.apply_injects(apply)
 
     def get_selected(self):
         selected_rows = self.view.selectionModel().selectedRows()
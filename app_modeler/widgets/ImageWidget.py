@@ -1,13 +1,33 @@
 import logging
+from collections import OrderedDict
+from typing import Callable, Optional
 
-from PySide6.QtGui import QPixmap, QPainter, QColor, QPen
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QLabel, QSizePolicy
+from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QImage
+from PySide6.QtCore import Qt, QTimer, QSize, QRect, Signal, QPointF
+from PySide6.QtWidgets import QLabel, QSizePolicy, QToolTip
+
+from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
+from app_modeler.models.ClassApi import ClassApi
+from app_modeler.models.WorkerThread import WorkerThread
+from app_modeler.utils.SpatialIndex import SpatialIndex
 
 logger = logging.getLogger(__name__)
 
 
+def decode_image(sequence: int, image_data: bytes) -> tuple[int, QImage]:
+    """ Decode image data, QImage can be created outside of the GUI thread """
+    return sequence, QImage.fromData(image_data)
+
+
 class ImageWidget(QLabel):
+    element_clicked = Signal(object)
+
+    # scaled pixmaps are cached per size bucket
+    SIZE_BUCKET = 16
+    CACHE_SIZE = 4
+    # smooth scaling is done when resizing has stopped for this long
+    SMOOTH_DELAY_MS = 150
+
     def __init__(self, parent):
         super().__init__(parent)
         self.setScaledContents(True)
@@ -16,6 +36,26 @@ class ImageWidget(QLabel):
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
         self.original_pixmap = None  # Store the original pixmap
+        self._scaled_cache: OrderedDict[tuple[int, int], QPixmap] = OrderedDict()
+        self._sequence = 0
+        self._decode_threads: set[WorkerThread] = set()
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(self.SMOOTH_DELAY_MS)
+        self._smooth_timer.timeout.connect(self._scale_and_set_pixmap)
+
+        # element overlay
+        self._elements: list[ElementData] = []
+        self._index: SpatialIndex[ElementData] = SpatialIndex()
+        self._overlay_visible = True
+        self._overlay_pixmap: Optional[QPixmap] = None
+        self._overlay_key: Optional[tuple[int, int]] = None
+        # element coordinates to screenshot pixels, e.g. 2.0 on retina screens
+        self._device_scale = 1.0
+        self._hovered: Optional[ElementData] = None
+        self._api_resolver: Optional[Callable[[], Optional[ClassApi]]] = None
+        self.setMouseTracking(True)
+
         self._draw_template_graph()
 
     def _draw_template_graph(self):
@@ -39,30 +79,193 @@ class ImageWidget(QLabel):
         painter.drawRect(0, 0, width - 1, height - 1)  # Add a border
 
         painter.end()
+        self._set_original(pixmap)
+
+    def _set_original(self, pixmap: QPixmap):
         self.original_pixmap = pixmap
+        self._scaled_cache.clear()
+        self._overlay_key = None
+        self._update_device_scale()
+        self._scale_and_set_pixmap()
+
+    def set_api_resolver(self, resolver: Callable[[], Optional[ClassApi]]):
+        """ Resolver of the current view API, used to show the methods of an element """
+        self._api_resolver = resolver
+
+    def set_overlay_visible(self, visible: bool):
+        self._overlay_visible = bool(visible)
+        self._overlay_key = None
         self._scale_and_set_pixmap()
 
+    def set_elements(self, elements: list[ElementData]):
+        """ Elements of the shown screenshot """
+        self._elements = [element for element in elements if element.size]
+        self._index.clear()
+        for element in self._elements:
+            self._index.insert(element, element.location['x'], element.location['y'],
+                               element.size['width'], element.size['height'])
+        self._hovered = None
+        self._overlay_key = None
+        self._update_device_scale()
+        self._scale_and_set_pixmap()
+
+    def _update_device_scale(self):
+        """ Screenshots can be in pixels while elements are in points """
+        extent = max((element.location['x'] + element.size['width'] for element in self._elements), default=0)
+        if not extent or not self.original_pixmap:
+            self._device_scale = 1.0
+            return
+        ratio = self.original_pixmap.width() / extent
+        self._device_scale = float(round(ratio)) if ratio >= 1.5 else 1.0
+
     def update_image(self, image_data: bytes):
+        """ Decode the image in a worker thread, only the latest image is shown """
         logger.debug("Updating image")
-        pixmap = QPixmap()
-        pixmap.loadFromData(image_data)
-        self.original_pixmap = pixmap
-        self._scale_and_set_pixmap()
+        # elements of the previous screenshot are outdated
+        self.set_elements([])
+        self._sequence += 1
+        thread = WorkerThread(decode_image, self._sequence, bytes(image_data))
+        thread.result_signal.connect(self._on_image_decoded)
+        thread.error_signal.connect(lambda error: logger.warning(f"Image decoding failed: {error}"))
+        thread.finished.connect(lambda: self._decode_threads.discard(thread))
+        self._decode_threads.add(thread)
+        thread.start()
 
-    def _scale_and_set_pixmap(self):
-        if not self.original_pixmap:
+    def _on_image_decoded(self, result: tuple[int, QImage]):
+        sequence, image = result
+        if sequence != self._sequence:
+            logger.debug(f"Dropping outdated image {sequence}")
+            return
+        if image.isNull():
+            logger.warning("Invalid image data")
             return
+        self._set_original(QPixmap.fromImage(image))
 
-        label_size = self.size()
-        scaled_pixmap = self.original_pixmap.scaled(
-            label_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+    def _bucket_size(self) -> QSize:
+        """ Target size of the scaled image rounded down to the size bucket """
+        size = self.original_pixmap.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        return QSize(max(size.width() // self.SIZE_BUCKET * self.SIZE_BUCKET, 1),
+                     max(size.height() // self.SIZE_BUCKET * self.SIZE_BUCKET, 1))
+
+    def _scale_and_set_pixmap(self, smooth: bool = True):
+        if not self.original_pixmap or self.original_pixmap.isNull():
+            return
+
+        size = self._bucket_size()
+        key = (size.width(), size.height())
+        scaled_pixmap = self._scaled_cache.get(key)
+        if scaled_pixmap is not None:
+            self._scaled_cache.move_to_end(key)
+        elif smooth:
+            scaled_pixmap = self.original_pixmap.scaled(
+                size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            self._scaled_cache[key] = scaled_pixmap
+            if len(self._scaled_cache) > self.CACHE_SIZE:
+                self._scaled_cache.popitem(last=False)
+        else:
+            scaled_pixmap = self.original_pixmap.scaled(
+                size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.FastTransformation
+            )
+        if self._overlay_visible and self._elements:
+            scaled_pixmap = self._get_overlay_pixmap(scaled_pixmap, key, cache=smooth)
         self.setPixmap(scaled_pixmap)
 
+    def _scale_factor(self, pixmap: QPixmap) -> float:
+        """ Element coordinates to shown pixmap coordinates """
+        return pixmap.width() / self.original_pixmap.width() * self._device_scale
+
+    def _element_rect(self, element: ElementData, factor: float) -> QRect:
+        return QRect(round(element.location['x'] * factor), round(element.location['y'] * factor),
+                     round(element.size['width'] * factor), round(element.size['height'] * factor))
+
+    def _get_overlay_pixmap(self, pixmap: QPixmap, key: tuple[int, int], cache: bool) -> QPixmap:
+        """ Draw all element bounds in one pass, the result is cached per size """
+        if cache and self._overlay_key == key:
+            return self._overlay_pixmap
+        overlay = QPixmap(pixmap)
+        factor = self._scale_factor(pixmap)
+        clickable = [self._element_rect(element, factor) for element in self._elements if element.clickable]
+        others = [self._element_rect(element, factor) for element in self._elements if not element.clickable]
+        painter = QPainter(overlay)
+        painter.setPen(QPen(QColor(255, 0, 0, 140), 1))
+        painter.drawRects(others)
+        painter.setPen(QPen(QColor(0, 160, 0, 200), 1))
+        painter.drawRects(clickable)
+        painter.end()
+        if cache:
+            self._overlay_key = key
+            self._overlay_pixmap = overlay
+        return overlay
+
+    def _pixmap_offset(self) -> QPointF:
+        """ Top-left corner of the centered pixmap """
+        pixmap = self.pixmap()
+        return QPointF((self.width() - pixmap.width()) / 2, (self.height() - pixmap.height()) / 2)
+
+    def element_at(self, pos: QPointF) -> Optional[ElementData]:
+        """ Innermost element under the widget position """
+        pixmap = self.pixmap()
+        if not self._elements or pixmap is None or pixmap.isNull():
+            return None
+        factor = self._scale_factor(pixmap)
+        point = (pos - self._pixmap_offset()) / factor
+        hits = self._index.query(point.x(), point.y())
+        return hits[0] if hits else None
+
+    def _element_tooltip(self, element: ElementData) -> str:
+        lines = [element.type]
+        for name in ('text', 'resource_id', 'content_desc', 'label', 'name'):
+            value = getattr(element, name)
+            if value:
+                lines.append(f"{name}: {value}")
+        class_api = self._api_resolver() if self._api_resolver else None
+        if class_api:
+            lines += [method.signature for method in class_api.methods_for_locators(element.locators())]
+        return "\n".join(lines)
+
+    def mouseMoveEvent(self, event):
+        element = self.element_at(event.position()) if self._overlay_visible else None
+        if element is not self._hovered:
+            self._hovered = element
+            self.update()
+            if element is None:
+                QToolTip.hideText()
+            else:
+                QToolTip.showText(event.globalPosition().toPoint(), self._element_tooltip(element), self)
+        super().mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self._hovered is not None:
+            self.element_clicked.emit(self._hovered)
+        super().mousePressEvent(event)
+
+    def leaveEvent(self, event):
+        if self._hovered is not None:
+            self._hovered = None
+            self.update()
+        super().leaveEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._hovered is None:
+            return
+        pixmap = self.pixmap()
+        rect = self._element_rect(self._hovered, self._scale_factor(pixmap))
+        rect.translate(self._pixmap_offset().toPoint())
+        painter = QPainter(self)
+        painter.setPen(QPen(QColor(255, 200, 0), 3))
+        painter.drawRect(rect)
+        painter.end()
+
     def resizeEvent(self, event):
-        self._scale_and_set_pixmap()
+        # fast scaling during live resize, smooth scaling once resizing stops
+        self._scale_and_set_pixmap(smooth=False)
+        self._smooth_timer.start()
         super().resizeEvent(event)
 
 
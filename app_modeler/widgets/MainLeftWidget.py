@@ -18,6 +18,10 @@ class BottomLeftWidget(SettingsWidget):
 
     def _connect_signals(self):
         self.state.signals.screenshot.connect(self.image.update_image)
+        self.state.signals.elements_propose.connect(self.image.set_elements)
+        self.image.element_clicked.connect(self.state.signals.element_selected.emit)
+        self.image.set_api_resolver(lambda: self.state.current_view.api if self.state.current_view else None)
+        self.show_elements_checkbox.toggled.connect(self.image.set_overlay_visible)
         self.state.signals.connected.connect(self.on_connected)
         self.state.signals.executed.connect(self.on_executed)
         self.state.signals.disconnected.connect(lambda :self.analyse_button.setEnabled(False))
@@ -60,6 +64,13 @@ class BottomLeftWidget(SettingsWidget):
         self.auto_analyse_checkbox.setObjectName("auto_analyse_checkbox")
         operate_layout.addWidget(self.auto_analyse_checkbox)
 
+        self.show_elements_checkbox = QCheckBox("Show elements")
+        self.show_elements_checkbox.setToolTip("Draw element bounds on the screenshot. "
+                                               "Hover an element for details, click to show its method")
+        self.show_elements_checkbox.setObjectName("show_elements_checkbox")
+        self.show_elements_checkbox.setChecked(True)
+        operate_layout.addWidget(self.show_elements_checkbox)
+
         self.analyse_button = QPushButton("Analyse")
         self.analyse_button.setEnabled(False)
         self.analyse_button.clicked.connect(self.state.signals.analyse.emit)
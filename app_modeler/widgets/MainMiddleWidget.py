@@ -2,8 +2,10 @@ import logging
 
 from PySide6.QtWidgets import QVBoxLayout, QTabWidget, QPushButton, QHBoxLayout, QCheckBox, QGroupBox
 
+from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData
 from app_modeler.models.ModelerState import ModelerState
 from app_modeler.widgets.CodeWidget import CodeWidget
+from app_modeler.widgets.ElementsWidget import ElementsWidget
 from app_modeler.widgets.SettingsWidget import SettingsWidget
 
 logger = logging.getLogger(__name__)
@@ -17,20 +19,21 @@ class BottomMiddleWidget(SettingsWidget):
         self._setup_ui()
 
         self.state.signals.class_propose.connect(self.class_code.setPlainText)
-        self.state.signals.elements_propose.connect(self.elements_json.setPlainText)
+        self.state.signals.elements_propose.connect(self.elements_widget.set_elements)
         self.state.signals.next_func_candidates.connect(self.on_next_func_candidates)
+        self.state.signals.element_selected.connect(self.on_element_selected)
         self.auto_import_checkbox.stateChanged.connect(self.import_button.setDisabled)
         self.init_settings(state.settings)
 
     def _setup_ui(self):
         layout = QVBoxLayout()
 
-        tab = QTabWidget()
+        self.tab = QTabWidget()
         self.class_code = CodeWidget()
-        self.elements_json = CodeWidget()
-        tab.addTab(self.class_code, "Class")
-        tab.addTab(self.elements_json, "Elements")
-        layout.addWidget(tab)
+        self.elements_widget = ElementsWidget()
+        self.tab.addTab(self.class_code, "Class")
+        self.tab.addTab(self.elements_widget, "Elements")
+        layout.addWidget(self.tab)
 
         operate_box = QGroupBox()
         operate_layout = QHBoxLayout()
@@ -57,9 +60,19 @@ class BottomMiddleWidget(SettingsWidget):
             logger.debug("Auto import enabled, importing module")
             self.import_module()
 
+    def on_element_selected(self, element: ElementData):
+        """ Show the generated method of the element, or the element itself if no method uses it """
+        self.elements_widget.select_element(element)
+        view = self.state.current_view
+        methods = view.api.methods_for_locators(element.locators()) if view else []
+        if methods and self.class_code.select_text(f"def {methods[0].name}("):
+            self.tab.setCurrentWidget(self.class_code)
+        else:
+            self.tab.setCurrentWidget(self.elements_widget)
+
     def import_module(self):
         self.state.signals.import_module.emit()
 
     def on_execute(self):
         self.class_code.clear()
-        self.elements_json.clear()
+        self.elements_widget.clear()
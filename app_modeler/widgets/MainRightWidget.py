@@ -3,7 +3,7 @@ import logging
 from pathlib import Path
 
 from PySide6.QtWidgets import QVBoxLayout, QGroupBox, QHBoxLayout, QCheckBox, QWidget, QTabWidget, QPushButton, \
-    QFileDialog, QMessageBox
+    QFileDialog, QMessageBox, QComboBox
 
 from app_modeler.models.FunctionCall import FunctionCall
 from app_modeler.models.ModelerState import ModelerState
@@ -94,9 +94,17 @@ class BottomRightWidget(SettingsWidget):
         operate_layout.addWidget(self.auto_inject_checkbox)
 
         self.auto_select_checkbox = QCheckBox("Auto execute")
-        self.auto_select_checkbox.setToolTip("Execute the first function. Sorted by AI with given prompt")
+        self.auto_select_checkbox.setToolTip("Explore the application automatically. "
+                                             "Unexecuted functions are tried first, explored views are backtracked")
         self.auto_select_checkbox.setObjectName("auto_select_checkbox")
         operate_layout.addWidget(self.auto_select_checkbox)
+
+        self.navigate_combo = QComboBox()
+        self.navigate_combo.setToolTip("Known view to navigate to")
+        operate_layout.addWidget(self.navigate_combo)
+        self.navigate_button = QPushButton("Go to view")
+        self.navigate_button.setToolTip("Drive the device to the selected view through the shortest known path")
+        operate_layout.addWidget(self.navigate_button)
         operate_box.setLayout(operate_layout)
 
         layout.addWidget(operate_box)
@@ -104,21 +112,41 @@ class BottomRightWidget(SettingsWidget):
         self.setLayout(layout)
 
     def _connect_signals(self):
+        self.api_list.set_api_resolver(self.state.get_class_api)
+        self.history_list.set_api_resolver(self.state.get_class_api)
         self.state.signals.next_func_candidates.connect(self.on_next_function_candidates_available)
         self.state.signals.module_imported.connect(self.on_module_imported)
         self.state.signals.executed.connect(self.on_executed)
+        self.state.signals.navigated.connect(self.on_navigated)
         self.api_list.execute_signal.connect(self.on_execute)
         self.injects_export_button.clicked.connect(self.on_injects_export)
         self.injects_import_button.clicked.connect(self.on_injects_import)
         self.auto_inject_checkbox.stateChanged.connect(self.inject_now_button.setDisabled)
         self.inject_now_button.clicked.connect(self.on_inject)
+        inject_model = self.inject_list.model
+        for signal in (inject_model.dataChanged, inject_model.rowsInserted, inject_model.rowsRemoved,
+                       inject_model.modelReset):
+            signal.connect(self.on_injects_changed)
         self.history_export_button.clicked.connect(self.on_history_export)
         self.clean_history_button.clicked.connect(self.history_list.clear)
         self.add_to_inject_button.clicked.connect(self.add_to_inject)
+        self.navigate_button.clicked.connect(self.on_navigate)
 
     def on_next_function_candidates_available(self):
         logger.debug("Updating function candidates")
         self.update_list()
+        self.update_navigate_views()
+
+    def update_navigate_views(self):
+        selected = self.navigate_combo.currentText()
+        self.navigate_combo.clear()
+        self.navigate_combo.addItems([class_data.name for class_data in self.state.session.classes])
+        self.navigate_combo.setCurrentText(selected)
+
+    def on_navigate(self):
+        view_name = self.navigate_combo.currentText()
+        if view_name:
+            self.state.signals.navigate.emit(view_name)
 
     def on_module_imported(self):
         # enable app_list execute functionality
@@ -128,8 +156,12 @@ class BottomRightWidget(SettingsWidget):
             logger.debug("Auto import and inject enabled, injecting first function")
             self.on_inject()
         if self.auto_select_checkbox.isChecked():
-            logger.debug("Auto select and execute enabled, executing first function")
-            self.on_execute(self.api_list.model.functions[0])
+            function_call = self.state.next_exploration_action()
+            if function_call is None:
+                logger.info("Auto execute: exploration finished")
+                return
+            logger.debug(f"Auto select and execute enabled, executing {function_call}")
+            self.on_execute(function_call)
 
     def on_execute(self, function_call: FunctionCall):
         logger.debug(f"Executing function: {function_call}")
@@ -139,9 +171,13 @@ class BottomRightWidget(SettingsWidget):
         self.history_list.append(func_call)
         self.api_list.refresh()
 
+    def on_navigated(self, func_calls: list[FunctionCall]):
+        for func_call in func_calls:
+            self.history_list.append(func_call)
+        self.api_list.refresh()
+
     def update_list(self):
         view = self.state.current_view
-        self.api_list.clear()
         self.api_list.update_items(view.function_candidates)
 
     def on_injects_export(self):
@@ -182,9 +218,12 @@ class BottomRightWidget(SettingsWidget):
             data = json.load(file)
             self.inject_list.from_dict(data)
 
+    def on_injects_changed(self, *_):
+        self.state.set_injects(self.inject_list.model.functions)
+
     def on_inject(self):
         logger.debug("Injecting functions")
-        self.api_list.inject_many(self.inject_list)
+        self.api_list.inject_many(self.state.apply_injects)
 
     def on_history_export(self):
         # open file dialog for save json file
@@ -193,7 +232,9 @@ class BottomRightWidget(SettingsWidget):
             return
 
         tg = TestGenerator(start_options=self.state.appium_options,
-                      session=self.state.session)
+                           session=self.state.session,
+                           max_steps_per_test=self.state.app_settings.max_steps_per_test,
+                           remove_navigation_loops=self.state.app_settings.remove_navigation_loops)
         files = tg.generate(output_path)
         logger.info(f"Generated files: {files}")
         names = [Path(f).name for f in files]
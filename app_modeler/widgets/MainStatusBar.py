@@ -5,15 +5,18 @@ from selenium.webdriver.common.options import BaseOptions
 from app_modeler.dialogs.AppiumConfigDialog import AppiumConfigDialog
 from app_modeler.models.AppSettings import AppSettings
 from app_modeler.models.ModelerState import ModelerState
+from app_modeler.models.Progress import Progress
 from app_modeler.models.StartOptions import StartOptions
 from app_modeler.utils.utils import get_icon
-from app_modeler.widgets.InfiniteProgressBar import InfiniteProgressBar
+from app_modeler.widgets.ProgressBar import ProgressBar
 
 
 class MainStatusBar(QStatusBar):
     def __init__(self, state: ModelerState):
         super().__init__()
-        self.appium_options: BaseOptions = AppiumConfigDialog(state.settings).options
+        # kept for the session, the option forms are built once
+        self.appium_dialog = AppiumConfigDialog(state.settings)
+        self.appium_options: BaseOptions = self.appium_dialog.options
         self.state = state
         self._setup_ui()
         self._connect_signals()
@@ -37,7 +40,7 @@ class MainStatusBar(QStatusBar):
         self.addWidget(self.status_label)
 
         # Processing with Progress Bar (stretches to max)
-        self.progress_bar = InfiniteProgressBar(self.state.signals.processing, self)
+        self.progress_bar = ProgressBar(self.state.signals.processing, self.state.signals.progress, self)
         self.addWidget(self.progress_bar, 1)  # Stretch factor = 1
 
         self.addWidget(create_separator())
@@ -67,6 +70,7 @@ class MainStatusBar(QStatusBar):
         self.state.signals.disconnected.connect(self.on_disconnected)
         self.state.signals.tokens_spend.connect(self.set_token_value)
         self.state.signals.status_message.connect(self.on_status_message)
+        self.state.signals.progress.connect(self.on_progress)
 
         self.connect_action.triggered.connect(self.on_connect_clicked)
         self.disconnect_action.triggered.connect(self.state.signals.disconnect.emit)
@@ -80,10 +84,9 @@ class MainStatusBar(QStatusBar):
         self.state.signals.connect.emit(options)
 
     def on_appium_clicked(self):
-        dialog = AppiumConfigDialog(self.state.settings)
-        retval = dialog.exec()
+        retval = self.appium_dialog.exec()
         if retval == QDialog.DialogCode.Accepted:
-            self.appium_options = dialog.options
+            self.appium_options = self.appium_dialog.options
 
     def on_connected(self):
         self.update_connection_status(True)
@@ -97,6 +100,10 @@ class MainStatusBar(QStatusBar):
 
     def on_status_message(self, message: str):
         self.status_label.setText(message)
+        self.progress_bar.set_indeterminate()
+
+    def on_progress(self, progress: Progress):
+        self.status_label.setText(progress.stage)
 
 
     @staticmethod
@@ -125,7 +132,16 @@ class MainStatusBar(QStatusBar):
 
     def set_token_value(self, value):
         """Set the value of the tokens display."""
-        self.token_label.setText(f"Tokens: {value}")
+        text = f"Tokens: {value}"
+        tooltip = self.state.budget.message
+        if self.state.ai_assistant:
+            cached_tokens = self.state.ai_assistant.cached_tokens
+            if cached_tokens:
+                text += f" ({cached_tokens} cached)"
+            tooltip += f"\nPrompt tokens served from the provider cache: {cached_tokens}"
+            tooltip += f"\n{self.state.ai_assistant.rate_limiter.message}"
+        self.token_label.setText(text)
+        self.token_label.setToolTip(tooltip)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,65 @@
+from PySide6.QtCore import Signal
+
+from app_modeler.models.Progress import Progress
+from app_modeler.widgets.InfiniteProgressBar import InfiniteProgressBar
+
+
+class ProgressBar(InfiniteProgressBar):
+    """
+    Determinate progress bar driven by Progress updates.
+    Falls back to the infinite animation while processing without a known total.
+    """
+    def __init__(self, control_signal: Signal, progress_signal: Signal, parent=None):
+        super().__init__(control_signal, parent)
+        self._processing = False
+        progress_signal.connect(self.set_progress)
+
+    def handle_signal(self, start: bool):
+        self._processing = start
+        super().handle_signal(start)
+
+    def set_indeterminate(self):
+        """ Continue with the animation, e.g. when a stage without known total starts """
+        if self._processing and not self.timer.isActive():
+            self.start_infinite()
+
+    def set_progress(self, progress: Progress):
+        if not progress.total:
+            self.set_indeterminate()
+            return
+        self.timer.stop()
+        self.setRange(0, progress.total)
+        self.setValue(min(progress.done, progress.total))
+        self.setFormat(progress.message)
+        self.setTextVisible(True)
+
+    def start_infinite(self):
+        self.setRange(0, 100)
+        self.setTextVisible(False)
+        super().start_infinite()
+
+    def stop_infinite(self):
+        super().stop_infinite()
+        self.setRange(0, 100)
+        self.setTextVisible(False)
+
+
+if __name__ == '__main__':
+    from PySide6.QtCore import QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    class Signals(QObject):
+        processing = Signal(bool)
+        progress = Signal(Progress)
+
+    app = QApplication([])
+    signals = Signals()
+    bar = ProgressBar(signals.processing, signals.progress)
+    bar.resize(400, 30)
+    bar.show()
+    signals.processing.emit(True)
+    steps = iter(range(101))
+    timer = QTimer()
+    timer.timeout.connect(lambda: signals.progress.emit(Progress('Scanning', next(steps, 100), 100)))
+    QTimer.singleShot(2000, lambda: timer.start(50))
+    app.exec()
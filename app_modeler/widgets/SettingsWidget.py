@@ -1,17 +1,29 @@
-from typing import Optional
+from typing import Optional, Any
+import json
 import logging
 
 from PySide6.QtWidgets import QWidget, QCheckBox, QLineEdit, QSlider, QComboBox
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import QSettings, QTimer, QCoreApplication
+
+from app_modeler.widgets.DictEditorWidget import DictEditorWidget
 
 logger = logging.getLogger(__name__)
 
 
 class SettingsWidget(QWidget):
+    # changes are collected and written after the widgets have been idle this long
+    SAVE_DELAY_MS = 500
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.settings: Optional[QSettings] = None
+        self._settings_widgets: list[QWidget] = []
+        self._connected_widgets: set[QWidget] = set()
+        self._pending: dict[str, Any] = {}
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush_settings)
 
     def init_settings(self, settings: QSettings):
         """
@@ -23,11 +35,15 @@ class SettingsWidget(QWidget):
         """
         # Use provided QSettings or create a default one
         self.settings = settings
-        logger.debug(f'Setting filename: {self.settings.fileName()}')
+        logger.debug('Setting filename: %s', self.settings.fileName())
 
         # Load saved settings and connect signals
+        self._settings_widgets = self._find_settings_widgets()
         self.load_settings()
-        self.connect_settings_signals()
+        self.connect_settings_signals(self._settings_widgets)
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.flush_settings)
 
     def get_setting_name(self, widget: QWidget) -> str:
         """
@@ -35,62 +51,119 @@ class SettingsWidget(QWidget):
         """
         return f"AppModeler/{self.objectName()}/{widget.objectName()}"
 
-    def connect_settings_signals(self):
-        # Loop through all widgets and connect relevant signals
-        for widget in self.findChildren(QWidget):
-            if not widget.objectName():
+    def _find_settings_widgets(self) -> list[QWidget]:
+        return [widget for widget in self.findChildren(QWidget)
+                if widget.objectName() and isinstance(widget, (QCheckBox, QLineEdit, QSlider, QComboBox, DictEditorWidget))]
+
+    def refresh_settings_widgets(self):
+        """ Track widgets created after init_settings, e.g. a regenerated form """
+        if self.settings is None:
+            return
+        self._settings_widgets = self._find_settings_widgets()
+        self.connect_settings_signals(self._settings_widgets)
+
+    def connect_settings_signals(self, widgets: list[QWidget]):
+        for widget in widgets:
+            if widget in self._connected_widgets:
                 continue
+            self._connected_widgets.add(widget)
             if isinstance(widget, QCheckBox):
-                widget.stateChanged.connect(self.save_settings)
+                widget.stateChanged.connect(self.on_setting_changed)
             elif isinstance(widget, QLineEdit):
-                widget.textChanged.connect(self.save_settings)
+                widget.textChanged.connect(self.on_setting_changed)
             elif isinstance(widget, QSlider):
-                widget.valueChanged.connect(self.save_settings)
+                widget.valueChanged.connect(self.on_setting_changed)
             elif isinstance(widget, QComboBox):
-                widget.currentIndexChanged.connect(self.save_settings)
+                widget.currentIndexChanged.connect(self.on_setting_changed)
+            elif isinstance(widget, DictEditorWidget):
+                # the signals come from the table, not from the editor
+                def queue_dict(*_, editor=widget):
+                    self.queue_setting(editor)
+                widget.table.itemChanged.connect(queue_dict)
+                widget.table.model().rowsRemoved.connect(queue_dict)
+
+    @staticmethod
+    def _widget_value(widget: QWidget) -> Any:
+        if isinstance(widget, QCheckBox):
+            return widget.isChecked()
+        if isinstance(widget, QLineEdit):
+            return widget.text()
+        if isinstance(widget, QSlider):
+            return widget.value()
+        if isinstance(widget, QComboBox):
+            return widget.currentIndex()
+        if isinstance(widget, DictEditorWidget):
+            return json.dumps(widget.get_dict())
+        return None
+
+    def on_setting_changed(self, *_):
+        """ Queue the changed widget value, bursts of changes are written once """
+        widget = self.sender()
+        if isinstance(widget, QWidget):
+            self.queue_setting(widget)
+
+    def queue_setting(self, widget: QWidget):
+        self._pending[self.get_setting_name(widget)] = self._widget_value(widget)
+        self._save_timer.start()
+
+    def flush_settings(self):
+        """ Write the queued changes """
+        self._save_timer.stop()
+        if not self._pending or self.settings is None:
+            return
+        logger.debug('Saving settings: %s', self._pending)
+        for key, value in self._pending.items():
+            self.settings.setValue(key, value)
+        self._pending.clear()
 
     def save_settings(self):
         """
         Saves the state of each widget to QSettings.
         """
-        self.settings: QSettings
-        for widget in self.findChildren(QWidget):
-            if not widget.objectName():
-                continue
-            key = self.get_setting_name(widget)
+        self._save_timer.stop()
+        self._pending.clear()
+        for widget in self._settings_widgets:
+            self.settings.setValue(self.get_setting_name(widget), self._widget_value(widget))
+        logger.debug('Saved %d settings', len(self._settings_widgets))
 
-            if isinstance(widget, QCheckBox):
-                self.settings.setValue(key, widget.isChecked())
-                logger.debug(f'Saving setting: {key}={widget.isChecked()}')
-            elif isinstance(widget, QLineEdit):
-                self.settings.setValue(key, widget.text())
-                logger.debug(f'Saving setting: {key}={widget.text()}')
-            elif isinstance(widget, QSlider):
-                self.settings.setValue(key, widget.value())
-                logger.debug(f'Saving setting: {key}={widget.value()}')
-            elif isinstance(widget, QComboBox):
-                self.settings.setValue(key, widget.currentIndex())
-                logger.debug(f'Saving setting: {key}={widget.currentIndex()}')
+    def hideEvent(self, event):
+        # dialogs are often destroyed right after they are closed
+        self.flush_settings()
+        super().hideEvent(event)
 
     def load_settings(self):
         """
         Loads the state of each widget from QSettings.
         """
-        self.settings: QSettings
-        for widget in self.findChildren(QWidget):
-            if not widget.objectName():
-                continue
+        for widget in self._settings_widgets:
             key = self.get_setting_name(widget)
+            if not self.settings.contains(key):
+                # never saved, the widget keeps the default value
+                continue
             if isinstance(widget, QCheckBox):
                 widget.setChecked(self.settings.value(key, False, type=bool))
-                logger.debug(f'Loading setting: {key}={widget.isChecked()}')
+                logger.debug('Loading setting: %s=%s', key, widget.isChecked())
             elif isinstance(widget, QLineEdit):
-                widget.setText(self.settings.value(key, "", type=str))
-                logger.debug(f'Loading setting: {key}={widget.text()}')
+                value = self.settings.value(key, "", type=str)
+                if not value:
+                    # empty text would overwrite numeric and optional defaults
+                    continue
+                widget.setText(value)
+                logger.debug('Loading setting: %s=%s', key, widget.text())
             elif isinstance(widget, QSlider):
                 min_value = widget.minimum()
                 widget.setValue(self.settings.value(key, min_value, type=int))
-                logger.debug(f'Loading setting: {key}={widget.value()}')
+                logger.debug('Loading setting: %s=%s', key, widget.value())
             elif isinstance(widget, QComboBox):
                 widget.setCurrentIndex(self.settings.value(key, 0, type=int))
-                logger.debug(f'Loading setting: {key}={widget.currentIndex()}')
+                logger.debug('Loading setting: %s=%s', key, widget.currentIndex())
+            elif isinstance(widget, DictEditorWidget):
+                value = self.settings.value(key, "", type=str)
+                try:
+                    data = json.loads(value) if value else None
+                except ValueError:
+                    logger.warning('Invalid setting: %s=%s', key, value)
+                    data = None
+                if isinstance(data, dict):
+                    widget.set_dict(data)
+                logger.debug('Loading setting: %s=%s', key, data)
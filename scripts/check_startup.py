@@ -0,0 +1,65 @@
+"""
+Guard the GUI cold start: the modules loaded before the main window is shown
+must not include the deferred heavy dependencies, and the import time has to stay within a budget.
+
+usage: python scripts/check_startup.py [--budget SECONDS]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# everything loaded before the main window is shown
+ENTRY_MODULE = "app_modeler.MainWindow"
+# loaded on first use only
+DEFERRED_MODULES = [
+    "openai",
+    "app_modeler.ai.OpenAiAssistant",
+    "app_modeler.ai.TesterAi",
+    "app_modeler.ai.AppiumClassGenerator",
+    "appium.options.android",
+    "appium.options.ios",
+    "appium.options.mac",
+    "appium.options.windows",
+]
+IMPORT_TIME = re.compile(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)")
+
+
+def import_times(module: str) -> dict[str, float]:
+    """ Cumulative import time in seconds of each module loaded by importing the module """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            times[match.group(2)] = int(match.group(1)) / 1e6
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=3.0, help="maximum import time in seconds")
+    args = parser.parse_args()
+
+    times = import_times(ENTRY_MODULE)
+    failed = False
+    eager = [module for module in DEFERRED_MODULES if module in times]
+    if eager:
+        print(f"Deferred modules imported at startup: {', '.join(eager)}")
+        failed = True
+
+    total = times.get(ENTRY_MODULE, 0.0)
+    print(f"{ENTRY_MODULE} imported in {total:.2f}s (budget {args.budget:.2f}s)")
+    if total > args.budget:
+        slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+        for module, seconds in slowest:
+            print(f"  {seconds:.3f}s {module}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Compare the startup time of build variants. Each command is launched with APP_MODELER_STARTUP_PROBE set,
+the application exits as soon as its main window is shown.
+
+usage: python scripts/startup_probe.py [--runs N] COMMAND [COMMAND ...]
+e.g.   python scripts/startup_probe.py "python -m app_modeler.main" dist/app_modeler/app_modeler dist/app_modeler
+"""
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_PROBE_ENV = 'APP_MODELER_STARTUP_PROBE'
+
+
+def measure(command: list[str], timeout: float) -> float:
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: '1'})
+    started = time.perf_counter()
+    subprocess.run(command, env=env, check=True, timeout=timeout, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('commands', nargs='+', help='command launching a build variant')
+    parser.add_argument('--runs', type=int, default=5, help='launches per variant, the first one is a warm-up')
+    parser.add_argument('--timeout', type=float, default=120.0, help='timeout of a single launch in seconds')
+    args = parser.parse_args()
+
+    for command in args.commands:
+        argv = shlex.split(command, posix=os.name != 'nt')
+        try:
+            times = [measure(argv, args.timeout) for _ in range(args.runs)]
+        except (OSError, subprocess.SubprocessError) as error:
+            print(f"{command}: failed: {error}")
+            return 1
+        warm = times[1:] or times
+        print(f"{command}: first {times[0]:.2f}s, median {statistics.median(warm):.2f}s, min {min(warm):.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app_modeler.appium_helpers.elements.ElementsDiscover import ElementData  # noqa: E402
+from app_modeler.models.ElementsModel import ElementsModel, ElementsFilterProxyModel  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def element(text, x, y, width, height) -> ElementData:
+    return ElementData(element=None, text=text, type="Button",
+                       location={'x': x, 'y': y}, size={'width': width, 'height': height})
+
+
+def sorted_texts(column: int) -> list[str]:
+    model = ElementsModel()
+    model.update_items([element("a", 100, 5, 10, 10), element("b", 20, 50, 200, 100),
+                        element("c", 9, 7, 3, 3)])
+    proxy = ElementsFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.setSortRole(ElementsModel.SORT_ROLE)
+    proxy.sort(column, Qt.SortOrder.AscendingOrder)
+    return [proxy.index(row, 1).data() for row in range(proxy.rowCount())]
+
+
+def test_location_sorts_numerically(app):
+    assert sorted_texts(4) == ["c", "b", "a"]
+
+
+def test_size_sorts_by_area(app):
+    assert sorted_texts(5) == ["c", "a", "b"]
+
+
+def test_user_role_returns_element(app):
+    model = ElementsModel()
+    item = element("a", 1, 2, 3, 4)
+    model.update_items([item])
+    assert model.index(0, 4).data(Qt.ItemDataRole.UserRole) is item
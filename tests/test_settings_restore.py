@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSettings  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app_modeler.dialogs.SettingsDIalog import AppSettingsWidget  # noqa: E402
+from app_modeler.models.AppSettings import AppSettings  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def restore(path) -> AppSettings:
+    settings = QSettings(str(path), QSettings.Format.IniFormat)
+    app_settings = AppSettings()
+    AppSettingsWidget(settings, app_settings)
+    return app_settings
+
+
+def test_defaults_survive_restore_from_empty_ini(app, tmp_path):
+    defaults = AppSettings()
+    ini = tmp_path / "app_modeler.ini"
+    ini.write_text("")
+    restored = restore(ini)
+    assert restored.local_ranker_confidence is defaults.local_ranker_confidence is None
+    assert restored.max_concurrent_requests == defaults.max_concurrent_requests == 4
+    assert restored.requests_per_minute is None
+    assert restored.tokens_per_minute is None
+    assert restored.history_max_tokens == defaults.history_max_tokens
+    assert restored.model == defaults.model
+
+
+def test_empty_values_do_not_override_defaults(app, tmp_path):
+    ini = tmp_path / "app_modeler.ini"
+    settings = QSettings(str(ini), QSettings.Format.IniFormat)
+    settings.setValue("AppModeler//local_ranker_confidence", "")
+    settings.setValue("AppModeler//local_ranker_confidence_none", False)
+    settings.setValue("AppModeler//max_concurrent_requests", "")
+    settings.sync()
+    restored = restore(ini)
+    assert restored.local_ranker_confidence is None
+    assert restored.max_concurrent_requests == 4
+
+
+def test_saved_values_are_restored(app, tmp_path):
+    ini = tmp_path / "app_modeler.ini"
+    settings = QSettings(str(ini), QSettings.Format.IniFormat)
+    settings.setValue("AppModeler//local_ranker_confidence", "0.8")
+    settings.setValue("AppModeler//local_ranker_confidence_none", False)
+    settings.setValue("AppModeler//max_concurrent_requests", "2")
+    settings.sync()
+    restored = restore(ini)
+    assert restored.local_ranker_confidence == 0.8
+    assert restored.max_concurrent_requests == 2
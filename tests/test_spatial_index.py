@@ -0,0 +1,20 @@
+from app_modeler.utils.SpatialIndex import SpatialIndex
+
+
+def test_fractional_rect():
+    index = SpatialIndex(cell_size=64)
+    index.insert("button", 10.4, 20.6, 100.5, 40.2)
+
+    assert len(index) == 1
+    assert index.query(11, 22) == ["button"]
+    assert index.query(109, 60) == ["button"]
+    assert index.query(110, 60) == []
+
+
+def test_innermost_first():
+    index = SpatialIndex(cell_size=64)
+    index.insert("screen", 0, 0, 400, 800)
+    index.insert("button", 10, 10, 50, 20)
+
+    assert index.query(20, 20) == ["button", "screen"]
+    assert index.query(200, 200) == ["screen"]